@@ -0,0 +1,178 @@
+"""Hedged LLM requests.
+
+A call that has been running longer than the recent p90 (configurable) of
+its operation is probably stuck in the latency tail; a duplicate call
+started at that point usually finishes first. The hedger sends one
+duplicate, returns whichever attempt succeeds first and cancels the
+other.
+
+Extra spend is capped: hedges may not exceed `max_extra` times the number
+of calls (over a rolling window), so a slow LLM provider cannot double
+the traffic. No call is hedged until `min_samples` latencies have been
+seen for its operation. A hedge also needs a free LLM scheduler slot
+(it is skipped rather than queued), so hedging never exceeds
+LLM_MAX_IN_FLIGHT.
+
+The latency window records the primary attempt only: when a hedge wins,
+the primary's elapsed time so far (a lower bound) is recorded, so the
+percentile tracks the un-hedged latency instead of drifting down to the
+faster of two attempts.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from agent.llm_scheduler import LLMScheduler, get_llm_scheduler
+from config import get_settings
+from services.metrics import LLM_HEDGES
+
+
+T = TypeVar("T")
+
+
+class LatencyWindow:
+    """The most recent latencies of one operation."""
+
+    def __init__(self, size: int):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile (pct in 0-100)."""
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class Hedger:
+    """Sends a duplicate of calls slower than a rolling latency percentile."""
+
+    def __init__(
+        self,
+        percentile: float = 90.0,
+        max_extra: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200,
+        scheduler: Optional[LLMScheduler] = None,
+    ):
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.window = window
+        self.scheduler = scheduler  # Hedges take one of its slots (None: unlimited)
+        self._latencies: dict[str, LatencyWindow] = {}
+        # Calls and hedges over roughly the last `window` calls (halved when full)
+        self._calls = 0
+        self._hedges = 0
+        self.total_calls = 0
+        self.total_hedges = 0
+
+    def threshold(self, operation: str) -> Optional[float]:
+        """Seconds after which a call is hedged (None until enough samples)."""
+        latencies = self._latencies.get(operation)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        return latencies.percentile(self.percentile)
+
+    def _observe(self, operation: str, seconds: float) -> None:
+        if operation not in self._latencies:
+            self._latencies[operation] = LatencyWindow(self.window)
+        self._latencies[operation].observe(seconds)
+
+    def _count_call(self) -> None:
+        self._calls += 1
+        self.total_calls += 1
+        if self._calls >= self.window:
+            self._calls //= 2
+            self._hedges //= 2
+
+    def _within_budget(self) -> bool:
+        return self._hedges + 1 <= self.max_extra * self._calls
+
+    async def run(self, operation: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await `call()`, hedging it with a second `call()` if it is slow.
+
+        Args:
+            operation: Latency bucket (e.g. "rank_batch")
+            call: Starts one attempt; must be safe to run twice
+
+        Returns:
+            The result of the first attempt to succeed
+
+        Raises:
+            The last attempt's error if every attempt failed
+        """
+        self._count_call()
+        attempts: dict[asyncio.Task, float] = {
+            asyncio.ensure_future(call()): time.perf_counter()
+        }
+        primary = next(iter(attempts))
+        try:
+            delay = self.threshold(operation)
+            if delay is not None:
+                await asyncio.wait([primary], timeout=delay)
+                if not primary.done():
+                    if not self._within_budget():
+                        LLM_HEDGES.inc(operation=operation, outcome="over_budget")
+                    elif self.scheduler is not None and not self.scheduler.try_acquire():
+                        LLM_HEDGES.inc(operation=operation, outcome="no_slot")
+                    else:
+                        self._hedges += 1
+                        self.total_hedges += 1
+                        LLM_HEDGES.inc(operation=operation, outcome="sent")
+                        hedge = asyncio.ensure_future(call())
+                        if self.scheduler is not None:
+                            # Also runs if the hedge is cancelled before it starts
+                            hedge.add_done_callback(lambda _: self.scheduler.release())
+                        attempts[hedge] = time.perf_counter()
+
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None or not pending:
+                    break
+            # Primary's latency, or a lower bound of it if it is still running
+            primary_elapsed = time.perf_counter() - attempts[primary]
+            primary_failed = primary.done() and primary.exception() is not None
+        finally:
+            losers = [task for task in attempts if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+        if winner is None:
+            return next(iter(done)).result()  # Raises the attempt's error
+        if not primary_failed:
+            self._observe(operation, primary_elapsed)
+        if winner is not primary:
+            LLM_HEDGES.inc(operation=operation, outcome="won")
+        return winner.result()
+
+
+_hedger: Optional[Hedger] = None
+
+
+def get_hedger() -> Optional[Hedger]:
+    """Process-wide hedger, or None when LLM_HEDGING is off."""
+    global _hedger
+    settings = get_settings()
+    if _hedger is None and settings.llm_hedging:
+        _hedger = Hedger(
+            percentile=settings.llm_hedge_percentile,
+            max_extra=settings.llm_hedge_max_extra,
+            min_samples=settings.llm_hedge_min_samples,
+            window=settings.llm_hedge_window,
+            scheduler=get_llm_scheduler(),
+        )
+    return _hedger
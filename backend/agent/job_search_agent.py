@@ -1,51 +1,113 @@
 """Main job search agent that orchestrates the job search workflow."""
 
-from typing import Optional
-from langchain_openai import ChatOpenAI
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Optional
 
-from api.schemas import ProfileRequest, ExpandedProfile, RankedJob, AnalyzeResponse
-from agent.tools.profile_expander import expand_profile
+from api.schemas import (
+    Job, ProfileRequest, ExpandedProfile, RankedJob, AnalyzeResponse, BatchAnalyzeItem,
+    SavedSearch, SavedSearchRun,
+)
+from agent.tools.profile_expander import ExpandedProfileData, expand_profile, default_profile_data
 from agent.tools.job_ranker import rank_jobs
-from services.job_aggregator import JobAggregator, LOCATION_ALIASES
+from agent.runtime import AgentRuntime, get_runtime
+from agent.llm_scheduler import llm_request, new_request_id
+from agent.pipeline import StreamingRankPipeline
+from services.board_yield import get_board_yield
+from services.job_aggregator import JobAggregator, FetchResult, LOCATION_ALIASES
+from services.job_index import JobIndex
+from services.cache import cached_json, make_key
+from services.deadline import Deadline, resolve_timeout
+from services.metrics import STAGE_LATENCY
+from services.saved_searches import (
+    diff_candidates, job_key, new_search_id, ranked_fingerprints, unreachable_companies,
+)
 from config import get_settings
 
 
+# Progress callback: (stage name, fraction of the work done 0..1)
+ProgressFn = Callable[[str, float], None]
+
+
+def _no_progress(stage: str, fraction: float) -> None:
+    pass
+
+
 class JobSearchAgent:
     """
     AI-powered job search agent.
     
     Workflow:
-    1. Expand user profile using AI
-    2. Fetch jobs from multiple sources with filtering
+    1. Expand user profile using AI (concurrently with step 2)
+    2. Fetch jobs from multiple sources, then filter with the expanded profile
+       (and the expected salary, so underpaying jobs are never ranked)
     3. Rank jobs by match score
     4. Sort by score AND location preference
     5. Return curated results
+    
+    The whole workflow runs against one request deadline; each stage gets
+    a share of it and whatever is unfinished at its cutoff is skipped.
+    By default steps 2-3 are streamed: boards are filtered and ranked as
+    they arrive (PIPELINE_MODE=staged runs them one after another).
     """
     
-    def __init__(self):
+    def __init__(self, runtime: Optional[AgentRuntime] = None):
         settings = get_settings()
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            api_key=settings.openai_api_key
-        )
+        self.settings = settings
+        # LLM clients and chains are app-scoped; only the aggregator is per request
+        self._runtime = runtime
         self.job_aggregator = JobAggregator()
     
-    async def analyze(self, profile: ProfileRequest) -> AnalyzeResponse:
+    @property
+    def runtime(self) -> AgentRuntime:
+        """Shared agent runtime, created on first use."""
+        if self._runtime is None:
+            self._runtime = get_runtime()
+        return self._runtime
+    
+    @property
+    def llm(self):
+        return self.runtime.llm
+    
+    async def analyze(
+        self, profile: ProfileRequest, on_progress: Optional[ProgressFn] = None
+    ) -> AnalyzeResponse:
         """
         Analyze user profile and return matched jobs.
+        
+        `on_progress(stage, fraction)` is called as the workflow moves
+        between stages (used by the queued /analyze/jobs mode).
         """
-        # Step 1: Expand user profile
-        expanded_data = await expand_profile(
-            role=profile.role,
-            company=profile.company,
-            years_of_experience=profile.years_of_experience,
-            skills=profile.skills,
-            expected_salary=profile.expected_salary,
-            location=profile.location,
-            llm=self.llm
-        )
+        # All LLM calls of this request share one fair-queueing slot in the scheduler
+        with llm_request(), STAGE_LATENCY.time(stage="analyze"):
+            return await self._analyze(profile, on_progress or _no_progress)
+    
+    async def _analyze(self, profile: ProfileRequest, on_progress: ProgressFn) -> AnalyzeResponse:
+        """Run the analyze workflow (see class docstring)."""
+        deadline = Deadline(resolve_timeout(
+            profile.timeout_seconds,
+            default=self.settings.request_timeout_default,
+            maximum=self.settings.request_timeout_max,
+        ))
         
+        # Steps 1-3: expand, fetch + filter, rank
+        on_progress("expanding_profile", 0.0)
+        if self.settings.pipeline_mode == "staged":
+            expanded_data, fetch_result, ranked_jobs = await self._run_staged(profile, deadline, on_progress)
+        else:
+            expanded_data, fetch_result, ranked_jobs = await self._run_streaming(profile, deadline, on_progress)
+        
+        on_progress("building_response", 0.95)
+        return self._build_response(profile, expanded_data, fetch_result, ranked_jobs)
+    
+    def _build_response(
+        self,
+        profile: ProfileRequest,
+        expanded_data: ExpandedProfileData,
+        fetch_result: FetchResult,
+        ranked_jobs: list[RankedJob],
+    ) -> AnalyzeResponse:
+        """Apply the final sort (step 4) and assemble the response."""
         expanded_profile = ExpandedProfile(
             original_role=profile.role,
             original_company=profile.company,
@@ -57,48 +119,334 @@ class JobSearchAgent:
             expected_salary_range=expanded_data.expected_salary_range
         )
         
-        # Step 2: Fetch jobs from all sources WITH FILTERING
-        jobs, companies_searched = await self.job_aggregator.fetch_all_jobs(
+        # Step 4: Sort by match score AND location preference
+        if profile.location:
+            ranked_jobs = self._sort_by_score_and_location(ranked_jobs, profile.location)
+        
+        return AnalyzeResponse(
+            profile=expanded_profile,
+            jobs=ranked_jobs,
+            total_jobs=len(ranked_jobs),
+            companies_searched=fetch_result.companies_searched,
+            companies_failed=fetch_result.companies_failed,
+            companies_timed_out=fetch_result.companies_timed_out,
+            companies_skipped=fetch_result.companies_skipped,
+        )
+    
+    async def analyze_batch(
+        self, profiles: list[ProfileRequest], timeout_seconds: Optional[float] = None
+    ) -> AsyncIterator[BatchAnalyzeItem]:
+        """
+        Analyze many profiles against one shared corpus fetch.
+        
+        Boards are fetched once (the union of the profiles' target
+        companies) while all profiles are expanded concurrently. The corpus
+        is indexed once and each profile is filtered against the index.
+        Every LLM call in the batch (expansion and ranking) goes through one
+        bounded pool, so throughput is set by LLM capacity, not scraping.
+        
+        Yields one item per profile as it completes (not in input order).
+        A failing profile yields an item with `error` set.
+        """
+        deadline = Deadline(resolve_timeout(
+            timeout_seconds,
+            default=self.settings.batch_timeout_default,
+            maximum=self.settings.batch_timeout_max,
+        ))
+        llm_slots = asyncio.Semaphore(self.settings.batch_llm_concurrency)
+        # The whole batch is one request to the LLM scheduler, so interactive
+        # requests get their fair share next to it
+        batch_request = new_request_id()
+        corpus_task = asyncio.create_task(self._fetch_corpus(profiles, deadline))
+        
+        async def run_one(index: int, profile: ProfileRequest) -> BatchAnalyzeItem:
+            with llm_request(batch_request):
+                return await run_profile(index, profile)
+        
+        async def run_profile(index: int, profile: ProfileRequest) -> BatchAnalyzeItem:
+            try:
+                async with llm_slots:
+                    expanded_data = await self._expand_profile(profile, deadline)
+                # Shielded: one profile failing must not cancel the shared fetch
+                fetch_result, job_index = await asyncio.shield(corpus_task)
+                jobs = job_index.filter(
+                    keywords=expanded_data.target_titles,
+                    location=profile.location,
+                    years_of_experience=profile.years_of_experience,
+                    seniority_level=expanded_data.seniority_level,
+                    companies=profile.target_companies,
+                    expected_salary=profile.expected_salary,
+                )
+                ranked_jobs: list[RankedJob] = []
+                if jobs:
+                    ranked_jobs = await rank_jobs(
+                        jobs=jobs,
+                        **self._rank_context(profile, expanded_data),
+                        timeout=deadline.remaining(),
+                        semaphore=llm_slots,
+                    )
+                fetch_result = _restrict_to_companies(fetch_result, profile.target_companies)
+                return BatchAnalyzeItem(
+                    index=index,
+                    result=self._build_response(profile, expanded_data, fetch_result, ranked_jobs),
+                )
+            except Exception as e:
+                return BatchAnalyzeItem(index=index, error=str(e))
+        
+        tasks = [asyncio.create_task(run_one(i, profile)) for i, profile in enumerate(profiles)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client went away or the stream finished: stop outstanding work
+            for task in tasks:
+                task.cancel()
+            corpus_task.cancel()
+            await asyncio.gather(*tasks, corpus_task, return_exceptions=True)
+    
+    async def run_saved_search(
+        self, profile: ProfileRequest, previous: Optional[SavedSearch] = None
+    ) -> tuple[SavedSearch, SavedSearchRun]:
+        """
+        Run a saved search, incrementally when it has run before.
+        
+        The first run expands the profile and ranks the candidates like
+        `analyze`. Later runs reuse the stored expansion, still fetch and
+        filter every board, but rank only candidates that are new or
+        changed since `previous` and merge them into its ranking (see
+        services.saved_searches).
+        
+        Returns:
+            Tuple of (search state to store, run outcome for the client)
+        """
+        with llm_request(), STAGE_LATENCY.time(stage="saved_search"):
+            deadline = Deadline(resolve_timeout(
+                profile.timeout_seconds,
+                default=self.settings.request_timeout_default,
+                maximum=self.settings.request_timeout_max,
+            ))
+            fetch_task = asyncio.create_task(self.job_aggregator.fetch_raw_jobs(
+                target_companies=profile.target_companies,
+                timeout=deadline.stage_budget(self.settings.fetch_budget_share),
+            ))
+            try:
+                if previous is None:
+                    expanded_data = await self._expand_profile(profile, deadline)
+                else:
+                    expanded_data = ExpandedProfileData(**previous.result.profile.model_dump(
+                        include=set(ExpandedProfileData.model_fields)
+                    ))
+                fetch_result = await fetch_task
+            except BaseException:
+                fetch_task.cancel()
+                raise
+            
+            candidates = self.job_aggregator.filter_jobs(
+                fetch_result.jobs,
+                keywords=expanded_data.target_titles,
+                location=profile.location,
+                years_of_experience=profile.years_of_experience,
+                seniority_level=expanded_data.seniority_level,
+                expected_salary=profile.expected_salary,
+            )
+            diff = diff_candidates(candidates, previous, unreachable_companies(
+                fetch_result.companies_failed, fetch_result.companies_timed_out, fetch_result.companies_skipped,
+            ))
+            
+            # Only new or changed postings reach the LLM
+            new_jobs: list[RankedJob] = []
+            if diff.fresh:
+                new_jobs = await rank_jobs(
+                    jobs=diff.fresh,
+                    **self._rank_context(profile, expanded_data),
+                    timeout=deadline.remaining(),
+                )
+            merged = sorted(diff.kept + new_jobs, key=lambda job: job.match_score, reverse=True)
+            result = self._build_response(profile, expanded_data, fetch_result, merged)
+        
+        now = time.time()
+        search = SavedSearch(
+            search_id=previous.search_id if previous else new_search_id(),
+            profile=profile,
+            result=result,
+            fingerprints=ranked_fingerprints(diff, merged),
+            created_at=previous.created_at if previous else now,
+            last_run_at=now,
+        )
+        new_keys = {job_key(job) for job in new_jobs}
+        run = SavedSearchRun(
+            search_id=search.search_id,
+            result=result,
+            new_jobs=[job for job in result.jobs if job_key(job) in new_keys],
+            candidates=len(candidates),
+            candidates_new=len(diff.fresh),
+            jobs_reused=len(diff.kept),
+            jobs_removed=diff.removed,
+            previous_run_at=previous.last_run_at if previous else None,
+            run_at=now,
+        )
+        return search, run
+    
+    async def _fetch_corpus(
+        self, profiles: list[ProfileRequest], deadline: Deadline
+    ) -> tuple[FetchResult, JobIndex]:
+        """Fetch the boards every profile needs, once, and index them."""
+        if all(profile.target_companies for profile in profiles):
+            companies = list(dict.fromkeys(
+                company for profile in profiles for company in profile.target_companies
+            ))
+        else:
+            companies = None  # At least one profile searches every board
+        fetch_result = await self.job_aggregator.fetch_raw_jobs(
+            target_companies=companies,
+            timeout=deadline.stage_budget(self.settings.fetch_budget_share),
+        )
+        return fetch_result, JobIndex(self.job_aggregator, fetch_result.jobs)
+    
+    async def _run_staged(
+        self, profile: ProfileRequest, deadline: Deadline, on_progress: ProgressFn = _no_progress
+    ) -> tuple[ExpandedProfileData, FetchResult, list[RankedJob]]:
+        """Expand and fetch concurrently, then filter everything, then rank."""
+        # Board fetching does not depend on the expanded profile, only the
+        # filters applied afterwards do.
+        expand_task = asyncio.create_task(self._expand_profile(profile, deadline))
+        fetch_task = asyncio.create_task(self.job_aggregator.fetch_raw_jobs(
             target_companies=profile.target_companies,
+            timeout=deadline.stage_budget(self.settings.fetch_budget_share),
+        ))
+        try:
+            expanded_data, fetch_result = await asyncio.gather(expand_task, fetch_task)
+        except BaseException:
+            expand_task.cancel()
+            fetch_task.cancel()
+            raise
+        
+        # Filter fetched jobs now that target titles and seniority are known
+        on_progress("filtering_jobs", 0.5)
+        jobs = self.job_aggregator.filter_jobs(
+            fetch_result.jobs,
             keywords=expanded_data.target_titles,
             location=profile.location,
             years_of_experience=profile.years_of_experience,
             seniority_level=expanded_data.seniority_level,
+            expected_salary=profile.expected_salary,
         )
         
-        # Step 3: Rank jobs by match score
+        # Rank jobs by match score (uses whatever time is left)
+        on_progress("ranking_jobs", 0.6)
         ranked_jobs: list[RankedJob] = []
         if jobs:
             ranked_jobs = await rank_jobs(
                 jobs=jobs,
+                **self._rank_context(profile, expanded_data),
+                timeout=deadline.remaining(),
+            )
+        
+        return expanded_data, fetch_result, ranked_jobs
+    
+    async def _run_streaming(
+        self, profile: ProfileRequest, deadline: Deadline, on_progress: ProgressFn = _no_progress
+    ) -> tuple[ExpandedProfileData, FetchResult, list[RankedJob]]:
+        """
+        Filter and rank boards as they arrive (see StreamingRankPipeline).
+        
+        Ranking batches start while slower boards are still loading, so
+        fetch, filter and rank overlap instead of running back to back.
+        Boards with the best past yield for this location are fetched
+        first, and the rest are cancelled once there are enough candidates.
+        """
+        board_yield = get_board_yield()
+        board_yield.start_search()
+        pipeline = StreamingRankPipeline(
+            self.job_aggregator,
+            location=profile.location,
+            years_of_experience=profile.years_of_experience,
+            expected_salary=profile.expected_salary,
+            early_stop=self.settings.fetch_early_stop,
+            grace_seconds=self.settings.fetch_grace_seconds,
+            board_yield=board_yield,
+        )
+        expand_task = asyncio.create_task(self._expand_profile(profile, deadline))
+        fetch_task = asyncio.create_task(self.job_aggregator.fetch_raw_jobs(
+            target_companies=profile.target_companies,
+            timeout=deadline.stage_budget(self.settings.fetch_budget_share),
+            on_board=pipeline.add_board,
+            board_order=lambda companies: board_yield.order(companies, profile.location),
+            stop=pipeline.stop_fetching,
+        ))
+        try:
+            expanded_data = await expand_task
+            on_progress("fetching_and_ranking", 0.3)
+            rank_context = self._rank_context(profile, expanded_data)
+            
+            async def rank_batch(batch: list[Job]) -> list[RankedJob]:
+                return await rank_jobs(
+                    jobs=batch, **rank_context, batch_size=len(batch), max_concurrent=1
+                )
+            
+            pipeline.start(
+                keywords=expanded_data.target_titles,
+                seniority_level=expanded_data.seniority_level,
+                rank_batch=rank_batch,
+            )
+            fetch_result = await fetch_task
+            for company in (*fetch_result.companies_failed, *fetch_result.companies_timed_out):
+                board_yield.observe_failure(company, profile.location)
+            on_progress("ranking_jobs", 0.6)
+            ranked_jobs = await pipeline.finish(timeout=deadline.remaining())
+        except BaseException:
+            expand_task.cancel()
+            fetch_task.cancel()
+            pipeline.cancel()
+            raise
+        
+        return expanded_data, fetch_result, ranked_jobs
+    
+    def _rank_context(self, profile: ProfileRequest, expanded_data: ExpandedProfileData) -> dict:
+        """Candidate fields passed to every ranking call."""
+        return {
+            "role": profile.role,
+            "company": profile.company,
+            "company_tier": expanded_data.company_tier,
+            "years_of_experience": profile.years_of_experience,
+            "seniority_level": expanded_data.seniority_level,
+            "skills": expanded_data.inferred_skills,
+            "target_titles": expanded_data.target_titles,
+            "expected_salary_range": expanded_data.expected_salary_range,
+            "chain": self.runtime.rank_chain,
+        }
+    
+    async def _expand_profile(self, profile: ProfileRequest, deadline: Deadline) -> ExpandedProfileData:
+        """Expand the profile within its budget, falling back to the raw inputs if it is too slow."""
+        async def load() -> dict:
+            expanded = await expand_profile(
                 role=profile.role,
                 company=profile.company,
-                company_tier=expanded_data.company_tier,
                 years_of_experience=profile.years_of_experience,
-                seniority_level=expanded_data.seniority_level,
-                skills=expanded_data.inferred_skills,
-                target_titles=expanded_data.target_titles,
-                expected_salary_range=expanded_data.expected_salary_range,
-                llm=self.llm
+                skills=profile.skills,
+                expected_salary=profile.expected_salary,
+                location=profile.location,
+                chain=self.runtime.expand_chain,
             )
+            return expanded.model_dump()
         
-        # Filter by salary if specified
-        if profile.expected_salary:
-            ranked_jobs = [
-                job for job in ranked_jobs
-                if job.salary_max is None or job.salary_max >= profile.expected_salary
-            ]
-        
-        # Step 4: Sort by match score AND location preference
-        if profile.location:
-            ranked_jobs = self._sort_by_score_and_location(ranked_jobs, profile.location)
-        
-        return AnalyzeResponse(
-            profile=expanded_profile,
-            jobs=ranked_jobs,
-            total_jobs=len(ranked_jobs),
-            companies_searched=companies_searched
+        key = make_key(
+            "expansion", profile.role, profile.company, profile.years_of_experience,
+            profile.skills, profile.expected_salary, profile.location,
         )
+        try:
+            data = await asyncio.wait_for(
+                cached_json("expansion", key, self.settings.expansion_cache_ttl, load),
+                timeout=deadline.stage_budget(self.settings.expand_budget_share),
+            )
+            return ExpandedProfileData(**data)
+        except asyncio.TimeoutError:
+            print("Profile expansion timed out, using default profile")
+            return default_profile_data(
+                role=profile.role,
+                years_of_experience=profile.years_of_experience,
+                skills=profile.skills,
+            )
     
     def _sort_by_score_and_location(self, jobs: list[RankedJob], preferred_location: str) -> list[RankedJob]:
         """
@@ -163,3 +511,16 @@ class JobSearchAgent:
     async def close(self):
         """Clean up resources."""
         await self.job_aggregator.close()
+
+
+def _restrict_to_companies(fetch_result: FetchResult, companies: Optional[list[str]]) -> FetchResult:
+    """Report only a profile's own target boards from a shared batch fetch."""
+    if not companies:
+        return fetch_result
+    wanted = {company.lower() for company in companies}
+    return fetch_result._replace(
+        companies_searched=[c for c in fetch_result.companies_searched if c.lower() in wanted],
+        companies_failed=[c for c in fetch_result.companies_failed if c.lower() in wanted],
+        companies_timed_out=[c for c in fetch_result.companies_timed_out if c.lower() in wanted],
+        companies_skipped=[c for c in fetch_result.companies_skipped if c.lower() in wanted],
+    )
@@ -0,0 +1,46 @@
+"""Deferred loading of the agent stack.
+
+Importing `agent.job_search_agent` pulls in LangChain, the OpenAI SDK and
+the scrapers, which dominates worker boot time and memory. The API imports
+the agent through this module instead, so the cost is paid on the first
+analyze request (or by `prewarm` in the background once the server is up)
+and never by workers that only serve /api/health or /api/companies.
+
+Nothing here may import LangChain or OpenAI at module level.
+"""
+
+import asyncio
+import sys
+import time
+
+
+def get_agent_class() -> type:
+    """Import and return JobSearchAgent (cached by the import system after the first call)."""
+    from agent.job_search_agent import JobSearchAgent
+    return JobSearchAgent
+
+
+def _warm() -> float:
+    start = time.perf_counter()
+    get_agent_class()
+    from agent.runtime import get_runtime
+    # Building the runtime creates the LLM client and compiles the chains,
+    # which also imports the OpenAI SDK's lazily loaded submodules
+    get_runtime()
+    return time.perf_counter() - start
+
+
+async def prewarm() -> None:
+    """Import the agent stack in a worker thread without blocking the event loop."""
+    try:
+        elapsed = await asyncio.to_thread(_warm)
+        print(f"Agent stack pre-warmed in {elapsed:.2f}s")
+    except Exception as e:
+        print(f"Agent pre-warm failed (will load on first request): {e}")
+
+
+async def shutdown() -> None:
+    """Close the agent runtime if it was ever created (without importing it otherwise)."""
+    runtime_module = sys.modules.get("agent.runtime")
+    if runtime_module is not None:
+        await runtime_module.close_runtime()
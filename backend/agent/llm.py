@@ -0,0 +1,38 @@
+"""Chat model factory."""
+
+from config import get_settings
+
+
+def create_chat_model(model: str, temperature: float, http_async_client=None):
+    """
+    Create the chat model used by the agent tools.
+
+    With LLM_BACKEND=fake a local fake model is returned instead of an
+    OpenAI client, so the full pipeline can run offline (load tests).
+
+    Args:
+        model: Model name (e.g. "gpt-4o-mini")
+        temperature: Sampling temperature
+        http_async_client: Optional shared httpx.AsyncClient (connection pooling)
+
+    Returns:
+        A LangChain chat model supporting `with_structured_output`
+    """
+    settings = get_settings()
+
+    if settings.llm_backend == "fake":
+        from loadtest.fake_llm import FakeChatModel
+        return FakeChatModel(
+            model=model,
+            latency_ms=settings.fake_llm_latency_ms,
+            latency_sigma=settings.fake_llm_latency_sigma,
+            drop_rate=settings.fake_llm_drop_rate,
+        )
+
+    from langchain_openai import ChatOpenAI  # Deferred: heavy import
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=settings.openai_api_key,
+        http_async_client=http_async_client,
+    )
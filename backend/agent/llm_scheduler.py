@@ -0,0 +1,168 @@
+"""Process-wide LLM call scheduler with per-request fair queueing.
+
+Every LLM call (profile expansion, ranking batches) takes a slot from one
+scheduler, so the number of calls in flight per worker is bounded no
+matter how many requests are running. When all slots are busy, waiting
+calls are granted slots:
+
+1. by operation priority - expansion sits on a request's critical path
+   (nothing can be filtered or ranked before it), so it goes ahead of
+   bulk ranking;
+2. round-robin across requests within a priority, so one profile with
+   many ranking batches cannot starve the others.
+
+A request is identified by a context variable set in `llm_request()`;
+asyncio tasks inherit it, so every call made while serving the request
+is attributed to it.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+from config import get_settings
+from services.metrics import LLM_CALLS_IN_FLIGHT, LLM_QUEUE_WAIT
+
+
+# Lower value = served first
+PRIORITIES = {
+    "expand_profile": 0,
+    "rank_batch": 1,
+}
+
+_request_ids = itertools.count(1)
+_current_request: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "llm_request", default=None
+)
+
+
+def new_request_id() -> int:
+    """Allocate an id for `llm_request` (to share one across several tasks)."""
+    return next(_request_ids)
+
+
+@contextmanager
+def llm_request(request_id: Optional[int] = None) -> Iterator[int]:
+    """
+    Attribute LLM calls made inside the block (and tasks it starts) to one request.
+
+    Args:
+        request_id: Existing id from `new_request_id` (a new one by default)
+    """
+    token = _current_request.set(request_id or new_request_id())
+    try:
+        yield _current_request.get()
+    finally:
+        _current_request.reset(token)
+
+
+class LLMScheduler:
+    """Global in-flight cap with priority + per-request round-robin queues."""
+
+    def __init__(self, max_in_flight: Optional[int] = None):
+        self.max_in_flight = max_in_flight or get_settings().llm_max_in_flight
+        self._in_flight = 0
+        # priority -> {request id -> waiters}; dict order is the round-robin order
+        self._queues: dict[int, "OrderedDict[Optional[int], deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in sorted(set(PRIORITIES.values()))
+        }
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queues in self._queues.values() for queue in queues.values())
+
+    @asynccontextmanager
+    async def slot(self, operation: str) -> AsyncIterator[None]:
+        """Hold one LLM slot for the duration of the block."""
+        await self._acquire(operation)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot only if one is free and nobody is queued (for optional
+        extra calls such as hedges, which must not delay real work).
+        Pair a successful call with `release`.
+        """
+        if self._in_flight >= self.max_in_flight or self.waiting:
+            return False
+        self._in_flight += 1
+        LLM_CALLS_IN_FLIGHT.set(self._in_flight)
+        return True
+
+    def release(self) -> None:
+        """Return a slot taken with `try_acquire`."""
+        self._release()
+
+    async def _acquire(self, operation: str) -> None:
+        start = time.perf_counter()
+        if self._in_flight < self.max_in_flight and not self.waiting:
+            self._in_flight += 1
+        else:
+            request = _current_request.get()
+            waiter = asyncio.get_running_loop().create_future()
+            self._queues[PRIORITIES[operation]].setdefault(request, deque()).append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._release()  # Granted just as we were cancelled
+                else:
+                    self._discard(PRIORITIES[operation], request, waiter)
+                raise
+        LLM_CALLS_IN_FLIGHT.set(self._in_flight)
+        LLM_QUEUE_WAIT.observe(time.perf_counter() - start, operation=operation)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        while self._in_flight < self.max_in_flight:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            self._in_flight += 1
+            waiter.set_result(None)
+        LLM_CALLS_IN_FLIGHT.set(self._in_flight)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        for queues in self._queues.values():
+            while queues:
+                # Take the next request's oldest call, then move it to the back
+                request, queue = queues.popitem(last=False)
+                waiter = queue.popleft()
+                if queue:
+                    queues[request] = queue
+                if not waiter.done():
+                    return waiter
+        return None
+
+    def _discard(self, priority: int, request: Optional[int], waiter: asyncio.Future) -> None:
+        queue = self._queues[priority].get(request)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del self._queues[priority][request]
+
+
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Process-wide LLM scheduler, created on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler()
+    return _scheduler
@@ -0,0 +1,202 @@
+"""Streaming fetch -> filter -> rank pipeline."""
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from api.schemas import Job, RankedJob
+from services.board_yield import BoardYield
+from services.filter_plan import FilterPlan
+from services.job_aggregator import JobAggregator
+from services.metrics import FETCH_EARLY_STOPS, RANK_BATCH_FAILURES
+
+
+RankBatchFn = Callable[[list[Job]], Awaitable[list[RankedJob]]]
+
+
+class StreamingRankPipeline:
+    """
+    Overlaps board fetching, filtering and LLM ranking.
+
+    Boards are fed in as they complete (`add_board`). Each board is
+    filtered and deduplicated against everything seen so far, and as soon
+    as `batch_size` preferred-location candidates have accumulated a
+    ranking batch is sent to the LLM while other boards are still loading.
+    Candidates in lower location buckets are held back until fetching is
+    done (`finish`), so the ranking budget still goes to the best location
+    matches first, as in the staged pipeline. Boards that arrive before
+    the profile is expanded are buffered until `start`.
+
+    With `early_stop`, `stop_fetching` is set once the whole ranking
+    budget has gone out in preferred-location batches (later boards could
+    not change the result), or `grace_seconds` after enough candidates of
+    any location exist to fill the budget. Pass it to the fetch as `stop`.
+    Each board's preferred-location yield is recorded in `board_yield`.
+    """
+
+    def __init__(
+        self,
+        aggregator: JobAggregator,
+        location: Optional[str],
+        years_of_experience: Optional[int],
+        expected_salary: Optional[int] = None,
+        max_jobs: int = 50,
+        batch_size: int = 15,
+        max_concurrent: int = 5,
+        early_stop: bool = False,
+        grace_seconds: float = 2.0,
+        board_yield: Optional[BoardYield] = None,
+    ):
+        self.aggregator = aggregator
+        self.location = location
+        self.years_of_experience = years_of_experience
+        self.expected_salary = expected_salary
+        self.max_jobs = max_jobs
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._priority = aggregator.location_priority_key(location) if location else None
+
+        self._plan: Optional[FilterPlan] = None  # Compiled once the profile is expanded
+        self._rank_batch: Optional[RankBatchFn] = None
+
+        self.early_stop = early_stop
+        self.grace_seconds = grace_seconds
+        self.board_yield = board_yield
+        self.stop_fetching = asyncio.Event()
+        self.stop_reason: Optional[str] = None
+        self._grace_timer: Optional[asyncio.TimerHandle] = None
+
+        self._waiting_boards: list[tuple[str, list[Job]]] = []  # Arrived before start()
+        self._seen: set[tuple[str, str]] = set()
+        self._ready: list[Job] = []                 # Preferred-location candidates
+        self._deferred: list[tuple[int, int, Job]] = []  # (priority, arrival, job)
+        self._arrivals = 0
+        self._dispatched = 0
+        self._tasks: list[asyncio.Task] = []
+        self.candidates = 0
+
+    def add_board(self, company: str, jobs: list[Job]) -> None:
+        """Feed one completed board (usable as a scraper `on_result` callback)."""
+        if self._rank_batch is None:
+            self._waiting_boards.append((company, jobs))
+            return
+        self._ingest(company, jobs)
+
+    def start(
+        self,
+        keywords: Optional[list[str]],
+        seniority_level: Optional[str],
+        rank_batch: RankBatchFn,
+    ) -> None:
+        """Provide the expanded profile and begin filtering/ranking."""
+        self._plan = self.aggregator.compile_plan(
+            keywords=keywords,
+            location=self.location,
+            years_of_experience=self.years_of_experience,
+            seniority_level=seniority_level,
+            expected_salary=self.expected_salary,
+        )
+        if self.location:
+            self._priority = self._plan.priority_key()
+        self._rank_batch = rank_batch
+        for company, jobs in self._waiting_boards:
+            self._ingest(company, jobs)
+        self._waiting_boards.clear()
+
+    def _ingest(self, company: str, jobs: list[Job]) -> None:
+        # One fused pass per board; dedupe state carries across boards
+        candidates = self._plan.run(jobs, seen=self._seen, sort=False)
+        self.candidates += len(candidates)
+        preferred = 0
+        for job in candidates:
+            priority = self._priority(job) if self._priority else 0
+            if priority == 0:
+                self._ready.append(job)
+                preferred += 1
+            else:
+                self._deferred.append((priority, self._arrivals, job))
+            self._arrivals += 1
+        if self.board_yield is not None:
+            self.board_yield.observe(company, self.location, preferred)
+
+        while len(self._ready) >= self.batch_size and self._dispatched < self.max_jobs:
+            take = min(self.batch_size, self.max_jobs - self._dispatched)
+            batch, self._ready = self._ready[:take], self._ready[take:]
+            self._dispatch(batch)
+
+        if self.early_stop and not self.stop_fetching.is_set():
+            if self._dispatched >= self.max_jobs:
+                self._stop("budget")
+            elif self._grace_timer is None and self.candidates >= self.max_jobs:
+                self._grace_timer = asyncio.get_running_loop().call_later(
+                    self.grace_seconds, self._stop, "grace"
+                )
+
+    def _stop(self, reason: str) -> None:
+        if self.stop_fetching.is_set():
+            return
+        self.stop_reason = reason
+        self.stop_fetching.set()
+        FETCH_EARLY_STOPS.inc(reason=reason)
+
+    def _dispatch(self, batch: list[Job]) -> None:
+        self._dispatched += len(batch)
+        self._tasks.append(asyncio.create_task(self._run_batch(batch)))
+
+    async def _run_batch(self, batch: list[Job]) -> list[RankedJob]:
+        async with self._semaphore:
+            return await self._rank_batch(batch)
+
+    async def finish(self, timeout: Optional[float] = None) -> list[RankedJob]:
+        """
+        Rank the remaining candidates and merge all batch results.
+
+        Call once fetching is done. Batches still running after `timeout`
+        seconds are cancelled.
+
+        Returns:
+            Ranked jobs sorted by match score descending
+        """
+        if self._rank_batch is None:
+            raise RuntimeError("finish() called before start()")
+        if self._grace_timer is not None:
+            self._grace_timer.cancel()
+
+        # Fill what is left of the budget: remaining preferred-location jobs
+        # first, then the other buckets in location-priority order.
+        self._deferred.sort(key=lambda entry: entry[:2])
+        remaining = self._ready + [job for _, _, job in self._deferred]
+        remaining = remaining[:max(0, self.max_jobs - self._dispatched)]
+        self._ready, self._deferred = [], []
+        for i in range(0, len(remaining), self.batch_size):
+            self._dispatch(remaining[i:i + self.batch_size])
+
+        if not self._tasks:
+            return []
+
+        try:
+            done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        finally:
+            # Also reached when the caller is cancelled: no batch outlives the request
+            unfinished = [task for task in self._tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+        if pending:
+            RANK_BATCH_FAILURES.inc(len(pending), reason="timeout")
+            print(f"Batch ranking timed out: {len(pending)} of {len(self._tasks)} batches cancelled")
+
+        # Merge step: batches finish in any order, so re-sort the union
+        ranked: list[RankedJob] = []
+        for task in self._tasks:
+            if task in done and task.exception() is None:
+                ranked.extend(task.result())
+        ranked.sort(key=lambda job: job.match_score, reverse=True)
+        return ranked
+
+    def cancel(self) -> None:
+        """Cancel in-flight ranking batches (e.g. when the request fails)."""
+        if self._grace_timer is not None:
+            self._grace_timer.cancel()
+        for task in self._tasks:
+            task.cancel()
@@ -0,0 +1,67 @@
+"""App-scoped agent runtime - long-lived LLM clients and compiled chains."""
+
+import threading
+from typing import Optional
+
+import httpx
+from langchain_core.runnables import Runnable
+
+from agent.llm import create_chat_model
+from agent.tools.job_ranker import build_rank_chain
+from agent.tools.profile_expander import build_expand_chain
+from config import get_settings
+
+
+class AgentRuntime:
+    """
+    Process-wide resources shared by every JobSearchAgent.
+
+    Owns one chat model backed by a pooled HTTP client (keep-alive
+    connections to the LLM API are reused across requests) and the
+    prompt | structured-output chains, compiled once instead of on every
+    request and batch.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_connections,
+            ),
+            timeout=settings.llm_http_timeout,
+        )
+        self.llm = create_chat_model(
+            model="gpt-4o-mini",
+            temperature=0.3,
+            http_async_client=self.http_client,
+        )
+        self.expand_chain: Runnable = build_expand_chain(self.llm)
+        self.rank_chain: Runnable = build_rank_chain(self.llm)
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self.http_client.aclose()
+
+
+_runtime: Optional[AgentRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> AgentRuntime:
+    """Get the process-wide runtime, creating it on first use."""
+    global _runtime
+    if _runtime is None:
+        # Lock because the pre-warm thread may race the first request
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = AgentRuntime()
+    return _runtime
+
+
+async def close_runtime() -> None:
+    """Release the runtime's resources (app shutdown)."""
+    global _runtime
+    if _runtime is not None:
+        await _runtime.aclose()
+        _runtime = None
@@ -1,15 +1,30 @@
 """Job ranker tool - ranks jobs by match score using AI."""
 
 import asyncio
-from typing import Optional
-from langchain_openai import ChatOpenAI
+import json
+from typing import TYPE_CHECKING, Optional
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel
+from agent.hedging import get_hedger
+from agent.llm import create_chat_model
+from agent.llm_scheduler import get_llm_scheduler
 from api.schemas import Job, RankedJob
+from config import get_settings
+from services.cache import CacheError, get_cache, make_key
+from services.cassette import get_cassette
+from services.metrics import (
+    STAGE_LATENCY, JOBS_RANKED, JOBS_UNRANKED, RANK_BATCH_FAILURES, RANK_RETRIES, TOKENS_PER_RANKED_JOB,
+    CACHE_REQUESTS, record_llm_usage,
+)
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI  # Annotations only; agent.llm imports it lazily
 
 
 class JobRankingResult(BaseModel):
     """Ranking result for a single job."""
+    job_id: str  # Reference the job was listed under ("J3")
     match_score: int
     insight: str
     match_reasons: list[str]
@@ -35,6 +50,8 @@ JOB_RANKER_PROMPT = """You are an expert tech recruiter matching candidates to j
 {jobs_text}
 
 For EACH job listed above, provide:
+0. **job_id**: The job's reference exactly as listed in brackets (e.g. "J3")
+
 1. **match_score** (0-100): How well does this job match the candidate?
    - 90-100: Perfect match
    - 70-89: Strong match
@@ -51,10 +68,22 @@ Consider:
 - Skill relevance (infer from job title)
 - Career progression (lateral move, step up, step down)
 
-Respond with a list of rankings in the same order as the jobs provided.
+Respond with one ranking per job, each with the job_id of the job it is for.
 """
 
 
+def build_rank_chain(llm: "ChatOpenAI") -> Runnable:
+    """
+    Compile the prompt | structured-output chain for batch ranking.
+    
+    The chain is stateless and safe to share across batches and requests;
+    the agent runtime builds it once per process.
+    """
+    structured_llm = llm.with_structured_output(BatchRankingResult, include_raw=True)
+    prompt = ChatPromptTemplate.from_template(JOB_RANKER_PROMPT)
+    return prompt | structured_llm
+
+
 async def rank_jobs(
     jobs: list[Job],
     role: str,
@@ -65,10 +94,13 @@ async def rank_jobs(
     skills: list[str],
     target_titles: list[str],
     expected_salary_range: str,
-    llm: Optional[ChatOpenAI] = None,
+    llm: Optional["ChatOpenAI"] = None,
+    chain: Optional[Runnable] = None,
     max_jobs: int = 50,  # Limit to prevent excessive API calls
     batch_size: int = 15,  # Larger batches = fewer API calls
     max_concurrent: int = 5,  # Max parallel API calls
+    timeout: Optional[float] = None,  # Batches unfinished after this are dropped
+    semaphore: Optional[asyncio.Semaphore] = None,  # Shared LLM pool (overrides max_concurrent)
 ) -> list[RankedJob]:
     """
     Rank jobs by match score using AI with parallel processing.
@@ -84,9 +116,14 @@ async def rank_jobs(
         target_titles: Target job titles
         expected_salary_range: Expected salary range
         llm: Optional LLM instance
+        chain: Optional prebuilt chain from `build_rank_chain` (takes precedence over llm)
         max_jobs: Maximum jobs to rank (prevents excessive API calls)
         batch_size: Jobs per API call
-        max_concurrent: Maximum concurrent API calls
+        max_concurrent: Maximum concurrent API calls for this call (the total
+            across requests is capped by the process-wide LLM scheduler)
+        timeout: Optional time budget in seconds; unfinished batches are cancelled
+        semaphore: Optional semaphore shared with other callers, so several
+            rank_jobs calls draw from one bounded pool of LLM calls
         
     Returns:
         List of RankedJob objects sorted by match score
@@ -97,8 +134,21 @@ async def rank_jobs(
     # Limit jobs to prevent excessive API usage
     jobs_to_rank = jobs[:max_jobs]
     
-    if llm is None:
-        llm = ChatOpenAI(model="gpt-5-nano", temperature=0.2)
+    # Reuse rankings already produced (by any worker) for this candidate
+    context = (
+        role, company, company_tier, years_of_experience, seniority_level,
+        skills, target_titles, expected_salary_range,
+    )
+    cached_jobs, jobs_to_rank = await _load_cached_rankings(jobs_to_rank, context)
+    if not jobs_to_rank:
+        cached_jobs.sort(key=lambda x: x.match_score, reverse=True)
+        return cached_jobs
+    
+    # Build the chain once for all batches (unless a shared one is passed in)
+    if chain is None:
+        if llm is None:
+            llm = create_chat_model(model="gpt-5-nano", temperature=0.2)
+        chain = build_rank_chain(llm)
     
     # Create batches
     batches = [
@@ -107,29 +157,45 @@ async def rank_jobs(
     ]
     
     # Process batches in parallel with concurrency limit
-    semaphore = asyncio.Semaphore(max_concurrent)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrent)
     
     async def rank_with_semaphore(batch: list[Job]) -> list[RankedJob]:
         async with semaphore:
             return await _rank_batch(
                 batch, role, company, company_tier, years_of_experience,
-                seniority_level, skills, target_titles, expected_salary_range, llm
+                seniority_level, skills, target_titles, expected_salary_range, chain
             )
     
-    # Run all batches concurrently
-    results = await asyncio.gather(
-        *[rank_with_semaphore(batch) for batch in batches],
-        return_exceptions=True
-    )
+    # Run all batches concurrently within the time budget
+    tasks = [asyncio.create_task(rank_with_semaphore(batch)) for batch in batches]
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+    finally:
+        # Also reached when the caller is cancelled: no batch outlives the request
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            await asyncio.gather(*unfinished, return_exceptions=True)
+    if pending:
+        RANK_BATCH_FAILURES.inc(len(pending), reason="timeout")
+        print(f"Batch ranking timed out: {len(pending)} of {len(tasks)} batches cancelled")
     
     # Flatten results, skip failed batches
     all_ranked_jobs: list[RankedJob] = []
-    for result in results:
-        if isinstance(result, list):
-            all_ranked_jobs.extend(result)
+    for task in tasks:
+        if task not in done:
+            continue
+        if task.exception() is None:
+            all_ranked_jobs.extend(task.result())
         else:
             # Log error but continue with other batches
-            print(f"Batch ranking failed: {result}")
+            RANK_BATCH_FAILURES.inc(reason="error")
+            print(f"Batch ranking failed: {task.exception()}")
+    
+    await _store_rankings(all_ranked_jobs, context)
+    all_ranked_jobs.extend(cached_jobs)
     
     # Sort by match score descending
     all_ranked_jobs.sort(key=lambda x: x.match_score, reverse=True)
@@ -147,21 +213,81 @@ async def _rank_batch(
     skills: list[str],
     target_titles: list[str],
     expected_salary_range: str,
-    llm: ChatOpenAI
+    chain: Runnable,
+    retries: Optional[int] = None,
 ) -> list[RankedJob]:
-    """Rank a batch of jobs."""
+    """
+    Rank a batch of jobs, retrying only the jobs the model did not rank.
+    
+    Rankings are matched to jobs by the reference each job is listed
+    under, so reordered output is attached to the right jobs. Jobs with a
+    missing, duplicate or invalid ranking are sent again in a smaller
+    follow-up call, up to `retries` times (a call that raises is retried
+    the same way). Jobs still unranked after that are dropped.
+    
+    Raises:
+        The last error if every attempt failed and no job was ranked
+    """
+    if retries is None:
+        retries = get_settings().rank_retry_attempts
+    context = (
+        role, company, company_tier, years_of_experience, seniority_level,
+        skills, target_titles, expected_salary_range,
+    )
+    
+    ranked_jobs: list[RankedJob] = []
+    pending = jobs
+    tokens = 0
+    for attempt in range(retries + 1):
+        try:
+            ranked, pending, used = await _rank_once(pending, context, chain)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if attempt == retries:
+                if not ranked_jobs:
+                    raise
+                JOBS_UNRANKED.inc(len(pending), reason="error")
+                print(f"Ranking retry failed, {len(pending)} jobs left unranked: {e}")
+                pending = []
+                break
+            RANK_RETRIES.inc(reason="error")
+            continue
+        ranked_jobs.extend(ranked)
+        tokens += used
+        if not pending:
+            break
+        if attempt < retries:
+            RANK_RETRIES.inc(reason="missing")
+    
+    if pending:
+        JOBS_UNRANKED.inc(len(pending), reason="missing")
+        print(f"Model did not rank {len(pending)} of {len(jobs)} jobs")
+    if ranked_jobs and tokens:
+        TOKENS_PER_RANKED_JOB.observe(tokens / len(ranked_jobs))
+    return ranked_jobs
+
+
+async def _rank_once(
+    jobs: list[Job], context: tuple, chain: Runnable
+) -> tuple[list[RankedJob], list[Job], int]:
+    """
+    One ranking call.
+    
+    Returns:
+        Tuple of (ranked jobs, jobs without a valid ranking, tokens used)
+    """
+    (role, company, company_tier, years_of_experience, seniority_level,
+     skills, target_titles, expected_salary_range) = context
     
-    # Format jobs for prompt
+    # Each job is listed under a short reference the model must echo back
+    refs = {f"J{idx + 1}": job for idx, job in enumerate(jobs)}
     jobs_text = "\n".join([
-        f"{idx + 1}. {job.title} at {job.company} ({job.location or 'Location not specified'})"
-        for idx, job in enumerate(jobs)
+        f"[{ref}] {job.title} at {job.company} ({job.location or 'Location not specified'})"
+        for ref, job in refs.items()
     ])
     
-    structured_llm = llm.with_structured_output(BatchRankingResult)
-    prompt = ChatPromptTemplate.from_template(JOB_RANKER_PROMPT)
-    chain = prompt | structured_llm
-    
-    result = await chain.ainvoke({
+    inputs = {
         "role": role,
         "company": company,
         "company_tier": company_tier,
@@ -171,26 +297,111 @@ async def _rank_batch(
         "target_titles": ", ".join(target_titles),
         "expected_salary_range": expected_salary_range,
         "jobs_text": jobs_text
-    })
+    }
+    cassette = get_cassette()
+    
+    async def invoke() -> dict:
+        if cassette is not None:
+            # Per-job keys let a replay re-batch jobs differently from the recording
+            return await cassette.invoke_llm(
+                "rank_batch", chain, inputs, BatchRankingResult,
+                items={ref: _ranking_key(context, job) for ref, job in refs.items()},
+                item_id="job_id",
+            )
+        return await chain.ainvoke(inputs)
     
-    # Combine job data with rankings
+    # Waits for a slot in the process-wide LLM scheduler (fair across requests).
+    # A hedge takes a second slot, and only if one is free right away.
+    hedger = get_hedger()
+    async with get_llm_scheduler().slot("rank_batch"):
+        with STAGE_LATENCY.time(stage="rank_batch"):
+            if hedger is not None:
+                output = await hedger.run("rank_batch", invoke)
+            else:
+                output = await invoke()
+    
+    tokens = record_llm_usage("rank_batch", output["raw"])
+    if output["parsing_error"] is not None:
+        raise output["parsing_error"]
+    result: BatchRankingResult = output["parsed"]
+    
+    # Match rankings to jobs by reference; unknown refs, repeats and
+    # out-of-range scores are ignored so those jobs are retried
     ranked_jobs = []
-    for job, ranking in zip(jobs, result.rankings):
-        ranked_job = RankedJob(
-            id=job.id,
-            title=job.title,
-            company=job.company,
-            location=job.location,
-            url=job.url,
-            source=job.source,
-            posted_date=job.posted_date,
-            description=job.description,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            match_score=ranking.match_score,
-            insight=ranking.insight,
-            match_reasons=ranking.match_reasons
-        )
-        ranked_jobs.append(ranked_job)
+    for ranking in result.rankings:
+        ref = ranking.job_id.strip().strip("[]")
+        if ref not in refs or not 0 <= ranking.match_score <= 100:
+            continue
+        job = refs.pop(ref)
+        ranked_jobs.append(_to_ranked_job(job, ranking.match_score, ranking.insight, ranking.match_reasons))
+        JOBS_RANKED.inc(source=job.source)
     
-    return ranked_jobs
+    return ranked_jobs, list(refs.values()), tokens
+
+
+def _to_ranked_job(job: Job, match_score: int, insight: str, match_reasons: list[str]) -> RankedJob:
+    return RankedJob(
+        id=job.id,
+        title=job.title,
+        company=job.company,
+        location=job.location,
+        url=job.url,
+        source=job.source,
+        posted_date=job.posted_date,
+        description=job.description,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        match_score=match_score,
+        insight=insight,
+        match_reasons=match_reasons
+    )
+
+
+def _ranking_key(context: tuple, job: Job) -> str:
+    # Title and location are part of the key so edited postings are re-ranked
+    return make_key("rank", context, job.source, job.id, job.title, job.location)
+
+
+async def _load_cached_rankings(jobs: list[Job], context: tuple) -> tuple[list[RankedJob], list[Job]]:
+    """
+    Split jobs into cached rankings and jobs that still need the LLM.
+    
+    Returns:
+        Tuple of (ranked jobs from the cache, jobs to rank)
+    """
+    if get_settings().ranking_cache_ttl <= 0:
+        return [], jobs
+    try:
+        values = await get_cache().get_many([_ranking_key(context, job) for job in jobs])
+    except CacheError as e:
+        print(f"Ranking cache unavailable: {e}")
+        return [], jobs
+    
+    hits: list[RankedJob] = []
+    misses: list[Job] = []
+    for job, raw in zip(jobs, values):
+        if raw is None:
+            misses.append(job)
+        else:
+            hits.append(_to_ranked_job(job, **json.loads(raw)))
+    CACHE_REQUESTS.inc(len(hits), cache="ranking", result="hit")
+    CACHE_REQUESTS.inc(len(misses), cache="ranking", result="miss")
+    return hits, misses
+
+
+async def _store_rankings(ranked_jobs: list[RankedJob], context: tuple) -> None:
+    ttl = get_settings().ranking_cache_ttl
+    if ttl <= 0 or not ranked_jobs:
+        return
+    items = {
+        _ranking_key(context, job): json.dumps({
+            "match_score": job.match_score,
+            "insight": job.insight,
+            "match_reasons": job.match_reasons,
+        }).encode()
+        for job in ranked_jobs
+    }
+    try:
+        await get_cache().set_many(items, ttl)
+    except CacheError as e:
+        print(f"Ranking cache write failed: {e}")
@@ -1,9 +1,16 @@
 """Profile expander tool - expands minimal user input to rich profile."""
 
-from typing import Optional
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING, Optional
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel
+from agent.llm import create_chat_model
+from agent.llm_scheduler import get_llm_scheduler
+from services.cassette import get_cassette
+from services.metrics import STAGE_LATENCY, record_llm_usage
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI  # Type hints only
 
 
 class ExpandedProfileData(BaseModel):
@@ -71,6 +78,19 @@ Respond in JSON format with these exact keys:
 """
 
 
+def build_expand_chain(llm: "ChatOpenAI") -> Runnable:
+    """
+    Compile the prompt | structured-output chain for profile expansion.
+    
+    The chain is stateless and safe to share across requests; the agent
+    runtime builds it once per process.
+    """
+    # Structured output LLM (raw message kept for token accounting)
+    structured_llm = llm.with_structured_output(ExpandedProfileData, include_raw=True)
+    prompt = ChatPromptTemplate.from_template(PROFILE_EXPANDER_PROMPT)
+    return prompt | structured_llm
+
+
 async def expand_profile(
     role: str,
     company: str,
@@ -78,7 +98,8 @@ async def expand_profile(
     skills: Optional[list[str]] = None,
     expected_salary: Optional[int] = None,
     location: Optional[str] = None,
-    llm: Optional[ChatOpenAI] = None
+    llm: Optional["ChatOpenAI"] = None,
+    chain: Optional[Runnable] = None,
 ) -> ExpandedProfileData:
     """
     Expand minimal user profile into comprehensive profile using AI.
@@ -91,31 +112,72 @@ async def expand_profile(
         expected_salary: Optional expected salary
         location: Optional preferred location
         llm: Optional LLM instance (creates one if not provided)
+        chain: Optional prebuilt chain from `build_expand_chain` (takes precedence over llm)
         
     Returns:
         ExpandedProfileData with inferred information
     """
-    if llm is None:
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-    
-    # Create structured output LLM
-    structured_llm = llm.with_structured_output(ExpandedProfileData)
-    
-    prompt = ChatPromptTemplate.from_template(PROFILE_EXPANDER_PROMPT)
-    
-    chain = prompt | structured_llm
+    if chain is None:
+        if llm is None:
+            llm = create_chat_model(model="gpt-4o-mini", temperature=0.3)
+        chain = build_expand_chain(llm)
     
-    result = await chain.ainvoke({
+    inputs = {
         "role": role,
         "company": company,
         "years_of_experience": years_of_experience,
         "skills": ", ".join(skills) if skills else "Not specified",
         "expected_salary": f"${expected_salary:,}" if expected_salary else "Not specified",
         "location": location or "Not specified"
-    })
+    }
+    cassette = get_cassette()
+    
+    # Expansion is on the critical path, so it is scheduled ahead of ranking
+    async with get_llm_scheduler().slot("expand_profile"):
+        with STAGE_LATENCY.time(stage="expand_profile"):
+            if cassette is not None:
+                output = await cassette.invoke_llm("expand_profile", chain, inputs, ExpandedProfileData)
+            else:
+                output = await chain.ainvoke(inputs)
+    
+    record_llm_usage("expand_profile", output["raw"])
+    if output["parsing_error"] is not None:
+        raise output["parsing_error"]
+    result: ExpandedProfileData = output["parsed"]
     
     # Ensure the original role is always included in target titles
     if role not in result.target_titles:
         result.target_titles.insert(0, role)
     
     return result
+
+
+def default_profile_data(
+    role: str,
+    years_of_experience: int,
+    skills: Optional[list[str]] = None,
+) -> ExpandedProfileData:
+    """
+    Build a minimal profile without the LLM.
+    
+    Used when expansion does not finish within its share of the request
+    deadline, so the search can still run with the user's own inputs.
+    """
+    if years_of_experience <= 1:
+        seniority_level = "Junior/Entry"
+    elif years_of_experience <= 3:
+        seniority_level = "Mid-level"
+    elif years_of_experience <= 6:
+        seniority_level = "Senior"
+    elif years_of_experience <= 10:
+        seniority_level = "Staff/Lead"
+    else:
+        seniority_level = "Principal/Architect"
+    
+    return ExpandedProfileData(
+        inferred_skills=list(skills or []),
+        seniority_level=seniority_level,
+        target_titles=[role],
+        company_tier="Unknown",
+        expected_salary_range="Not specified",
+    )
@@ -0,0 +1,159 @@
+"""On-demand profiling of single requests.
+
+An admin adds `X-Profile: 1` (or `?profile=1`) and a matching
+`X-Admin-Token` header to a request. While it runs, a background thread
+samples the event loop thread's Python stack and tracemalloc traces
+allocations. When the response is done two files are written to
+PROFILE_DIR:
+
+- `<id>.folded`: folded stacks ("a;b;c <samples>"), the input format of
+  flamegraph.pl, speedscope and inferno
+- `<id>.allocations.txt`: peak traced memory and the top allocation sites
+  still holding memory when the request finished
+
+The response carries `X-Profile-Id: <id>`. The event loop thread is shared,
+so samples include any other requests running at the same time; profile
+on a quiet worker for a clean picture. One request is profiled at a time
+per worker; flagged requests arriving meanwhile run unprofiled.
+
+The middleware is only installed when PROFILE_DIR and ADMIN_TOKEN are set,
+so unflagged requests pay nothing when profiling is off.
+"""
+
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from types import FrameType
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval from a helper thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Stop sampling; returns folded stack -> sample count."""
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_fold(frame)] += 1
+
+
+def _fold(frame: Optional[FrameType]) -> str:
+    """Root-first "func (file:line);..." stack string for one frame."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfilingMiddleware:
+    """Profile requests flagged by an admin (see module docstring)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        admin_token: str,
+        sample_interval: float = 0.005,
+        top_allocations: int = 25,
+    ):
+        self.app = app
+        self.directory = directory
+        self.admin_token = admin_token
+        self.sample_interval = sample_interval
+        self.top_allocations = top_allocations
+        self._busy = False
+
+    def _requested(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        flagged = headers.get("x-profile") == "1" or (
+            parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile") == ["1"]
+        )
+        if not flagged:
+            return False
+        token = headers.get("x-admin-token", "")
+        return hmac.compare_digest(token.encode(), self.admin_token.encode())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._busy or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.take_snapshot()
+        sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = time.perf_counter() - start
+            samples = sampler.stop()
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self._busy = False
+            # The profiler's own bookkeeping is not part of the request
+            ignore = [tracemalloc.Filter(False, path) for path in (__file__, threading.__file__, tracemalloc.__file__)]
+            allocations = snapshot.filter_traces(ignore).compare_to(baseline.filter_traces(ignore), "lineno")
+            await asyncio.to_thread(self._write, profile_id, scope, elapsed, samples, peak, allocations)
+
+    def _write(
+        self, profile_id: str, scope: Scope, elapsed: float, samples: Counter, peak: int, allocations: list
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile_id)
+        with open(f"{base}.folded", "w") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        grown = [stat for stat in allocations if stat.size_diff > 0][:self.top_allocations]
+        with open(f"{base}.allocations.txt", "w") as f:
+            f.write(f"{scope['method']} {scope['path']} took {elapsed * 1000:.0f} ms, "
+                    f"{sum(samples.values())} stack samples\n")
+            f.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB\n\n")
+            f.write(f"Top {len(grown)} allocation sites still holding memory after the request:\n")
+            for stat in grown:
+                frame = stat.traceback[0]
+                f.write(f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  "
+                        f"{frame.filename}:{frame.lineno}\n")
+        print(f"Profiled {scope['path']} ({elapsed * 1000:.0f} ms) -> {base}.folded")
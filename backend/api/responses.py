@@ -0,0 +1,44 @@
+"""Fast JSON responses."""
+
+import json
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; falls back to the standard library
+    orjson = None
+
+
+# Leaves job descriptions out of AnalyzeResponse / ResultPage (list view)
+DESCRIPTION_EXCLUDE = {"jobs": {"__all__": {"description"}}}
+
+# Same for SavedSearchRun (merged ranking and the new-since-last-run view)
+SAVED_RUN_DESCRIPTION_EXCLUDE = {"result": DESCRIPTION_EXCLUDE, "new_jobs": {"__all__": {"description"}}}
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that skips FastAPI's jsonable_encoder pass.
+
+    Pydantic models are serialized by pydantic-core directly; other content
+    goes through orjson when installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def model_response(model: BaseModel, exclude: Optional[dict] = None) -> Response:
+    """Serialize a response model straight to JSON bytes."""
+    return Response(
+        content=model.model_dump_json(exclude=exclude),
+        media_type="application/json",
+    )
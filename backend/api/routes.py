@@ -1,9 +1,22 @@
 """API route definitions."""
 
-from fastapi import APIRouter, HTTPException
-from api.schemas import ProfileRequest, AnalyzeResponse, ErrorResponse
-from agent.job_search_agent import JobSearchAgent
-from services.job_aggregator import JobAggregator
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from api.schemas import (
+    ProfileRequest, AnalyzeResponse, AnalyzeTask, BatchAnalyzeRequest, ResultPage, ErrorResponse,
+    SavedSearchRun,
+)
+from api.responses import DESCRIPTION_EXCLUDE, SAVED_RUN_DESCRIPTION_EXCLUDE, model_response
+from agent.lazy import get_agent_class
+from config import get_settings
+from services.loop_monitor import get_loop_monitor
+from services.metrics import REGISTRY
+from services.result_store import get_result_store, paginate, store_first_page
+from services.saved_searches import SavedSearchLimit, get_saved_search_store
+from services.task_queue import TaskQueueFull, get_task_queue
 
 router = APIRouter(prefix="/api", tags=["jobs"])
 
@@ -15,7 +28,7 @@ router = APIRouter(prefix="/api", tags=["jobs"])
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def analyze_profile(profile: ProfileRequest) -> AnalyzeResponse:
+async def analyze_profile(profile: ProfileRequest) -> Response:
     """
     Analyze user profile and return matched jobs.
     
@@ -24,12 +37,17 @@ async def analyze_profile(profile: ProfileRequest) -> AnalyzeResponse:
     2. Fetches jobs from Greenhouse and Lever job boards
     3. Ranks jobs by match score using AI
     4. Returns deduplicated, ranked job listings
+    
+    With `page_size`, only the first page is returned; the full result set
+    is kept server-side and further pages come from /api/results/{result_id}.
     """
     try:
-        agent = JobSearchAgent()
+        agent = get_agent_class()()
         result = await agent.analyze(profile)
         await agent.close()
-        return result
+        if profile.page_size:
+            result = await store_first_page(result, profile.page_size)
+        return model_response(result, exclude=None if profile.include_descriptions else DESCRIPTION_EXCLUDE)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -37,6 +55,208 @@ async def analyze_profile(profile: ProfileRequest) -> AnalyzeResponse:
         )
 
 
+@router.post(
+    "/analyze/jobs",
+    response_model=AnalyzeTask,
+    status_code=202,
+    responses={
+        429: {"model": ErrorResponse, "description": "Queue full; retry after the Retry-After delay"}
+    }
+)
+async def submit_analyze_job(profile: ProfileRequest, response: Response) -> AnalyzeTask:
+    """
+    Queue a profile for analysis and return a task id immediately.
+    
+    Poll /api/analyze/jobs/{task_id} for progress; the result is included
+    once the task has succeeded and is kept for TASK_TTL seconds.
+    """
+    try:
+        task = await get_task_queue().submit(profile)
+    except TaskQueueFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    response.headers["Location"] = f"/api/analyze/jobs/{task.task_id}"
+    return task
+
+
+@router.get(
+    "/analyze/jobs/{task_id}",
+    response_model=AnalyzeTask,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown or expired task"}
+    }
+)
+async def get_analyze_job(task_id: str) -> AnalyzeTask:
+    """Status, progress and (when finished) the result of a queued analyze task."""
+    task = await get_task_queue().get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found or expired")
+    return task
+
+
+@router.get(
+    "/results/{result_id}",
+    response_model=ResultPage,
+    responses={
+        400: {"model": ErrorResponse, "description": "Malformed cursor"},
+        404: {"model": ErrorResponse, "description": "Unknown or expired result set"},
+    }
+)
+async def get_results_page(
+    result_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=200),
+    include_descriptions: bool = False,
+) -> Response:
+    """
+    Page through a stored result set without re-running the pipeline.
+    
+    Pass the `next_cursor` from the previous page (or from the analyze
+    response) as `cursor`.
+    """
+    stored = await get_result_store().load(result_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Result set not found or expired")
+    try:
+        jobs, next_cursor = paginate(stored.jobs, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    page = ResultPage(result_id=result_id, jobs=jobs, total_jobs=stored.total_jobs, next_cursor=next_cursor)
+    return model_response(page, exclude=None if include_descriptions else DESCRIPTION_EXCLUDE)
+
+
+@router.post(
+    "/analyze/batch",
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "One BatchAnalyzeItem per line"},
+        400: {"model": ErrorResponse, "description": "Too many profiles"},
+    }
+)
+async def analyze_batch(request: BatchAnalyzeRequest) -> StreamingResponse:
+    """
+    Analyze many profiles against a single fetch of the job boards.
+    
+    Streams newline-delimited JSON: one `BatchAnalyzeItem` per profile,
+    written as soon as that profile is ranked (so not in request order;
+    use `index` to match results to profiles).
+    """
+    max_profiles = get_settings().batch_max_profiles
+    if len(request.profiles) > max_profiles:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {max_profiles} profiles per batch"
+        )
+    
+    agent = get_agent_class()()
+    
+    async def stream():
+        try:
+            async for item in agent.analyze_batch(request.profiles, request.timeout_seconds):
+                profile = request.profiles[item.index]
+                exclude = None if profile.include_descriptions else {"result": DESCRIPTION_EXCLUDE}
+                yield item.model_dump_json(exclude=exclude) + "\n"
+        finally:
+            await agent.close()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/searches",
+    response_model=SavedSearchRun,
+    status_code=201,
+    responses={
+        503: {"model": ErrorResponse, "description": "Saved search limit reached (in-memory store)"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    }
+)
+async def create_saved_search(profile: ProfileRequest) -> Response:
+    """
+    Save a search and run it for the first time (a full analyze).
+    
+    Re-run it with POST /api/searches/{search_id}/run to rank only the
+    postings added or changed since the previous run.
+    """
+    store = get_saved_search_store()
+    try:
+        await store.ensure_capacity()  # Before the expensive first run
+        agent = get_agent_class()()
+        search, run = await agent.run_saved_search(profile)
+        await agent.close()
+        await store.save(search)
+    except SavedSearchLimit as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error running saved search: {str(e)}"
+        )
+    result = model_response(run, exclude=None if profile.include_descriptions else SAVED_RUN_DESCRIPTION_EXCLUDE)
+    result.status_code = 201
+    result.headers["Location"] = f"/api/searches/{search.search_id}"
+    return result
+
+
+@router.post(
+    "/searches/{search_id}/run",
+    response_model=SavedSearchRun,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown or expired saved search"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    }
+)
+async def run_saved_search(search_id: str) -> Response:
+    """
+    Re-run a saved search against postings added or changed since its last run.
+    
+    Only those postings are ranked; `result` is the merged ranking and
+    `new_jobs` the "new since last time" view.
+    """
+    store = get_saved_search_store()
+    previous = await store.load(search_id)
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Saved search not found or expired")
+    try:
+        agent = get_agent_class()()
+        search, run = await agent.run_saved_search(previous.profile, previous)
+        await agent.close()
+        await store.save(search)
+    except SavedSearchLimit as e:
+        raise HTTPException(status_code=503, detail=str(e))  # Expired mid-run, store full
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error running saved search: {str(e)}"
+        )
+    include_descriptions = previous.profile.include_descriptions
+    return model_response(run, exclude=None if include_descriptions else SAVED_RUN_DESCRIPTION_EXCLUDE)
+
+
+@router.get(
+    "/searches/{search_id}",
+    response_model=AnalyzeResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown or expired saved search"}
+    }
+)
+async def get_saved_search(search_id: str, include_descriptions: bool = False) -> Response:
+    """Ranking of a saved search as of its last run (no re-run)."""
+    search = await get_saved_search_store().load(search_id)
+    if search is None:
+        raise HTTPException(status_code=404, detail="Saved search not found or expired")
+    return model_response(search.result, exclude=None if include_descriptions else DESCRIPTION_EXCLUDE)
+
+
+@router.delete("/searches/{search_id}", status_code=204)
+async def delete_saved_search(search_id: str) -> Response:
+    """Forget a saved search."""
+    await get_saved_search_store().delete(search_id)
+    return Response(status_code=204)
+
+
 @router.get("/companies")
 async def get_available_companies() -> dict:
     """
@@ -44,6 +264,7 @@ async def get_available_companies() -> dict:
     
     Returns companies organized by job board source.
     """
+    from services.job_aggregator import JobAggregator  # Deferred: pulls in the scrapers
     return JobAggregator.get_available_companies()
 
 
@@ -53,3 +274,28 @@ async def health_check() -> dict:
     return {"status": "healthy", "service": "job-search-api"}
 
 
+@router.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus text exposition of this worker's metrics."""
+    return Response(
+        content=REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@router.get("/debug/loop")
+async def debug_loop(x_admin_token: Optional[str] = Header(default=None)) -> dict:
+    """
+    Event-loop lag and recent stalls of this worker, with stack attribution.
+    
+    Requires X-Admin-Token; not served at all unless ADMIN_TOKEN is set.
+    """
+    admin_token = get_settings().admin_token
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest((x_admin_token or "").encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    monitor = get_loop_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Loop monitor is disabled")
+    return monitor.snapshot()
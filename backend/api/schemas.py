@@ -14,6 +14,21 @@ class ProfileRequest(BaseModel):
     expected_salary: Optional[int] = Field(default=None, description="Expected salary in USD (optional)")
     location: Optional[str] = Field(default="Remote", description="Preferred location")
     target_companies: Optional[list[str]] = Field(default=None, description="Specific companies to search")
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        description="Overall time budget for the request (optional, capped by the server)",
+        gt=0,
+    )
+    include_descriptions: bool = Field(
+        default=True,
+        description="Include job descriptions (leave out for list views to shrink the response)",
+    )
+    page_size: Optional[int] = Field(
+        default=None,
+        description="Return only the first page of jobs and keep the rest server-side (see /api/results)",
+        ge=1,
+        le=200,
+    )
     
     class Config:
         json_schema_extra = {
@@ -75,6 +90,88 @@ class AnalyzeResponse(BaseModel):
     jobs: list[RankedJob]
     total_jobs: int
     companies_searched: list[str]
+    companies_failed: list[str] = Field(default_factory=list, description="Boards that returned an error")
+    companies_timed_out: list[str] = Field(default_factory=list, description="Boards cancelled at the deadline")
+    companies_skipped: list[str] = Field(
+        default_factory=list,
+        description="Boards cancelled once the request had enough candidates",
+    )
+    result_id: Optional[str] = Field(default=None, description="Id for fetching more pages (when paged)")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, if any")
+
+
+class ResultPage(BaseModel):
+    """One page of a stored result set."""
+    
+    result_id: str
+    jobs: list[RankedJob]
+    total_jobs: int
+    next_cursor: Optional[str] = None
+
+
+class BatchAnalyzeRequest(BaseModel):
+    """Many profiles evaluated against one shared corpus fetch."""
+    
+    profiles: list[ProfileRequest] = Field(..., description="Profiles to analyze", min_length=1)
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        description="Overall time budget for the whole batch (optional, capped by the server)",
+        gt=0,
+    )
+
+
+class BatchAnalyzeItem(BaseModel):
+    """One line of the /analyze/batch NDJSON stream."""
+    
+    index: int = Field(..., description="Position of the profile in the request")
+    result: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None
+
+
+class AnalyzeTask(BaseModel):
+    """State of a queued /analyze/jobs request."""
+    
+    task_id: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    stage: Optional[str] = Field(default=None, description="Current workflow stage while running")
+    progress: float = Field(default=0.0, ge=0, le=1, description="Fraction of the work done")
+    queue_position: Optional[int] = Field(default=None, description="Tasks ahead of this one (while queued)")
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None
+
+
+class SavedSearch(BaseModel):
+    """A search kept server-side for incremental re-runs (stored state)."""
+    
+    search_id: str
+    profile: ProfileRequest
+    result: AnalyzeResponse = Field(..., description="Merged ranking (and expanded profile) as of the last run")
+    fingerprints: dict[str, str] = Field(
+        default_factory=dict,
+        description="Content hash of every candidate of the last run, by source:id",
+    )
+    created_at: float
+    last_run_at: float
+
+
+class SavedSearchRun(BaseModel):
+    """Outcome of creating or re-running a saved search."""
+    
+    search_id: str
+    result: AnalyzeResponse = Field(..., description="Full merged ranking")
+    new_jobs: list[RankedJob] = Field(
+        default_factory=list,
+        description="Jobs ranked in this run (new or changed postings), in result order",
+    )
+    candidates: int = Field(..., description="Jobs that passed the filters in this run")
+    candidates_new: int = Field(..., description="New or changed candidates (up to 50 are ranked)")
+    jobs_reused: int = Field(..., description="Previously ranked jobs kept without re-ranking")
+    jobs_removed: int = Field(..., description="Previously ranked jobs no longer listed or no longer matching")
+    previous_run_at: Optional[float] = None
+    run_at: float
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,68 @@
+"""Per-request and per-batch setup overhead, before and after the agent runtime.
+
+"before" rebuilds what the agent used to build on every request/batch:
+a ChatOpenAI client per request and a prompt | structured-output chain per
+batch. "after" reuses the app-scoped AgentRuntime. No network calls are
+made; only object construction is timed.
+
+Usage (from backend/):
+    python -m benchmarks.agent_setup --iterations 200
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, Optional
+
+
+def time_per_call(func: Callable[[], object], iterations: int) -> float:
+    """Mean microseconds per call."""
+    func()  # Warm imports and caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(argv: Optional[list[str]] = None) -> dict[str, float]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batches-per-request", type=int, default=4,
+                        help="Ranking batches per request (50 jobs / 15 per batch)")
+    args = parser.parse_args(argv)
+
+    # Client construction needs a key but never uses it here
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+    from agent.llm import create_chat_model
+    from agent.runtime import get_runtime
+    from agent.tools.job_ranker import build_rank_chain
+    from agent.tools.profile_expander import build_expand_chain
+
+    def before_request() -> None:
+        llm = create_chat_model(model="gpt-4o-mini", temperature=0.3)
+        build_expand_chain(llm)
+        for _ in range(args.batches_per_request):
+            build_rank_chain(llm)
+
+    def after_request() -> None:
+        runtime = get_runtime()
+        runtime.expand_chain, runtime.rank_chain
+
+    results = {
+        "chat_client_us": time_per_call(lambda: create_chat_model(model="gpt-4o-mini", temperature=0.3), args.iterations),
+        "rank_chain_build_us": time_per_call(lambda: build_rank_chain(get_runtime().llm), args.iterations),
+        "request_setup_before_us": time_per_call(before_request, args.iterations),
+        "request_setup_after_us": time_per_call(after_request, args.iterations),
+    }
+
+    for name, value in results.items():
+        print(f"{name:<28} {value:>10.1f} µs")
+    saved = results["request_setup_before_us"] - results["request_setup_after_us"]
+    print(f"\nSetup saved per request: {saved / 1000:.2f} ms "
+          f"({args.batches_per_request} ranking batches)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
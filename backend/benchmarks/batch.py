@@ -0,0 +1,106 @@
+"""Individual /api/analyze calls vs one /api/analyze/batch call.
+
+Starts the offline stack (mock boards + fake LLM, caching off) and analyzes
+the same profiles both ways, reporting wall time and profiles per second.
+
+Usage (from backend/):
+    python -m benchmarks.batch --profiles 100 --concurrency 10
+    python -m benchmarks.batch --profiles 200 --env BATCH_LLM_CONCURRENCY=32
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Optional
+
+import httpx
+
+from loadtest import run as loadtest
+
+
+async def run_individual(api_url: str, profiles: list[dict], concurrency: int) -> float:
+    """Send each profile to /api/analyze with `concurrency` in flight; return wall seconds."""
+    queue = list(profiles)
+    async with httpx.AsyncClient(base_url=api_url, timeout=None) as client:
+        async def worker() -> None:
+            while queue:
+                response = await client.post("/api/analyze", json=queue.pop())
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        return time.perf_counter() - start
+
+
+async def run_batch(api_url: str, profiles: list[dict]) -> tuple[float, float, int]:
+    """
+    Send all profiles in one batch request.
+
+    Returns:
+        Tuple of (wall seconds, seconds to first streamed result, failed profiles)
+    """
+    first = None
+    failed = 0
+    async with httpx.AsyncClient(base_url=api_url, timeout=None) as client:
+        start = time.perf_counter()
+        async with client.stream("POST", "/api/analyze/batch", json={"profiles": profiles}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                if first is None:
+                    first = time.perf_counter() - start
+                if json.loads(line).get("error"):
+                    failed += 1
+        return time.perf_counter() - start, first or 0.0, failed
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=100)
+    args, passthrough = parser.parse_known_args(argv)
+    stack = loadtest.parse_args(passthrough)
+
+    profiles = [
+        loadtest.SAMPLE_PROFILES[i % len(loadtest.SAMPLE_PROFILES)] for i in range(args.profiles)
+    ]
+    boards_port, api_port = loadtest.free_port(), loadtest.free_port()
+    boards_url = f"http://127.0.0.1:{boards_port}"
+    api_url = f"http://127.0.0.1:{api_port}"
+
+    processes = []
+    try:
+        boards = loadtest.start_mock_boards(stack, boards_port)
+        processes.append(boards)
+        loadtest.wait_until_ready(f"{boards_url}/healthz", boards)
+        api = loadtest.start_api(stack, api_port, boards_url)
+        processes.append(api)
+        loadtest.wait_until_ready(f"{api_url}/api/health", api)
+
+        individual = asyncio.run(run_individual(api_url, profiles, stack.concurrency))
+        batch, first_result, failed = asyncio.run(run_batch(api_url, profiles))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+    report = {
+        "profiles": args.profiles,
+        "individual_seconds": individual,
+        "batch_seconds": batch,
+        "batch_first_result_seconds": first_result,
+        "batch_failed_profiles": failed,
+    }
+    print(f"individual (concurrency {stack.concurrency}): {individual:.2f}s "
+          f"({args.profiles / individual:.2f} profiles/s)")
+    print(f"batch:                       {batch:.2f}s "
+          f"({args.profiles / batch:.2f} profiles/s, first result after {first_result:.2f}s)")
+    if failed:
+        print(f"batch profiles failed: {failed}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Streaming analyze latency with and without early fetch termination.
+
+Runs the offline load test twice in streaming mode, once fetching every
+board (FETCH_EARLY_STOP=false) and once stopping as soon as the ranking
+budget is covered (FETCH_EARLY_STOP=true), with identical board and LLM
+settings. A heavy board-latency tail is what early termination cuts.
+
+Usage (from backend/):
+    python -m benchmarks.early_stop --requests 30 --board-latency-ms 600 --board-latency-sigma 1.0
+    python -m benchmarks.early_stop --grace-seconds 0.5
+"""
+
+import argparse
+from typing import Optional
+
+from loadtest import run as loadtest
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=5, help="Requests that build the board yield history")
+    parser.add_argument("--board-latency-ms", type=float, default=600.0)
+    parser.add_argument("--board-latency-sigma", type=float, default=1.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--grace-seconds", type=float, default=2.0)
+    args, passthrough = parser.parse_known_args(argv)
+
+    reports = {}
+    for early_stop in (False, True):
+        name = "early_stop" if early_stop else "all_boards"
+        print(f"\n=== FETCH_EARLY_STOP={str(early_stop).lower()} ===")
+        reports[name] = loadtest.main([
+            "--requests", str(args.requests),
+            "--concurrency", str(args.concurrency),
+            "--warmup", str(args.warmup),
+            "--board-latency-ms", str(args.board_latency_ms),
+            "--board-latency-sigma", str(args.board_latency_sigma),
+            "--llm-latency-ms", str(args.llm_latency_ms),
+            "--env", "PIPELINE_MODE=streaming",
+            "--env", f"FETCH_EARLY_STOP={str(early_stop).lower()}",
+            "--env", f"FETCH_GRACE_SECONDS={args.grace_seconds}",
+            *passthrough,
+        ])
+
+    print("\n=== early stop vs all boards ===")
+    for pct in ("p50", "p95", "p99"):
+        base = reports["all_boards"]["latency_seconds"][pct]
+        early = reports["early_stop"]["latency_seconds"][pct]
+        print(f"{pct}: {base * 1000:.0f}ms -> {early * 1000:.0f}ms ({(early - base) / base:+.0%})")
+    print(f"boards skipped per request: {reports['early_stop']['skipped_boards'] / args.requests:.1f}")
+    return reports
+
+
+if __name__ == "__main__":
+    main()
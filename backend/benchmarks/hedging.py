@@ -0,0 +1,99 @@
+"""Ranking-call tail latency with and without hedging.
+
+Sends ranking calls through the real rank chain backed by the fake LLM
+with a heavy-tailed (log-normal) latency, first unhedged, then hedged at
+each extra-spend cap, and reports p50/p99 against the extra calls made.
+
+Usage (from backend/):
+    python -m benchmarks.hedging --calls 2000 --concurrency 20
+    python -m benchmarks.hedging --llm-latency-sigma 1.2 --max-extra 0.02,0.05,0.1,0.2
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from loadtest.stats import summarize
+
+
+JOB_COUNT = 15
+
+
+def rank_inputs() -> dict:
+    """Prompt variables for one 15-job ranking batch."""
+    jobs_text = "\n".join(
+        f"[J{i + 1}] Software Engineer {i} at Company {i} (Bengaluru)" for i in range(JOB_COUNT)
+    )
+    return {
+        "role": "Senior Software Engineer", "company": "Google", "company_tier": "Big Tech",
+        "years_of_experience": 6, "seniority_level": "Senior", "skills": "Go, Kubernetes",
+        "target_titles": "Software Engineer, Backend Engineer", "expected_salary_range": "Not specified",
+        "jobs_text": jobs_text,
+    }
+
+
+async def run(
+    calls: int, concurrency: int, warmup: int, latency_ms: float, sigma: float, max_extra: Optional[float], seed: int
+) -> dict:
+    """Run `calls` ranking calls (after `warmup` unmeasured ones); hedged unless max_extra is None."""
+    from agent.hedging import Hedger
+    from agent.tools.job_ranker import build_rank_chain
+    from loadtest.fake_llm import FakeChatModel
+
+    llm = FakeChatModel(latency_ms=latency_ms, latency_sigma=sigma, seed=seed)
+    chain = build_rank_chain(llm)
+    inputs = rank_inputs()
+    hedger = Hedger(max_extra=max_extra) if max_extra is not None else None
+    slots = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        async with slots:
+            start = time.perf_counter()
+            if hedger is not None:
+                await hedger.run("rank_batch", lambda: chain.ainvoke(inputs))
+            else:
+                await chain.ainvoke(inputs)
+            if index >= warmup:
+                latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[one(i) for i in range(warmup + calls)])
+    return {
+        "latency_seconds": summarize(latencies),
+        # Extra LLM calls per ranking call (warmup included on both sides)
+        "extra_calls": llm.calls / (warmup + calls) - 1,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured calls that fill the latency window")
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--llm-latency-sigma", type=float, default=1.0, help="Log-normal spread (heavy tail)")
+    parser.add_argument("--max-extra", default="0.05,0.1,0.2", help="Comma-separated hedge budgets")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    budgets = [None] + [float(value) for value in args.max_extra.split(",")]
+    results = {}
+    for max_extra in budgets:
+        name = "unhedged" if max_extra is None else f"hedged@{max_extra:g}"
+        results[name] = asyncio.run(run(
+            args.calls, args.concurrency, args.warmup,
+            args.llm_latency_ms, args.llm_latency_sigma, max_extra, args.seed,
+        ))
+
+    base_p99 = results["unhedged"]["latency_seconds"]["p99"]
+    print(f"{'':<14} {'p50':>8} {'p99':>8} {'p99 change':>11} {'extra calls':>12}")
+    for name, result in results.items():
+        stats = result["latency_seconds"]
+        print(f"{name:<14} {stats['p50'] * 1000:>6.0f}ms {stats['p99'] * 1000:>6.0f}ms "
+              f"{(stats['p99'] - base_p99) / base_p99:>+11.0%} {result['extra_calls']:>+12.1%}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
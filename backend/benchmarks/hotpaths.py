@@ -0,0 +1,222 @@
+"""Microbenchmarks for the pure-CPU filtering and extraction hot paths.
+
+Runs each hot path over synthetic corpora, reports ns/job and allocations
+per job, and compares against a stored baseline. Exits non-zero when any
+benchmark regresses past the threshold.
+
+Usage (from backend/):
+    python -m benchmarks.hotpaths                          # compare to baseline
+    python -m benchmarks.hotpaths --sizes 1000,100000,1000000
+    python -m benchmarks.hotpaths --save-baseline          # record a new baseline
+    python -m benchmarks.hotpaths --only filter_by --threshold 0.10
+"""
+
+import argparse
+import html
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from api.schemas import Job, RankedJob
+from agent.job_search_agent import JobSearchAgent
+from loadtest.synthetic import make_jobs
+from services import text_normalizer
+from services.experience_extractor import extract_experience
+from services.salary_extractor import extract_salary
+from services.job_aggregator import JobAggregator
+
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# A typical expanded profile
+KEYWORDS = [
+    "Senior Software Engineer", "Software Engineer", "Backend Engineer", "Full Stack Engineer",
+    "Software Developer", "SDE II", "SDE III", "Platform Engineer", "Member of Technical Staff",
+]
+LOCATION = "Bengaluru"
+YEARS_OF_EXPERIENCE = 5
+SENIORITY = "Senior"
+EXPECTED_SALARY = 150_000
+
+
+def build_corpus(size: int, seed: int = 0) -> tuple[list[Job], list[RankedJob]]:
+    """Synthetic jobs plus the same jobs with random match scores."""
+    records = make_jobs(size, seed=seed)
+    jobs = [Job(**record) for record in records]
+    rng = random.Random(seed)
+    ranked = [
+        RankedJob(**record, match_score=rng.randint(0, 100), insight="", match_reasons=[])
+        for record in records
+    ]
+    return jobs, ranked
+
+
+def hot_paths(
+    aggregator: JobAggregator, raw_descriptions: list[str]
+) -> dict[str, Callable[[list[Job], list[RankedJob]], Any]]:
+    """Benchmark name -> callable taking (jobs, ranked_jobs)."""
+    # _sort_by_score_and_location does not use instance state; skip __init__,
+    # which would build LLM clients.
+    agent = JobSearchAgent.__new__(JobSearchAgent)
+    # Each filter alone, as a plan with only that filter (plus dedupe)
+    keyword_plan = aggregator.compile_plan(keywords=KEYWORDS)
+    location_plan = aggregator.compile_plan(location=LOCATION)
+    experience_plan = aggregator.compile_plan(years_of_experience=YEARS_OF_EXPERIENCE, seniority_level=SENIORITY)
+    salary_plan = aggregator.compile_plan(expected_salary=EXPECTED_SALARY)
+    dedupe_plan = aggregator.compile_plan()
+    location_priority = aggregator.location_priority_key(LOCATION)
+    return {
+        "filter_by_keywords": lambda jobs, _: keyword_plan.run(jobs),
+        "filter_by_location": lambda jobs, _: location_plan.run(jobs, sort=False),
+        "filter_by_experience": lambda jobs, _: experience_plan.run(jobs),
+        "filter_by_salary": lambda jobs, _: salary_plan.run(jobs),
+        "deduplicate_jobs": lambda jobs, _: dedupe_plan.run(jobs),
+        "sort_by_location_preference": lambda jobs, _: sorted(jobs, key=location_priority),
+        "filter_jobs": lambda jobs, _: aggregator.filter_jobs(
+            jobs, KEYWORDS, LOCATION, YEARS_OF_EXPERIENCE, SENIORITY, EXPECTED_SALARY
+        ),
+        "sort_by_score_and_location": lambda _, ranked: agent._sort_by_score_and_location(
+            ranked, LOCATION
+        ),
+        "extract_experience": lambda jobs, _: [
+            extract_experience(job.title, job.description) for job in jobs
+        ],
+        "extract_salary": lambda jobs, _: [extract_salary(job.description) for job in jobs],
+        "normalize_description": lambda jobs, _: normalize_cold(raw_descriptions),
+    }
+
+
+def normalize_cold(raw_descriptions: list[str]) -> list[str]:
+    """Normalize every description with an empty memo (the first-fetch cost)."""
+    text_normalizer.clear_memo()
+    return [text_normalizer.normalize_description(raw) for raw in raw_descriptions]
+
+
+def escaped_html(jobs: list[Job]) -> list[str]:
+    """Descriptions as Greenhouse sends them (escaped markup), one per job."""
+    return [html.escape(f"<div><p>{job.description}</p></div>") for job in jobs]
+
+
+def measure(func: Callable, jobs: list[Job], ranked: list[RankedJob], repeat: int) -> dict[str, float]:
+    """Best-of-`repeat` wall time plus a separate traced run for allocations."""
+    size = len(jobs)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func(jobs, ranked)
+        timings.append(time.perf_counter_ns() - start)
+
+    # Allocation pass is separate so tracing overhead does not skew timings
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func(jobs, ranked)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained_blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0
+    )
+    del result
+
+    return {
+        "ns_per_job": min(timings) / size,
+        "peak_bytes_per_job": peak / size,
+        "retained_blocks_per_job": retained_blocks / size,
+    }
+
+
+def run(sizes: list[int], repeat: int, only: Optional[str], seed: int) -> dict[str, dict[str, float]]:
+    aggregator = JobAggregator()
+    results: dict[str, dict[str, float]] = {}
+    for size in sizes:
+        jobs, ranked = build_corpus(size, seed=seed)
+        for name, func in hot_paths(aggregator, escaped_html(jobs)).items():
+            if only and only not in name:
+                continue
+            # Large corpora are slow enough that one timed run is representative
+            runs = repeat if size < 500_000 else 1
+            key = f"{name}@{size}"
+            results[key] = measure(func, jobs, ranked, runs)
+            stats = results[key]
+            print(
+                f"{key:<40} {stats['ns_per_job']:>10.0f} ns/job  "
+                f"{stats['peak_bytes_per_job']:>8.1f} B/job peak  "
+                f"{stats['retained_blocks_per_job']:>6.2f} blocks/job"
+            )
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+    alloc_threshold: float,
+) -> list[str]:
+    """Regression messages for results slower/heavier than baseline by more than the thresholds."""
+    regressions = []
+    for key, stats in results.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        checks = (
+            ("ns_per_job", threshold),
+            ("peak_bytes_per_job", alloc_threshold),
+        )
+        for metric, limit in checks:
+            old, new = base.get(metric), stats[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            if change > limit:
+                regressions.append(f"{key}: {metric} {old:.1f} -> {new:.1f} (+{change:.0%}, limit {limit:.0%})")
+    return regressions
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated corpus sizes (1k-1M)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (best is kept)")
+    parser.add_argument("--only", default=None, help="Run only benchmarks whose name contains this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed ns/job regression as a fraction (0.25 = 25%%)")
+    parser.add_argument("--alloc-threshold", type=float, default=0.25,
+                        help="Allowed peak allocation regression as a fraction")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = run(sizes, args.repeat, args.only, args.seed)
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold, args.alloc_threshold)
+    if regressions:
+        print("\nRegressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
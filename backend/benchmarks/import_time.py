@@ -0,0 +1,87 @@
+"""Cold-start import profile for the API entry point.
+
+Imports `main` in a fresh interpreter with `-X importtime`, prints the
+slowest modules and fails when either:
+- a heavy module (LangChain, OpenAI SDK) is imported at startup, or
+- total import time exceeds `--max-ms`.
+
+Usage (from backend/):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --max-ms 800 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Must only be imported on first use (see agent/lazy.py)
+DEFERRED_MODULES = ("langchain", "langchain_core", "langchain_openai", "openai", "tiktoken")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports(module: str = "main") -> list[tuple[str, int, int]]:
+    """
+    Import `module` in a subprocess and parse `-X importtime` output.
+
+    Returns:
+        List of (module name, self microseconds, cumulative microseconds)
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return entries
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--max-ms", type=float, default=1500.0, help="Fail above this total import time")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    entries = profile_imports(args.module)
+    target = next((entry for entry in entries if entry[0] == args.module), None)
+    total_ms = (target[2] if target else sum(entry[1] for entry in entries)) / 1000
+
+    print(f"import {args.module}: {total_ms:.0f}ms cumulative, {len(entries)} modules")
+    print(f"\nTop {args.top} by self time:")
+    for name, self_us, cumulative_us in sorted(entries, key=lambda e: e[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:>8.1f}ms  {cumulative_us / 1000:>8.1f}ms cum  {name}")
+
+    failures = []
+    loaded = {name.split(".")[0] for name, _, _ in entries}
+    eager = sorted(loaded & set(DEFERRED_MODULES))
+    if eager:
+        failures.append(f"deferred modules imported at startup: {', '.join(eager)}")
+    if total_ms > args.max_ms:
+        failures.append(f"import time {total_ms:.0f}ms exceeds {args.max_ms:.0f}ms")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
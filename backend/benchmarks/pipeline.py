@@ -0,0 +1,50 @@
+"""Compare staged vs streaming analyze pipelines against the mock boards.
+
+Runs the offline load test once per PIPELINE_MODE with identical board and
+LLM settings and prints the latency change.
+
+Usage (from backend/):
+    python -m benchmarks.pipeline --requests 30 --concurrency 5 --board-latency-ms 600
+"""
+
+import argparse
+from typing import Optional
+
+from loadtest import run as loadtest
+
+
+MODES = ("staged", "streaming")
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--board-latency-ms", type=float, default=600.0)
+    parser.add_argument("--board-latency-sigma", type=float, default=0.8)
+    parser.add_argument("--llm-latency-ms", type=float, default=1500.0)
+    args, passthrough = parser.parse_known_args(argv)
+
+    reports = {}
+    for mode in MODES:
+        print(f"\n=== PIPELINE_MODE={mode} ===")
+        reports[mode] = loadtest.main([
+            "--requests", str(args.requests),
+            "--concurrency", str(args.concurrency),
+            "--board-latency-ms", str(args.board_latency_ms),
+            "--board-latency-sigma", str(args.board_latency_sigma),
+            "--llm-latency-ms", str(args.llm_latency_ms),
+            "--env", f"PIPELINE_MODE={mode}",
+            *passthrough,
+        ])
+
+    print("\n=== streaming vs staged ===")
+    for pct in ("p50", "p95", "p99"):
+        staged = reports["staged"]["latency_seconds"][pct]
+        streaming = reports["streaming"]["latency_seconds"][pct]
+        print(f"{pct}: {staged * 1000:.0f}ms -> {streaming * 1000:.0f}ms ({(streaming - staged) / staged:+.0%})")
+    return reports
+
+
+if __name__ == "__main__":
+    main()
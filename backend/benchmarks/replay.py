@@ -0,0 +1,115 @@
+"""Benchmark (and profile) the full analyze pipeline from a cassette.
+
+Record once against the configured boards and LLM (live Greenhouse/Lever
+and OpenAI, or the load-test mocks), then replay the same requests as
+often as needed with no network access and identical inputs. Caches are
+off in both modes so every call is recorded and replayed.
+
+Usage (from backend/):
+    python -m benchmarks.replay --record --requests 5
+    python -m benchmarks.replay --requests 20 --concurrency 5
+    python -m benchmarks.replay --no-latency --profile .cache/replay.prof
+"""
+
+import argparse
+import asyncio
+import cProfile
+import os
+import time
+from typing import Optional
+
+from loadtest.run import SAMPLE_PROFILES
+from loadtest.stats import summarize
+
+
+async def run(requests: int, concurrency: int) -> tuple[list[float], int]:
+    """
+    Analyze `requests` sample profiles in-process, `concurrency` at a time.
+
+    Returns:
+        Tuple of (per-request latencies in seconds, failed requests)
+    """
+    from agent.job_search_agent import JobSearchAgent
+    from agent.runtime import close_runtime
+    from api.schemas import ProfileRequest
+    from scrapers.base_scraper import close_http_client
+
+    slots = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failed = 0
+
+    async def one(index: int) -> None:
+        nonlocal failed
+        profile = ProfileRequest(**SAMPLE_PROFILES[index % len(SAMPLE_PROFILES)])
+        async with slots:
+            agent = JobSearchAgent()
+            start = time.perf_counter()
+            try:
+                await agent.analyze(profile)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                failed += 1
+                print(f"Request {index} failed: {e}")
+            finally:
+                await agent.close()
+
+    try:
+        await asyncio.gather(*[one(i) for i in range(requests)])
+    finally:
+        await close_runtime()
+        await close_http_client()
+    return latencies, failed
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cassette", default=".cache/cassette.jsonl.gz")
+    parser.add_argument("--record", action="store_true", help="Record instead of replaying")
+    parser.add_argument("--requests", type=int, default=len(SAMPLE_PROFILES))
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--no-latency", action="store_true",
+                        help="Replay without the recorded delays (CPU-bound profile)")
+    parser.add_argument("--profile", help="Write cProfile stats of the run to this file")
+    args = parser.parse_args(argv)
+
+    # Before anything reads the (cached) settings
+    os.environ.update({
+        "CASSETTE_MODE": "record" if args.record else "replay",
+        "CASSETTE_PATH": args.cassette,
+        "CASSETTE_REPLAY_LATENCY": "false" if args.no_latency else "true",
+        "BOARD_CACHE_TTL": "0",
+        "EXPANSION_CACHE_TTL": "0",
+        "RANKING_CACHE_TTL": "0",
+    })
+    from services.cassette import close_cassette
+
+    profiler = cProfile.Profile() if args.profile else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        latencies, failed = asyncio.run(run(args.requests, args.concurrency))
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        close_cassette()  # Writes the file when recording
+    wall = time.perf_counter() - start
+
+    report = {
+        "mode": "record" if args.record else "replay",
+        "requests": args.requests,
+        "failed": failed,
+        "wall_seconds": wall,
+        "latency_seconds": summarize(latencies),
+    }
+    print(f"{report['mode']}: {args.requests} requests ({failed} failed) in {wall:.2f}s")
+    for name, value in report["latency_seconds"].items():
+        print(f"  {name:<6} {value * 1000:.1f} ms" if name != "count" else f"  {name:<6} {value}")
+    if args.profile:
+        print(f"Profile written to {args.profile} (python -m pstats {args.profile})")
+    return report
+
+
+if __name__ == "__main__":
+    main()
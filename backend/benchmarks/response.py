@@ -0,0 +1,81 @@
+"""AnalyzeResponse serialization time and payload size.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with the
+optimized one (pydantic-core `model_dump_json`, descriptions optional) and
+reports raw, gzip and brotli sizes.
+
+Usage (from backend/):
+    python -m benchmarks.response --jobs 50 --iterations 200
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+from typing import Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from api.compression import brotli
+from api.responses import DESCRIPTION_EXCLUDE
+from api.schemas import AnalyzeResponse, ExpandedProfile, RankedJob
+from loadtest.synthetic import make_jobs
+
+
+def make_response(count: int, seed: int = 0) -> AnalyzeResponse:
+    rng = random.Random(seed)
+    jobs = [
+        RankedJob(**record, match_score=rng.randint(0, 100),
+                  insight="Strong overlap with your backend experience and a step up in scope.",
+                  match_reasons=["Title matches target", "Similar company tier", "Relevant stack"])
+        for record in make_jobs(count, seed=seed)
+    ]
+    profile = ExpandedProfile(
+        original_role="Software Engineer", original_company="Google", years_of_experience=5,
+        inferred_skills=["Python", "Go", "Kubernetes"], seniority_level="Senior",
+        target_titles=["Senior Software Engineer", "Backend Engineer"], company_tier="FAANG",
+        expected_salary_range="$180k-$250k",
+    )
+    return AnalyzeResponse(profile=profile, jobs=jobs, total_jobs=len(jobs),
+                           companies_searched=[f"company-{i}" for i in range(150)])
+
+
+def time_per_call(func: Callable[[], bytes], iterations: int) -> float:
+    """Mean microseconds per call."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    response = make_response(args.jobs)
+    variants: dict[str, Callable[[], bytes]] = {
+        "default (jsonable_encoder)": lambda: json.dumps(jsonable_encoder(response)).encode(),
+        "model_dump_json": lambda: response.model_dump_json().encode(),
+        "model_dump_json, no descriptions": lambda: response.model_dump_json(exclude=DESCRIPTION_EXCLUDE).encode(),
+    }
+
+    results = {}
+    print(f"{args.jobs} ranked jobs\n")
+    print(f"{'variant':<34} {'encode':>10} {'raw':>9} {'gzip':>9} {'brotli':>9}")
+    for name, encode in variants.items():
+        body = encode()
+        sizes = {"raw": len(body), "gzip": len(gzip.compress(body, 6))}
+        if brotli is not None:
+            sizes["brotli"] = len(brotli.compress(body, quality=4))
+        results[name] = {"encode_us": time_per_call(encode, args.iterations), **sizes}
+        brotli_size = f"{sizes['brotli']:>9,}" if "brotli" in sizes else f"{'n/a':>9}"
+        print(f"{name:<34} {results[name]['encode_us']:>8.0f}µs {sizes['raw']:>9,} {sizes['gzip']:>9,} {brotli_size}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Corpus snapshot write/load time, size and RSS.
+
+Builds a synthetic corpus, writes it as a binary snapshot and as JSON, and
+compares write time, file size, time to first usable board and to a full
+load, plus resident memory after each step.
+
+Usage (from backend/):
+    python -m benchmarks.snapshot --jobs 100000
+    python -m benchmarks.snapshot --jobs 500000 --boards 300
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import tempfile
+import time
+from typing import Optional
+
+from api.schemas import Job
+from loadtest.synthetic import make_jobs
+from services.corpus_snapshot import CorpusSnapshot, write_snapshot
+
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--boards", type=int, default=150)
+    args = parser.parse_args(argv)
+
+    companies = [f"company-{i}" for i in range(args.boards)]
+    boards: dict[tuple[str, str], list[Job]] = {}
+    for record in make_jobs(args.jobs, companies=companies):
+        slug = record["company"].lower().replace(" ", "-")
+        boards.setdefault((record["source"], slug), []).append(Job(**record))
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        snap_path = os.path.join(tmp, "corpus.snap")
+        json_path = os.path.join(tmp, "corpus.json")
+
+        _, results["snapshot_write_s"] = timed(lambda: write_snapshot(snap_path, boards))
+        def write_json():
+            with open(json_path, "w") as f:
+                json.dump([[source, board, [job.model_dump() for job in jobs]]
+                           for (source, board), jobs in boards.items()], f)
+        _, results["json_write_s"] = timed(write_json)
+        results["snapshot_mb"] = os.path.getsize(snap_path) / 2**20
+        results["json_mb"] = os.path.getsize(json_path) / 2**20
+
+        # Drop the source corpus so RSS deltas reflect the loaded copy only
+        first_board = next(iter(boards))
+        boards.clear()
+        gc.collect()
+        base_rss = rss_mb()
+
+        snapshot, results["snapshot_open_s"] = timed(lambda: CorpusSnapshot(snap_path))
+        results["snapshot_open_rss_mb"] = rss_mb() - base_rss
+        _, results["snapshot_first_board_s"] = timed(lambda: snapshot.board_jobs(*first_board))
+        jobs, results["snapshot_full_load_s"] = timed(snapshot.all_jobs)
+        results["snapshot_full_rss_mb"] = rss_mb() - base_rss
+        del jobs
+        snapshot._decoded.clear()
+        snapshot.close()
+        gc.collect()
+
+        base_rss = rss_mb()
+        def load_json():
+            with open(json_path) as f:
+                return [Job(**record) for _, _, records in json.load(f) for record in records]
+        jobs, results["json_full_load_s"] = timed(load_json)
+        results["json_full_rss_mb"] = rss_mb() - base_rss
+        del jobs
+
+    print(f"{args.jobs:,} jobs in {args.boards} companies\n")
+    print(f"{'':<22} {'snapshot':>12} {'json':>12}")
+    print(f"{'write':<22} {results['snapshot_write_s']:>11.2f}s {results['json_write_s']:>11.2f}s")
+    print(f"{'file size':<22} {results['snapshot_mb']:>10.1f}MB {results['json_mb']:>10.1f}MB")
+    print(f"{'open (first usable)':<22} {results['snapshot_open_s'] * 1000:>10.1f}ms {'-':>12}")
+    print(f"{'first board':<22} {results['snapshot_first_board_s'] * 1000:>10.1f}ms {'-':>12}")
+    print(f"{'full load':<22} {results['snapshot_full_load_s']:>11.2f}s {results['json_full_load_s']:>11.2f}s")
+    print(f"{'RSS after open':<22} {results['snapshot_open_rss_mb']:>10.1f}MB {'-':>12}")
+    print(f"{'RSS after full load':<22} {results['snapshot_full_rss_mb']:>10.1f}MB {results['json_full_rss_mb']:>10.1f}MB")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,141 @@ class Settings(BaseSettings):
     # App settings
     debug: bool = True
     
+    # Request deadline (seconds). Clients may ask for a shorter or longer
+    # budget via ProfileRequest.timeout_seconds, capped at the max.
+    request_timeout_default: float = 45.0
+    request_timeout_max: float = 90.0
+    
+    # Share of the request deadline each stage may use. Expansion and
+    # fetching both start at the beginning of the request (concurrently).
+    expand_budget_share: float = 0.25
+    fetch_budget_share: float = 0.5
+    
+    # /api/analyze/batch: whole-batch deadline, size limit, and the number
+    # of LLM calls (expansion + ranking) in flight across all its profiles
+    batch_timeout_default: float = 300.0
+    batch_timeout_max: float = 900.0
+    batch_max_profiles: int = 500
+    batch_llm_concurrency: int = 16
+    
+    # Response path: paged result sets are kept this long (seconds), and
+    # bodies smaller than the minimum are sent uncompressed
+    result_ttl: float = 1800.0
+    compression_minimum_size: int = 1000
+    
+    # Saved searches (/api/searches) are kept this long after their last run;
+    # with CACHE_BACKEND=memory each worker holds at most saved_search_max_memory
+    saved_search_ttl: float = 30 * 86400.0
+    saved_search_max_memory: int = 10_000
+    
+    # Queued mode (/api/analyze/jobs): analyze workers per process, queued
+    # tasks accepted before 429, and how long task state is kept (seconds)
+    task_workers: int = 4
+    task_queue_max_depth: int = 100
+    task_ttl: float = 1800.0
+    
+    # Pooled HTTP connections shared by all LLM calls in a worker
+    llm_max_connections: int = 50
+    llm_http_timeout: float = 60.0
+    
+    # Hedged ranking calls: a batch running longer than this percentile of
+    # recent batches gets one duplicate call; hedges are capped at
+    # llm_hedge_max_extra per call over the last llm_hedge_window calls
+    llm_hedging: bool = False
+    llm_hedge_percentile: float = 90.0
+    llm_hedge_max_extra: float = 0.1
+    llm_hedge_min_samples: int = 20
+    llm_hedge_window: int = 200
+    
+    # Follow-up calls per ranking batch for jobs the model left unranked
+    # (or for a failed call); only those jobs are sent again
+    rank_retry_attempts: int = 1
+    
+    # Most LLM calls in flight per worker across all requests; waiting calls
+    # are served expansion-first, then round-robin across requests
+    llm_max_in_flight: int = 32
+    
+    # Import the LangChain/OpenAI stack in the background after startup
+    # instead of on the first analyze request
+    prewarm_agent: bool = True
+    
+    # "streaming" overlaps fetch, filter and rank per board; "staged" waits
+    # for all boards before filtering and ranking
+    pipeline_mode: str = "streaming"
+    
+    # Streaming mode fetches each source's boards best historical yield
+    # first and stops fetching once the ranking budget is filled with
+    # preferred-location candidates, or fetch_grace_seconds after enough
+    # candidates of any location were found
+    fetch_early_stop: bool = True
+    fetch_grace_seconds: float = 2.0
+    board_yield_alpha: float = 0.3      # Weight of the newest fetch in a board's yield
+    board_yield_explore_after: int = 50  # Searches before an unmeasured estimate is re-probed
+    board_yield_max_keys: int = 10000   # (location, board) estimates kept, least recent dropped
+    
+    # Per-board HTTP timeout (upper bound, also limited by the deadline)
+    scraper_http_timeout: float = 30.0
+    
+    # Pooled connections shared by all scrapers in a worker, and the most
+    # board requests in flight per source
+    scraper_max_connections: int = 100
+    scraper_concurrency_per_source: int = 16
+    
+    # Job board API base URLs (overridden by the load-test mock servers)
+    greenhouse_base_url: str = "https://boards-api.greenhouse.io/v1/boards"
+    lever_base_url: str = "https://api.lever.co/v0/postings"
+    ashby_base_url: str = "https://api.ashbyhq.com/posting-api/job-board"
+    workable_base_url: str = "https://apply.workable.com/api/v1/widget/accounts"
+    smartrecruiters_base_url: str = "https://api.smartrecruiters.com/v1/companies"
+    
+    # LLM backend: "openai", or "fake" for offline load tests
+    llm_backend: str = "openai"
+    fake_llm_latency_ms: float = 800.0   # Median latency of the fake model
+    fake_llm_latency_sigma: float = 0.5  # Log-normal spread (0 = constant)
+    fake_llm_drop_rate: float = 0.0     # Share of jobs the fake model leaves unranked
+    
+    # Board, expansion and ranking caches. "memory" is per worker; "sqlite"
+    # (one file per host) and "redis" are shared by all workers.
+    cache_backend: str = "memory"
+    cache_sqlite_path: str = ".cache/jobsearch.sqlite3"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_lock_ttl: float = 30.0        # Max time one worker may hold a refresh lock
+    board_cache_ttl: float = 900.0      # Raw board listings (0 disables)
+    expansion_cache_ttl: float = 86400.0
+    ranking_cache_ttl: float = 86400.0
+    
+    # Corpus snapshot for warm starts (opt-in, e.g. ".cache/corpus.snap");
+    # boards are refreshed and the snapshot rewritten every interval
+    # (seconds). A board whose refresh keeps failing is served from the
+    # snapshot for at most corpus_snapshot_max_board_age seconds.
+    corpus_snapshot_path: str = ""
+    corpus_snapshot_interval: float = 900.0
+    corpus_snapshot_max_board_age: float = 86400.0
+    
+    # Record/replay cassette for board responses and LLM calls ("off",
+    # "record" or "replay"); replay sleeps for recorded latencies unless disabled
+    cassette_mode: str = "off"
+    cassette_path: str = ".cache/cassette.jsonl.gz"
+    cassette_replay_latency: bool = True
+    
+    # On-demand request profiling: admins send X-Profile: 1 (or ?profile=1)
+    # with X-Admin-Token. Installed only when both values below are set.
+    # ADMIN_TOKEN also guards /api/debug/loop, which is hidden without it.
+    profile_dir: str = ""
+    admin_token: str = ""
+    profile_sample_interval: float = 0.005  # Seconds between stack samples
+    profile_top_allocations: int = 25
+    
+    # Event-loop monitor: lag is sampled every interval (0 disables); the
+    # loop thread's stack is sampled while it is blocked past the threshold
+    loop_monitor_interval: float = 0.1
+    loop_stall_threshold: float = 0.1
+    loop_stall_sample_interval: float = 0.005
+    
+    # Jobs whose extracted maximum pay is more than this fraction below the
+    # candidate's expected salary are dropped before ranking
+    salary_filter_tolerance: float = 0.1
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -237,6 +372,30 @@ LEVER_COMPANIES_EUROPE = [
     "netlify",
 ]
 
+# Other ATS sources (Ashby, Workable, SmartRecruiters board slugs)
+ASHBY_COMPANIES = [
+    "linear",
+    "ramp",
+    "notion",
+    "supabase",
+    "posthog",
+    "cohere",
+    "vanta",
+]
+
+WORKABLE_COMPANIES = [
+    "huggingface",
+    "taxfix",
+    "personio",
+]
+
+SMARTRECRUITERS_COMPANIES = [
+    "Visa",
+    "BoschGroup",
+    "ServiceNow",
+    "Freshworks",
+]
+
 # =============================================================================
 # COMBINED LISTS (MNCs first, then Indian startups, then Europe remote)
 # =============================================================================
@@ -0,0 +1,3 @@
+"""Load-testing package (mock job boards, fake LLM, traffic driver)."""
+
+
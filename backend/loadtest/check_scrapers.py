@@ -0,0 +1,83 @@
+"""Run every scraper against the local mock job boards.
+
+Starts the mock boards with no injected errors, fetches a few boards per
+source through the normal scraper engine (pooled client, concurrency
+limits, pagination) and checks the mapped jobs. Exits non-zero if any
+source fails.
+
+Usage (from backend/):
+    python -m loadtest.check_scrapers
+    python -m loadtest.check_scrapers --jobs-per-board 450 --boards 3
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Optional
+
+from loadtest.run import board_env, free_port, start_mock_boards, wait_until_ready
+
+
+async def check_sources(boards: int) -> list[str]:
+    """Fetch `boards` boards per source; returns a list of problems."""
+    # Imported after the environment points Settings at the mock boards
+    from scrapers.base_scraper import close_http_client
+    from services.job_aggregator import SOURCES
+
+    problems = []
+    print(f"{'source':<16} {'boards':>6} {'jobs':>7} {'time':>8}")
+    for scraper_class, companies in SOURCES:
+        scraper = scraper_class()
+        scraper.serve_snapshot = False
+        selected = companies[:boards]
+        start = time.perf_counter()
+        jobs, failed, timed_out, _ = await scraper.fetch_companies(selected, timeout=60)
+        elapsed = time.perf_counter() - start
+        print(f"{scraper.SOURCE:<16} {len(selected):>6} {len(jobs):>7} {elapsed * 1000:>6.0f}ms")
+
+        if failed or timed_out:
+            problems.append(f"{scraper.SOURCE}: failed {failed}, timed out {timed_out}")
+        if not jobs:
+            problems.append(f"{scraper.SOURCE}: no jobs mapped")
+        if any(job.source != scraper.SOURCE for job in jobs):
+            problems.append(f"{scraper.SOURCE}: jobs with the wrong source")
+        if len({job.id for job in jobs}) != len(jobs):
+            problems.append(f"{scraper.SOURCE}: duplicate job IDs (pagination overlap?)")
+        if any(not job.title or not job.url for job in jobs):
+            problems.append(f"{scraper.SOURCE}: jobs without a title or URL")
+    await close_http_client()
+    return problems
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    # Above 100 per board, SmartRecruiters boards span several pages
+    parser.add_argument("--jobs-per-board", type=int, default=250)
+    parser.add_argument("--boards", type=int, default=2, help="Boards fetched per source")
+    args = parser.parse_args(argv)
+    # start_mock_boards options: no latency, errors or missing boards
+    args.board_latency_ms, args.board_latency_sigma = 0.0, 0.0
+    args.error_rate, args.missing_rate = 0.0, 0.0
+
+    port = free_port()
+    boards_url = f"http://127.0.0.1:{port}"
+    boards = start_mock_boards(args, port)
+    try:
+        wait_until_ready(f"{boards_url}/healthz", boards)
+        os.environ.update(board_env(boards_url))
+        os.environ.update({"BOARD_CACHE_TTL": "0", "CORPUS_SNAPSHOT_PATH": ""})
+        problems = asyncio.run(check_sources(args.boards))
+    finally:
+        boards.terminate()
+        boards.wait(timeout=10)
+
+    for problem in problems:
+        print(f"FAIL {problem}")
+    print("All sources OK" if not problems else f"{len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Fake chat model for offline load tests.
+
+Implements just enough of the LangChain chat model surface used by the
+agent tools (`with_structured_output(schema, include_raw=...)` piped after a
+ChatPromptTemplate) and returns valid `ExpandedProfileData` /
+`BatchRankingResult` objects after a configurable, log-normally distributed
+delay. Rankings come back shuffled, and with `drop_rate` some jobs are left
+out, like a real model occasionally does.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+from typing import Any, Optional
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from agent.tools.job_ranker import BatchRankingResult, JobRankingResult
+from agent.tools.profile_expander import ExpandedProfileData
+
+
+JOB_LINE_PATTERN = re.compile(r"^\s*\[(J\d+)\]\s+(.+)$", re.MULTILINE)
+
+
+class FakeChatModel:
+    """Stand-in for ChatOpenAI that never leaves the process."""
+
+    def __init__(
+        self,
+        model: str = "fake",
+        latency_ms: float = 800.0,
+        latency_sigma: float = 0.5,
+        drop_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.model = model
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.drop_rate = drop_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    def sample_latency(self) -> float:
+        """Log-normal latency in seconds with median `latency_ms`."""
+        if self.latency_ms <= 0:
+            return 0.0
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return self._rng.lognormvariate(math.log(self.latency_ms / 1000), self.latency_sigma)
+
+    def with_structured_output(self, schema: type, include_raw: bool = False, **kwargs: Any) -> RunnableLambda:
+        async def invoke(prompt_value: Any) -> Any:
+            self.calls += 1
+            text = prompt_value.to_string() if hasattr(prompt_value, "to_string") else str(prompt_value)
+            await asyncio.sleep(self.sample_latency())
+
+            parsed = self._build(schema, text)
+            if not include_raw:
+                return parsed
+
+            output_text = parsed.model_dump_json()
+            raw = AIMessage(
+                content=output_text,
+                usage_metadata={
+                    "input_tokens": len(text) // 4,
+                    "output_tokens": len(output_text) // 4,
+                    "total_tokens": (len(text) + len(output_text)) // 4,
+                },
+            )
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+        return RunnableLambda(invoke)
+
+    def _build(self, schema: type, prompt: str) -> Any:
+        if schema is BatchRankingResult:
+            return self._rank(prompt)
+        if schema is ExpandedProfileData:
+            return self._expand(prompt)
+        raise ValueError(f"FakeChatModel does not know how to produce {schema.__name__}")
+
+    @staticmethod
+    def _score(line: str) -> int:
+        digest = hashlib.blake2b(line.encode(), digest_size=2).digest()
+        return 30 + int.from_bytes(digest, "big") % 70
+
+    def _rank(self, prompt: str) -> BatchRankingResult:
+        jobs_section = prompt.split("## Jobs to Rank:", 1)[-1].split("For EACH job", 1)[0]
+        rankings = []
+        for ref, line in JOB_LINE_PATTERN.findall(jobs_section):
+            if self.drop_rate and self._rng.random() < self.drop_rate:
+                continue
+            score = self._score(line)
+            rankings.append(JobRankingResult(
+                job_id=ref,
+                match_score=score,
+                insight=f"Synthetic assessment for {line[:60]}.",
+                match_reasons=["Title overlaps target titles", "Seniority looks aligned"],
+            ))
+        self._rng.shuffle(rankings)
+        return BatchRankingResult(rankings=rankings)
+
+    def _expand(self, prompt: str) -> ExpandedProfileData:
+        role_match = re.search(r"Current Role:\s*(.+)", prompt)
+        role = role_match.group(1).strip() if role_match else "Software Engineer"
+        return ExpandedProfileData(
+            inferred_skills=["Python", "System Design", "SQL", "Cloud", "Communication"],
+            seniority_level="Senior",
+            target_titles=[
+                role, "Software Engineer", "Senior Software Engineer", "Backend Engineer",
+                "Full Stack Engineer", "Software Developer", "SDE II", "Platform Engineer",
+            ],
+            company_tier="Big Tech",
+            expected_salary_range="$150,000 - $220,000",
+        )
@@ -0,0 +1,164 @@
+"""Local mock Greenhouse and Lever job board APIs.
+
+Serves the same paths as the real boards so the scrapers only need their
+base URL changed:
+
+    /greenhouse/v1/boards/{slug}/jobs            (GREENHOUSE_BASE_URL=http://host:port/greenhouse/v1/boards)
+    /lever/v0/postings/{slug}                    (LEVER_BASE_URL=http://host:port/lever/v0/postings)
+    /ashby/posting-api/job-board/{slug}          (ASHBY_BASE_URL=http://host:port/ashby/posting-api/job-board)
+    /workable/api/v1/widget/accounts/{slug}      (WORKABLE_BASE_URL=http://host:port/workable/api/v1/widget/accounts)
+    /smartrecruiters/v1/companies/{slug}/postings
+                                                 (SMARTRECRUITERS_BASE_URL=http://host:port/smartrecruiters/v1/companies)
+
+Board sizes, latency distribution and error rate are configurable; boards
+are generated deterministically from the slug so repeated runs see the
+same data.
+
+Usage:
+    python -m loadtest.mock_boards --port 9100 --jobs-per-board 200 --latency-ms 300
+"""
+
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+from dataclasses import dataclass
+
+from fastapi import FastAPI, HTTPException
+
+from loadtest.synthetic import (
+    make_ashby_job, make_greenhouse_job, make_lever_job, make_smartrecruiters_job, make_workable_job,
+)
+
+
+# Record generator per source
+RECORD_MAKERS = {
+    "greenhouse": make_greenhouse_job,
+    "lever": make_lever_job,
+    "ashby": make_ashby_job,
+    "workable": make_workable_job,
+    "smartrecruiters": make_smartrecruiters_job,
+}
+
+
+@dataclass
+class MockBoardConfig:
+    """Behaviour of the mock boards."""
+    jobs_per_board: int = 200       # Mean board size
+    board_size_spread: float = 0.5  # Sizes vary uniformly by +/- this fraction
+    latency_ms: float = 300.0       # Median response latency
+    latency_sigma: float = 0.6      # Log-normal spread (heavier tail as it grows)
+    error_rate: float = 0.02        # Fraction of requests answered with HTTP 500
+    missing_rate: float = 0.05      # Fraction of slugs that 404 (board does not exist)
+    seed: int = 0
+
+
+def _slug_seed(source: str, slug: str, seed: int) -> int:
+    digest = hashlib.blake2b(f"{seed}:{source}:{slug}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def create_mock_board_app(config: MockBoardConfig) -> FastAPI:
+    """Build the mock board application."""
+    app = FastAPI(title="Mock job boards")
+    boards: dict[tuple[str, str], list[dict]] = {}
+    rng = random.Random(config.seed)
+
+    def board(source: str, slug: str) -> list[dict]:
+        key = (source, slug)
+        if key not in boards:
+            board_rng = random.Random(_slug_seed(source, slug, config.seed))
+            if board_rng.random() < config.missing_rate:
+                boards[key] = None
+            else:
+                spread = 1 + board_rng.uniform(-config.board_size_spread, config.board_size_spread)
+                size = max(0, int(config.jobs_per_board * spread))
+                make = RECORD_MAKERS[source]
+                boards[key] = [make(board_rng, slug, i) for i in range(size)]
+        if boards[key] is None:
+            raise HTTPException(status_code=404, detail="Board not found")
+        return boards[key]
+
+    async def simulate_network() -> None:
+        if config.latency_ms > 0:
+            if config.latency_sigma > 0:
+                delay = rng.lognormvariate(math.log(config.latency_ms / 1000), config.latency_sigma)
+            else:
+                delay = config.latency_ms / 1000
+            await asyncio.sleep(delay)
+        if rng.random() < config.error_rate:
+            raise HTTPException(status_code=500, detail="Injected error")
+
+    @app.get("/healthz")
+    async def healthz() -> dict:
+        return {"status": "ok"}
+
+    @app.get("/greenhouse/v1/boards/{slug}/jobs")
+    async def greenhouse_jobs(slug: str) -> dict:
+        await simulate_network()
+        jobs = board("greenhouse", slug)
+        return {"jobs": jobs, "meta": {"total": len(jobs)}}
+
+    @app.get("/lever/v0/postings/{slug}")
+    async def lever_postings(slug: str) -> list[dict]:
+        await simulate_network()
+        return board("lever", slug)
+
+    @app.get("/ashby/posting-api/job-board/{slug}")
+    async def ashby_jobs(slug: str) -> dict:
+        await simulate_network()
+        return {"jobs": board("ashby", slug), "apiVersion": "1"}
+
+    @app.get("/workable/api/v1/widget/accounts/{slug}")
+    async def workable_jobs(slug: str) -> dict:
+        await simulate_network()
+        return {"name": slug, "jobs": board("workable", slug)}
+
+    @app.get("/smartrecruiters/v1/companies/{slug}/postings")
+    async def smartrecruiters_postings(slug: str, limit: int = 100, offset: int = 0) -> dict:
+        # Paginated like the real API, one simulated round trip per page
+        await simulate_network()
+        postings = board("smartrecruiters", slug)
+        return {
+            "offset": offset,
+            "limit": limit,
+            "totalFound": len(postings),
+            "content": postings[offset:offset + limit],
+        }
+
+    return app
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--jobs-per-board", type=int, default=MockBoardConfig.jobs_per_board)
+    parser.add_argument("--board-size-spread", type=float, default=MockBoardConfig.board_size_spread)
+    parser.add_argument("--latency-ms", type=float, default=MockBoardConfig.latency_ms)
+    parser.add_argument("--latency-sigma", type=float, default=MockBoardConfig.latency_sigma)
+    parser.add_argument("--error-rate", type=float, default=MockBoardConfig.error_rate)
+    parser.add_argument("--missing-rate", type=float, default=MockBoardConfig.missing_rate)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    args = parse_args(argv)
+    config = MockBoardConfig(
+        jobs_per_board=args.jobs_per_board,
+        board_size_spread=args.board_size_spread,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        missing_rate=args.missing_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_mock_board_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""In-memory Redis-protocol stand-in for testing the shared cache.
+
+Implements the commands `services.cache.RedisCache` uses (PING, AUTH,
+SELECT, GET, MGET, SET with NX/PX/EX, DEL, FLUSHALL and EVAL of the
+lock-release script) over RESP2, so several API workers can share a cache
+without a real Redis server.
+
+Usage:
+    python -m loadtest.mock_redis --port 6390
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Optional
+
+from services.cache import RELEASE_LOCK_SCRIPT
+
+
+class MockRedisServer:
+    """Single-database key/value store with per-key expiry."""
+
+    def __init__(self):
+        self.data: dict[bytes, tuple[Optional[float], bytes]] = {}
+        self.commands = 0
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args: list[bytes]) -> Any:
+        self.commands += 1
+        name = args[0].upper().decode()
+        if name == "PING":
+            return "PONG"
+        if name in ("AUTH", "SELECT"):
+            return "OK"
+        if name == "FLUSHALL":
+            self.data.clear()
+            return "OK"
+        if name == "GET":
+            return self._get(args[1])
+        if name == "MGET":
+            return [self._get(key) for key in args[1:]]
+        if name == "DEL":
+            removed = 0
+            for key in args[1:]:
+                if self._get(key) is not None:
+                    del self.data[key]
+                    removed += 1
+            return removed
+        if name == "SET":
+            return self._set(args[1], args[2], [arg.upper() for arg in args[3:]], args[3:])
+        if name == "EVAL":
+            if args[1].decode() != RELEASE_LOCK_SCRIPT:
+                return RuntimeError("ERR only the lock-release script is supported")
+            key, token = args[3], args[4]
+            if self._get(key) == token:
+                del self.data[key]
+                return 1
+            return 0
+        return RuntimeError(f"ERR unknown command '{name}'")
+
+    def _set(self, key: bytes, value: bytes, flags: list[bytes], raw: list[bytes]) -> Any:
+        expires_at = None
+        if b"PX" in flags:
+            expires_at = time.monotonic() + int(raw[flags.index(b"PX") + 1]) / 1000
+        elif b"EX" in flags:
+            expires_at = time.monotonic() + int(raw[flags.index(b"EX") + 1])
+        if b"NX" in flags and self._get(key) is not None:
+            return None
+        self.data[key] = (expires_at, value)
+        return "OK"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                args = await _read_command(reader)
+                if args is None:
+                    break
+                writer.write(_encode(self.execute(args)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[list[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command (e.g. typed into telnet)
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        header = await reader.readline()
+        length = int(header[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+def _encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RuntimeError):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+async def serve(host: str, port: int) -> None:
+    server = MockRedisServer()
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"Mock Redis listening on {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
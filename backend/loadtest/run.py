@@ -0,0 +1,325 @@
+"""Drive concurrent /api/analyze traffic against a fully offline stack.
+
+Starts the mock job boards and the API (pointed at the mocks, with the fake
+LLM) as subprocesses, sends `--requests` analyze calls with `--concurrency`
+in flight, and reports throughput and latency percentiles.
+
+Usage (from backend/):
+    python -m loadtest.run --requests 100 --concurrency 10
+    python -m loadtest.run --board-latency-ms 800 --error-rate 0.1 --json results.json
+    python -m loadtest.run --env EXPAND_BUDGET_SHARE=0.2   # any Settings override
+    python -m loadtest.run --workers 4 --cache redis       # shared cache via mock Redis
+    python -m loadtest.run --mode queued --concurrency 50  # submit + poll /api/analyze/jobs
+
+Caching is off unless `--cache` is given, so runs measure the uncached
+pipeline by default.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from loadtest.stats import summarize
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Seconds between status polls in --mode queued
+POLL_INTERVAL = 0.25
+
+SAMPLE_PROFILES = [
+    {"role": "Senior Software Engineer", "company": "Google", "years_of_experience": 6,
+     "skills": ["Go", "Kubernetes"], "location": "Bengaluru"},
+    {"role": "Frontend Engineer", "company": "Flipkart", "years_of_experience": 3,
+     "skills": ["React", "TypeScript"], "location": "Remote"},
+    {"role": "Data Engineer", "company": "Swiggy", "years_of_experience": 4,
+     "skills": ["Spark", "Python"], "location": "Hyderabad"},
+    {"role": "Backend Engineer", "company": "Stripe", "years_of_experience": 8,
+     "skills": ["Java", "Kafka"], "location": "London", "expected_salary": 150000},
+    {"role": "Software Engineer", "company": "Razorpay", "years_of_experience": 1,
+     "location": "Pune"},
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """Poll `url` until it answers 200 or the process dies."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process exited early with code {process.returncode}: {process.args}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def start_mock_boards(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "loadtest.mock_boards",
+        "--port", str(port),
+        "--jobs-per-board", str(args.jobs_per_board),
+        "--latency-ms", str(args.board_latency_ms),
+        "--latency-sigma", str(args.board_latency_sigma),
+        "--error-rate", str(args.error_rate),
+        "--missing-rate", str(args.missing_rate),
+    ]
+    return subprocess.Popen(command, cwd=BACKEND_DIR)
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 10.0) -> None:
+    """Wait until something accepts TCP connections on `port`."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process exited early with code {process.returncode}: {process.args}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Port {port} not open after {timeout}s")
+
+
+def start_mock_redis(port: int) -> subprocess.Popen:
+    command = [sys.executable, "-m", "loadtest.mock_redis", "--port", str(port)]
+    return subprocess.Popen(command, cwd=BACKEND_DIR)
+
+
+def cache_env(args: argparse.Namespace, redis_port: Optional[int]) -> dict[str, str]:
+    """Settings overrides for the `--cache` choice."""
+    if args.cache == "off":
+        return {"BOARD_CACHE_TTL": "0", "EXPANSION_CACHE_TTL": "0", "RANKING_CACHE_TTL": "0"}
+    env = {"CACHE_BACKEND": args.cache}
+    if args.cache == "sqlite":
+        env["CACHE_SQLITE_PATH"] = str(BACKEND_DIR / ".cache" / f"loadtest-{os.getpid()}.sqlite3")
+    if redis_port is not None:
+        env["CACHE_REDIS_URL"] = f"redis://127.0.0.1:{redis_port}/0"
+    return env
+
+
+def board_env(boards_url: str) -> dict[str, str]:
+    """Settings overrides pointing every scraper at the mock boards."""
+    return {
+        "GREENHOUSE_BASE_URL": f"{boards_url}/greenhouse/v1/boards",
+        "LEVER_BASE_URL": f"{boards_url}/lever/v0/postings",
+        "ASHBY_BASE_URL": f"{boards_url}/ashby/posting-api/job-board",
+        "WORKABLE_BASE_URL": f"{boards_url}/workable/api/v1/widget/accounts",
+        "SMARTRECRUITERS_BASE_URL": f"{boards_url}/smartrecruiters/v1/companies",
+    }
+
+
+def start_api(
+    args: argparse.Namespace, port: int, boards_url: str, redis_port: Optional[int] = None
+) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(cache_env(args, redis_port))
+    env.update(board_env(boards_url))
+    env.update({
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_LATENCY_MS": str(args.llm_latency_ms),
+        "FAKE_LLM_LATENCY_SIGMA": str(args.llm_latency_sigma),
+        "DEBUG": "false",
+        "CORPUS_SNAPSHOT_PATH": "",  # No startup refresh competing with the measured load
+    })
+    for override in args.env:
+        key, _, value = override.partition("=")
+        env[key] = value
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--port", str(port),
+        "--workers", str(args.workers),
+        "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+
+
+async def run_queued(client: httpx.AsyncClient, profile: dict, submit_latencies: list[float]) -> tuple[int, dict]:
+    """Submit to /api/analyze/jobs (waiting out 429s) and poll until the task finishes."""
+    while True:
+        start = time.perf_counter()
+        response = await client.post("/api/analyze/jobs", json=profile)
+        submit_latencies.append(time.perf_counter() - start)
+        if response.status_code != 429:
+            break
+        await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+    if response.status_code != 202:
+        return response.status_code, {}
+    task_id = response.json()["task_id"]
+    while True:
+        await asyncio.sleep(POLL_INTERVAL)
+        response = await client.get(f"/api/analyze/jobs/{task_id}")
+        if response.status_code != 200:
+            return response.status_code, {}
+        task = response.json()
+        if task["status"] == "succeeded":
+            return 200, task["result"]
+        if task["status"] == "failed":
+            return 500, {}
+
+
+async def drive(
+    base_url: str, total: int, concurrency: int, profile_overrides: dict, mode: str = "sync"
+) -> dict:
+    """
+    Send `total` analyze requests with `concurrency` in flight.
+
+    In "queued" mode each request is submitted to /api/analyze/jobs and
+    polled; latency is submit to result, and submit latency (how quickly
+    ingress answers) is reported separately.
+    """
+    latencies: list[float] = []
+    submit_latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    timed_out_boards = 0
+    skipped_boards = 0
+    next_index = 0
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        async def worker() -> None:
+            nonlocal next_index, timed_out_boards, skipped_boards
+            while next_index < total:
+                index = next_index
+                next_index += 1
+                profile = {**SAMPLE_PROFILES[index % len(SAMPLE_PROFILES)], **profile_overrides}
+                start = time.perf_counter()
+                try:
+                    if mode == "queued":
+                        code, body = await run_queued(client, profile, submit_latencies)
+                    else:
+                        response = await client.post("/api/analyze", json=profile)
+                        code = response.status_code
+                        body = response.json() if code == 200 else {}
+                    status = str(code)
+                    timed_out_boards += len(body.get("companies_timed_out", []))
+                    skipped_boards += len(body.get("companies_skipped", []))
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        wall = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "wall_seconds": wall,
+        "throughput_rps": total / wall if wall else 0.0,
+        "latency_seconds": summarize(latencies),
+        "submit_latency_seconds": summarize(submit_latencies),
+        "statuses": statuses,
+        "timed_out_boards": timed_out_boards,
+        "skipped_boards": skipped_boards,
+    }
+
+
+def print_report(report: dict) -> None:
+    latency = report["latency_seconds"]
+    print(f"requests:     {report['requests']} (concurrency {report['concurrency']})")
+    print(f"wall time:    {report['wall_seconds']:.2f}s")
+    print(f"throughput:   {report['throughput_rps']:.2f} req/s")
+    if latency.get("count"):
+        print(
+            "latency:      "
+            f"p50 {latency['p50'] * 1000:.0f}ms  p95 {latency['p95'] * 1000:.0f}ms  "
+            f"p99 {latency['p99'] * 1000:.0f}ms  max {latency['max'] * 1000:.0f}ms"
+        )
+    submit = report.get("submit_latency_seconds", {})
+    if submit.get("count"):
+        print(f"submit:       p50 {submit['p50'] * 1000:.0f}ms  p99 {submit['p99'] * 1000:.0f}ms  ({submit['count']} POSTs)")
+    print(f"statuses:     {report['statuses']}")
+    print(f"timed-out boards (summed over responses): {report['timed_out_boards']}")
+    print(f"skipped boards (summed over responses):   {report['skipped_boards']}")
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--mode", choices=["sync", "queued"], default="sync",
+                        help="sync: POST /api/analyze; queued: submit to /api/analyze/jobs and poll")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2, help="Requests sent before measuring")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the API")
+    parser.add_argument("--jobs-per-board", type=int, default=200)
+    parser.add_argument("--board-latency-ms", type=float, default=300.0)
+    parser.add_argument("--board-latency-sigma", type=float, default=0.6)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--llm-latency-sigma", type=float, default=0.5)
+    parser.add_argument("--timeout-seconds", type=float, default=None,
+                        help="Send this request deadline with every profile")
+    parser.add_argument("--cache", choices=["off", "memory", "sqlite", "redis"], default="off",
+                        help="Cache backend for the API (redis starts the mock Redis server)")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the API process (Settings overrides)")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    args = parse_args(argv)
+    boards_port, api_port = free_port(), free_port()
+    boards_url = f"http://127.0.0.1:{boards_port}"
+    api_url = f"http://127.0.0.1:{api_port}"
+
+    overrides = {}
+    if args.timeout_seconds:
+        overrides["timeout_seconds"] = args.timeout_seconds
+
+    processes = []
+    try:
+        boards = start_mock_boards(args, boards_port)
+        processes.append(boards)
+        wait_until_ready(f"{boards_url}/healthz", boards)
+
+        redis_port = None
+        if args.cache == "redis":
+            redis_port = free_port()
+            redis = start_mock_redis(redis_port)
+            processes.append(redis)
+            wait_for_port(redis_port, redis)
+
+        api = start_api(args, api_port, boards_url, redis_port)
+        processes.append(api)
+        wait_until_ready(f"{api_url}/api/health", api)
+
+        if args.warmup:
+            asyncio.run(drive(api_url, args.warmup, min(args.warmup, args.concurrency), overrides, args.mode))
+        report = asyncio.run(drive(api_url, args.requests, args.concurrency, overrides, args.mode))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    print_report(report)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Latency statistics helpers for the load test and benchmarks."""
+
+import math
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100) of `samples`."""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99/max/mean of latency samples (in the samples' unit)."""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples),
+    }
@@ -0,0 +1,248 @@
+"""Synthetic job postings with realistic titles, locations and descriptions.
+
+Shared by the mock job boards and the microbenchmarks so both exercise the
+filters with the same distribution of data.
+"""
+
+import html
+import random
+from typing import Optional
+
+
+SENIORITY_PREFIXES = [
+    "", "", "", "Senior ", "Senior ", "Sr. ", "Staff ", "Principal ", "Junior ",
+    "Lead ", "Associate ", "Intern - ",
+]
+
+TECH_TITLES = [
+    "Software Engineer", "Backend Engineer", "Frontend Engineer", "Full Stack Engineer",
+    "Software Developer", "Data Engineer", "Machine Learning Engineer", "Site Reliability Engineer",
+    "DevOps Engineer", "Platform Engineer", "Mobile Engineer (iOS)", "Android Developer",
+    "Security Engineer", "QA Automation Engineer", "Engineering Manager", "Data Scientist",
+    "Product Designer", "Product Manager", "Solutions Architect", "SDE II", "SDE III",
+    "Member of Technical Staff", "Infrastructure Engineer, Cloud", "Applied AI Engineer",
+]
+
+NON_TECH_TITLES = [
+    "Account Executive", "Sales Development Representative", "Marketing Manager",
+    "HR Business Partner", "Finance Analyst", "Legal Counsel", "Operations Associate",
+    "Customer Success Manager", "Mechanical Engineer", "Supply Chain Analyst",
+    "Recruiter", "Office Manager", "Electrical Engineer - Hardware",
+]
+
+SUFFIXES = ["", "", "", ", Payments", ", Growth", " - Infrastructure", " (Remote)", ", Search", " II", " III"]
+
+LOCATIONS = [
+    "Bengaluru, India", "Bangalore", "Hyderabad, India", "Mumbai", "Pune, India",
+    "Gurgaon, Haryana, India", "Chennai", "Remote", "Remote - India", "Remote, EMEA",
+    "London, UK", "Berlin, Germany", "Amsterdam, Netherlands", "Dublin, Ireland",
+    "San Francisco, CA", "New York, NY", "Seattle, WA", "Austin, TX", "Toronto, Canada",
+    "Singapore", "Sydney, Australia", "Tokyo, Japan", "", "Anywhere",
+]
+
+SKILLS = [
+    "Python", "Go", "Java", "TypeScript", "React", "Kubernetes", "AWS", "GCP", "PostgreSQL",
+    "Kafka", "Spark", "Terraform", "gRPC", "Redis", "Elasticsearch", "PyTorch",
+]
+
+EXPERIENCE_PHRASES = [
+    "{n}+ years of experience building production systems",
+    "{n}-{m} years of professional software development experience",
+    "At least {n} years of industry experience",
+    "Minimum {n} years in a similar role",
+    "{n} years experience with distributed systems",
+    "You have shipped software used by millions of users",
+]
+
+SALARY_PHRASES = [
+    "The base salary range for this role is ${lo:,} - ${hi:,} USD.",
+    "Compensation: ₹{lo_inr} - ₹{hi_inr} LPA plus equity.",
+    "Salary: €{lo_k}k-€{hi_k}k depending on experience.",
+    "",
+    "",
+]
+
+COMPANY_BLURBS = [
+    "We are building the financial infrastructure for the internet.",
+    "Our mission is to make work more productive for every team on the planet.",
+    "We help millions of people discover and buy the things they love.",
+    "Join a small team solving hard problems in developer tooling.",
+]
+
+
+def make_title(rng: random.Random, tech_ratio: float = 0.7) -> str:
+    """Generate a job title; `tech_ratio` of them are software roles."""
+    if rng.random() < tech_ratio:
+        return f"{rng.choice(SENIORITY_PREFIXES)}{rng.choice(TECH_TITLES)}{rng.choice(SUFFIXES)}"
+    return rng.choice(NON_TECH_TITLES)
+
+
+def make_location(rng: random.Random) -> str:
+    return rng.choice(LOCATIONS)
+
+
+def make_description(rng: random.Random, as_html: bool = False) -> str:
+    """
+    Generate a job description of a few hundred words.
+
+    With `as_html`, the text is wrapped in markup and HTML-escaped the way
+    the Greenhouse boards API returns `content`.
+    """
+    n = rng.randint(1, 10)
+    experience = rng.choice(EXPERIENCE_PHRASES).format(n=n, m=n + rng.randint(1, 4))
+    lo = rng.randrange(60, 220) * 1000
+    salary = rng.choice(SALARY_PHRASES).format(
+        lo=lo, hi=lo + rng.randrange(20, 80) * 1000,
+        lo_inr=rng.randint(15, 40), hi_inr=rng.randint(41, 90),
+        lo_k=lo // 1000, hi_k=lo // 1000 + 30,
+    )
+    skills = ", ".join(rng.sample(SKILLS, 5))
+    paragraphs = [
+        rng.choice(COMPANY_BLURBS),
+        "About the role: you will design, build and operate services that power our core product, "
+        "working closely with product, design and data teams.",
+        f"What we're looking for: {experience}. Strong experience with {skills}.",
+        "You care about code quality, testing and observability, and enjoy mentoring others.",
+        salary,
+        "We are an equal opportunity employer and value diversity at our company.",
+    ]
+    if not as_html:
+        return "\n\n".join(p for p in paragraphs if p)
+    markup = "".join(
+        f"<div class=\"content-intro\"><p><strong>{p}</strong></p></div>" if i == 0 else f"<p>{p}</p>"
+        for i, p in enumerate(paragraphs) if p
+    )
+    markup += "<ul>" + "".join(f"<li>{s}</li>" for s in skills.split(", ")) + "</ul>"
+    return html.escape(markup)
+
+
+def make_greenhouse_job(rng: random.Random, company: str, index: int) -> dict:
+    """One record in the shape of boards-api.greenhouse.io `jobs[]`."""
+    job_id = 4000000 + index
+    return {
+        "id": job_id,
+        "title": make_title(rng),
+        "updated_at": f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T10:00:00-04:00",
+        "location": {"name": make_location(rng)},
+        "absolute_url": f"https://boards.greenhouse.io/{company}/jobs/{job_id}",
+        "content": make_description(rng, as_html=True),
+    }
+
+
+def make_lever_job(rng: random.Random, company: str, index: int) -> dict:
+    """One record in the shape of api.lever.co `postings[]`."""
+    posting_id = f"{company}-{index:06d}-{rng.getrandbits(32):08x}"
+    record = {
+        "id": posting_id,
+        "text": make_title(rng),
+        "categories": {"location": make_location(rng), "team": "Engineering"},
+        "hostedUrl": f"https://jobs.lever.co/{company}/{posting_id}",
+        "createdAt": 1700000000000 + index * 1000,
+        "descriptionPlain": make_description(rng),
+    }
+    if rng.random() < 0.3:
+        lo = rng.randrange(60, 220) * 1000
+        record["salaryRange"] = {
+            "min": lo, "max": lo + 40000, "currency": "USD", "interval": "per-year-salary",
+        }
+    return record
+
+
+def make_ashby_job(rng: random.Random, company: str, index: int) -> dict:
+    """One record in the shape of api.ashbyhq.com posting-api `jobs[]`."""
+    job_id = f"{rng.getrandbits(64):016x}"
+    record = {
+        "id": job_id,
+        "title": make_title(rng),
+        "location": make_location(rng),
+        "isRemote": rng.random() < 0.2,
+        "isListed": rng.random() < 0.97,
+        "publishedAt": f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T10:00:00.000+00:00",
+        "jobUrl": f"https://jobs.ashbyhq.com/{company}/{job_id}",
+        "descriptionPlain": make_description(rng),
+    }
+    if rng.random() < 0.4:
+        lo = rng.randrange(60, 220) * 1000
+        record["compensation"] = {"summaryComponents": [
+            {"compensationType": "Salary", "interval": "1 YEAR", "currencyCode": "USD",
+             "minValue": lo, "maxValue": lo + 50000},
+            {"compensationType": "EquityPercentage", "interval": "NONE", "minValue": 0.01, "maxValue": 0.05},
+        ]}
+    return record
+
+
+def make_workable_job(rng: random.Random, company: str, index: int) -> dict:
+    """One record in the shape of apply.workable.com widget API `jobs[]`."""
+    shortcode = f"{rng.getrandbits(40):010X}"
+    city, _, country = make_location(rng).partition(", ")
+    return {
+        "title": make_title(rng),
+        "shortcode": shortcode,
+        "city": city,
+        "state": "",
+        "country": country,
+        "telecommuting": rng.random() < 0.2,
+        "published_on": f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+        "url": f"https://apply.workable.com/j/{shortcode}",
+        "description": make_description(rng, as_html=True),
+    }
+
+
+def make_smartrecruiters_job(rng: random.Random, company: str, index: int) -> dict:
+    """One record in the shape of api.smartrecruiters.com `postings.content[]`."""
+    city, _, country = make_location(rng).partition(", ")
+    return {
+        "id": str(744000000000000 + index),
+        "name": make_title(rng),
+        "releasedDate": f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T10:00:00.000Z",
+        "location": {"city": city, "region": "", "country": country.lower()[:2], "remote": rng.random() < 0.2},
+        "experienceLevel": rng.choice([
+            {"id": "entry_level", "label": "Entry Level"},
+            {"id": "associate", "label": "Associate"},
+            {"id": "mid_senior_level", "label": "Mid-Senior Level"},
+            {"id": "director", "label": "Director"},
+        ]),
+        "company": {"identifier": company, "name": company},
+    }
+
+
+def make_jobs(
+    count: int,
+    seed: int = 0,
+    companies: Optional[list[str]] = None,
+    description_pool: int = 2000,
+) -> list[dict]:
+    """
+    Generate `count` plain job dicts (Job model fields) for benchmarks.
+
+    Around 5% of postings are duplicates of an earlier title+company, like
+    the cross-posting seen on real boards. Descriptions are drawn from a
+    pool of `description_pool` texts so million-job corpora fit in memory.
+    """
+    rng = random.Random(seed)
+    companies = companies or [f"company-{i}" for i in range(200)]
+    descriptions = [make_description(rng)[:1000] for _ in range(min(count, description_pool))]
+    jobs: list[dict] = []
+    for index in range(count):
+        if jobs and rng.random() < 0.05:
+            duplicate = dict(rng.choice(jobs))
+            duplicate["id"] = f"dup_{index}"
+            jobs.append(duplicate)
+            continue
+        company = rng.choice(companies)
+        # About a third of postings state pay (annual USD, as the scrapers store it)
+        salary_min = rng.randrange(40, 220) * 1000 if rng.random() < 0.35 else None
+        jobs.append({
+            "id": f"gh_{company}_{index}",
+            "title": make_title(rng),
+            "company": company.replace("-", " ").title(),
+            "location": make_location(rng),
+            "url": f"https://example.com/{company}/{index}",
+            "source": "greenhouse" if index % 3 else "lever",
+            "description": rng.choice(descriptions),
+            "salary_min": salary_min,
+            "salary_max": salary_min + rng.randrange(20, 80) * 1000 if salary_min else None,
+            "required_experience_min": rng.choice([None, None, 1, 2, 3, 5, 8]),
+            "required_experience_max": None,
+        })
+    return jobs
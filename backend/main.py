@@ -1,11 +1,24 @@
 """FastAPI application entry point."""
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 from api.routes import router
+from api.compression import CompressionMiddleware
+from api.profiling import ProfilingMiddleware
+from api.responses import FastJSONResponse
+from agent.lazy import prewarm, shutdown
 from config import get_settings
+from scrapers.base_scraper import close_http_client
+from services.cache import close_cache
+from services.cassette import close_cassette
+from services.corpus_snapshot import load_warm_start, run_snapshot_refresh
+from services.loop_monitor import start_loop_monitor, stop_loop_monitor
+from services.task_queue import close_task_queue
 
 # Load environment variables
 load_dotenv()
@@ -13,13 +26,41 @@ load_dotenv()
 # Get settings
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown hooks."""
+    background: list[asyncio.Task] = []
+    start_loop_monitor()
+    if settings.corpus_snapshot_path:
+        # Serve boards from the last snapshot until the refresh catches up
+        load_warm_start(settings.corpus_snapshot_path)
+        background.append(asyncio.create_task(run_snapshot_refresh(
+            settings.corpus_snapshot_path, settings.corpus_snapshot_interval
+        )))
+    if settings.prewarm_agent:
+        # Server is already accepting requests while this runs
+        background.append(asyncio.create_task(prewarm()))
+    yield
+    for task in background:
+        task.cancel()
+    await stop_loop_monitor()
+    await close_task_queue()
+    await shutdown()
+    await close_http_client()
+    await close_cache()
+    close_cassette()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="AI Job Search Assistant",
     description="An AI-powered job search assistant that aggregates and ranks job listings",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -31,6 +72,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses (brotli when installed, otherwise gzip)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
+# Admin-only per-request profiler (not installed unless configured)
+if settings.profile_dir and settings.admin_token:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.profile_dir,
+        admin_token=settings.admin_token,
+        sample_interval=settings.profile_sample_interval,
+        top_allocations=settings.profile_top_allocations,
+    )
+
 # Include routers
 app.include_router(router)
 
@@ -0,0 +1,59 @@
+"""Ashby job board scraper."""
+
+from typing import Optional
+
+from api.schemas import Job
+from scrapers.base_scraper import BaseScraper
+from services.experience_extractor import extract_experience
+from services.salary_extractor import extract_salary, salary_from_ashby_compensation
+from services.text_normalizer import normalize_description, truncate_description
+
+
+class AshbyScraper(BaseScraper):
+    """Scraper for Ashby job boards (public posting API)."""
+    
+    SOURCE = "ashby"
+    DISPLAY_NAME = "Ashby"
+    BASE_URL = "https://api.ashbyhq.com/posting-api/job-board"
+    
+    def build_url(self, company: str) -> str:
+        return f"{self.base_url}/{company}?includeCompensation=true"
+    
+    def parse(self, payload: dict) -> list[dict]:
+        return payload.get("jobs", [])
+    
+    def map_record(self, company: str, job_data: dict) -> Optional[Job]:
+        if job_data.get("isListed") is False:
+            return None
+        title = job_data.get("title", "")
+        description = normalize_description(
+            job_data.get("descriptionPlain") or job_data.get("descriptionHtml", "")
+        )
+        
+        # Ashby reports remote roles with a flag, not in the location text
+        location = job_data.get("location") or ""
+        if job_data.get("isRemote") and "remote" not in location.lower():
+            location = f"{location} (Remote)" if location else "Remote"
+        
+        # Extract experience requirements from title and description
+        min_exp, max_exp = extract_experience(title, description)
+        
+        # Pay range: Ashby's structured compensation, else the description
+        salary_min, salary_max = salary_from_ashby_compensation(job_data.get("compensation"))
+        if salary_min is None and salary_max is None:
+            salary_min, salary_max = extract_salary(description)
+        
+        return Job(
+            id=f"ab_{company}_{job_data.get('id', '')}",
+            title=title,
+            company=self.company_name(company),
+            location=location,
+            url=job_data.get("jobUrl", ""),
+            source=self.SOURCE,
+            posted_date=(job_data.get("publishedAt") or "")[:10] or None,
+            description=truncate_description(description),
+            salary_min=salary_min,
+            salary_max=salary_max,
+            required_experience_min=min_exp,
+            required_experience_max=max_exp,
+        )
@@ -1,34 +1,355 @@
-"""Base scraper interface."""
+"""Base scraper engine shared by all job board sources."""
 
+import asyncio
+import json
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional
+
+import httpx
+
 from api.schemas import Job
+from config import get_settings
+from services.cache import cached_json
+from services.cassette import get_cassette
+from services.corpus_snapshot import get_warm_start
+from services.metrics import (
+    BOARD_FETCH_LATENCY, BOARD_ERRORS, BOARDS_SKIPPED, JOBS_INGESTED, RECORDS_SKIPPED,
+    SCRAPER_REQUESTS_IN_FLIGHT, SCRAPER_SLOT_WAIT,
+)
+
+try:
+    import orjson
+except ImportError:  # Optional speedup for large boards; falls back to the standard library
+    orjson = None
+
+
+# =============================================================================
+# SHARED HTTP STATE
+# =============================================================================
+
+class _LoopState:
+    """Pooled client and per-source request slots for one event loop."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.client = httpx.AsyncClient(
+            timeout=settings.scraper_http_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.scraper_max_connections,
+                max_keepalive_connections=settings.scraper_max_connections,
+            ),
+        )
+        self.slots: dict[str, asyncio.Semaphore] = {}
+
+    def source_slots(self, source: str) -> asyncio.Semaphore:
+        if source not in self.slots:
+            self.slots[source] = asyncio.Semaphore(get_settings().scraper_concurrency_per_source)
+        return self.slots[source]
+
+
+# Clients and semaphores are bound to the loop they were created on
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def _loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+    return state
+
+
+async def close_http_client() -> None:
+    """Close the pooled scraper client of the running loop (app shutdown)."""
+    state = _loop_states.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        await state.client.aclose()
+
+
+def _loads(content: bytes) -> Any:
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
 
+# =============================================================================
+# BASE SCRAPER
+# =============================================================================
 
 class BaseScraper(ABC):
-    """Abstract base class for job scrapers."""
-    
+    """
+    Job board scraper engine.
+
+    Sources only describe their API: `build_url` (plus `next_url` for
+    paginated boards), `parse` to pick the posting records out of a
+    response, and `map_record` to turn one record into a Job. The engine
+    provides the rest to every source:
+
+    - one pooled HTTP client per worker, shared by all scrapers and requests
+    - a bounded number of in-flight requests per source
+    - the board cache, corpus snapshot warm start and board metrics
+    - concurrent fetching of many boards under a time budget
+    """
+
+    # Source name used in metrics labels, cache keys and settings
+    SOURCE: str = ""
+    DISPLAY_NAME: str = ""
+    BASE_URL: str = ""
+
+    # Upper bound on pages followed per board (paginated sources)
+    MAX_PAGES: int = 20
+
+    # Serve boards from a loaded corpus snapshot until they are refreshed
+    serve_snapshot: bool = True
+
+    def __init__(self):
+        # e.g. GREENHOUSE_BASE_URL, overridden by the load-test mock servers
+        self.base_url = getattr(get_settings(), f"{self.SOURCE}_base_url", "") or self.BASE_URL
+
+    # -------------------------------------------------------------------------
+    # Source hooks
+    # -------------------------------------------------------------------------
+
     @abstractmethod
+    def build_url(self, company: str) -> str:
+        """URL of the first page of a company's board."""
+
+    def next_url(self, company: str, payload: Any, url: str) -> Optional[str]:
+        """URL of the page after `payload`, or None when done (single page by default)."""
+        return None
+
+    def parse(self, payload: Any) -> Iterable[dict]:
+        """Posting records in a decoded response (the payload itself by default)."""
+        return payload
+
+    @abstractmethod
+    def map_record(self, company: str, record: dict) -> Optional[Job]:
+        """Convert one posting record to a Job (None to skip it)."""
+
+    def get_source_name(self) -> str:
+        """Return the name of the job source."""
+        return self.SOURCE
+
+    @staticmethod
+    def company_name(company: str) -> str:
+        """Display name for a board slug ("scale-ai" -> "Scale Ai")."""
+        return company.replace("-", " ").title()
+
+    # -------------------------------------------------------------------------
+    # Engine
+    # -------------------------------------------------------------------------
+
+    async def fetch_company_jobs(self, company: str) -> list[Job]:
+        """
+        Fetch jobs for a single company board, following pagination.
+
+        Raises on HTTP or parse errors so callers can report the board
+        as failed instead of silently treating it as empty. A single record
+        that cannot be mapped (missing or malformed fields) is skipped and
+        counted; the rest of the board is kept.
+        """
+        jobs: list[Job] = []
+        skipped = 0
+        try:
+            url: Optional[str] = self.build_url(company)
+            for _ in range(self.MAX_PAGES):
+                payload = await self._get_json(url)
+                # Records are mapped one at a time as they are read from the page
+                for record in self.parse(payload):
+                    try:
+                        job = self.map_record(company, record)
+                    except (ValueError, TypeError, AttributeError, KeyError):
+                        # pydantic's ValidationError is a ValueError
+                        skipped += 1
+                        continue
+                    if job is not None:
+                        jobs.append(job)
+                url = self.next_url(company, payload, url)
+                if url is None:
+                    break
+        except Exception as e:
+            print(f"Error fetching jobs from {self.DISPLAY_NAME} for {company}: {e}")
+            raise
+
+        if skipped:
+            RECORDS_SKIPPED.inc(skipped, source=self.get_source_name(), board=company)
+            print(f"Skipped {skipped} malformed records from {self.DISPLAY_NAME} for {company}")
+        return jobs
+
+    async def _get_json(self, url: str) -> Any:
+        """GET `url` (through the cassette when recording or replaying)."""
+        cassette = get_cassette()
+        if cassette is not None:
+            return await cassette.get_json(url, lambda: self._fetch_json(url))
+        return await self._fetch_json(url)
+
+    async def _fetch_json(self, url: str) -> Any:
+        """GET `url` on the pooled client within the source's concurrency limit."""
+        state = _loop_state()
+        source = self.get_source_name()
+        with SCRAPER_SLOT_WAIT.time(source=source):
+            await state.source_slots(source).acquire()
+        SCRAPER_REQUESTS_IN_FLIGHT.inc(source=source)
+        try:
+            response = await state.client.get(url)
+            response.raise_for_status()
+            return _loads(response.content)
+        finally:
+            SCRAPER_REQUESTS_IN_FLIGHT.dec(source=source)
+            state.source_slots(source).release()
+
     async def fetch_jobs(
-        self, 
-        companies: list[str], 
+        self,
+        companies: list[str],
         keywords: Optional[list[str]] = None
     ) -> list[Job]:
         """
-        Fetch jobs from the source.
-        
+        Fetch jobs from multiple company boards.
+
         Args:
-            companies: List of company identifiers to search
-            keywords: Optional keywords to filter jobs
-            
+            companies: List of board slugs for this source
+            keywords: Optional keywords to filter job titles
+
         Returns:
             List of Job objects
         """
-        pass
-    
-    @abstractmethod
-    def get_source_name(self) -> str:
-        """Return the name of the job source."""
-        pass
+        # Fetch from all companies concurrently (failed boards are skipped)
+        all_jobs, _, _, _ = await self.fetch_companies(companies)
+
+        # Filter by keywords if provided
+        if keywords:
+            keywords_lower = [kw.lower() for kw in keywords]
+            all_jobs = [
+                job for job in all_jobs
+                if any(kw in job.title.lower() for kw in keywords_lower)
+            ]
+
+        return all_jobs
+
+    async def fetch_companies(
+        self,
+        companies: list[str],
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[str, list[Job]], None]] = None,
+        stop: Optional[asyncio.Event] = None,
+    ) -> tuple[list[Job], list[str], list[str], list[str]]:
+        """
+        Fetch all company boards concurrently within an optional time budget.
+
+        Boards still running when the budget runs out, or when `stop` is
+        set, are cancelled. Boards are started in the order given, so with
+        more boards than request slots the first ones are served first.
+
+        Args:
+            companies: List of company identifiers to fetch, highest priority first
+            timeout: Seconds to wait before cancelling unfinished boards
+            on_result: Called with (company, jobs) as each board succeeds,
+                in completion order, so callers can start work early
+            stop: Set by the caller once it has enough jobs
+
+        Returns:
+            Tuple of (jobs, failed companies, timed-out companies, skipped
+            companies). Jobs keep the order of `companies`.
+        """
+        if not companies:
+            return [], [], [], []
+
+        tasks = {
+            asyncio.create_task(self._fetch_company_timed(company)): company
+            for company in companies
+        }
+        pending = set(tasks)
+        stop_waiter = asyncio.ensure_future(stop.wait()) if stop is not None else None
+        stopped = False
+        cutoff = None if timeout is None else time.monotonic() + timeout
+        try:
+            while pending:
+                remaining = None if cutoff is None else cutoff - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                waiting = pending if stop_waiter is None else pending | {stop_waiter}
+                done, _ = await asyncio.wait(
+                    waiting, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending -= done
+                for task in done:
+                    if task is not stop_waiter and on_result is not None and task.exception() is None:
+                        on_result(tasks[task], task.result())
+                if stop is not None and stop.is_set():
+                    stopped = True
+                    break
+        finally:
+            if stop_waiter is not None:
+                stop_waiter.cancel()
+            # Cancel boards that missed the cutoff, are no longer needed or
+            # whose caller was cancelled, and wait for them to unwind
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+        jobs: list[Job] = []
+        failed: list[str] = []
+        timed_out: list[str] = []
+        skipped: list[str] = []
+        for task, company in tasks.items():
+            if task in pending:
+                (skipped if stopped else timed_out).append(company)
+            elif task.exception() is not None:
+                failed.append(company)
+            else:
+                jobs.extend(task.result())
+        if skipped:
+            BOARDS_SKIPPED.inc(len(skipped), source=self.get_source_name())
+
+        return jobs, failed, timed_out, skipped
+
+    async def _fetch_company_timed(self, company: str) -> list[Job]:
+        """Fetch one board, recording latency, outcome and ingested job count."""
+        source = self.get_source_name()
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            jobs = await self._fetch_company_cached(company)
+            JOBS_INGESTED.inc(len(jobs), source=source, board=company)
+            return jobs
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception:
+            outcome = "error"
+            BOARD_ERRORS.inc(source=source, board=company)
+            raise
+        finally:
+            BOARD_FETCH_LATENCY.observe(
+                time.perf_counter() - start, source=source, board=company, outcome=outcome
+            )
+
+    async def _fetch_company_cached(self, company: str) -> list[Job]:
+        """
+        Fetch one board through the shared board cache.
+
+        Right after startup, boards in the corpus snapshot are served from
+        it until the background refresh has fetched them live. With a
+        shared backend only one worker fetches a stale board; the
+        others wait for and reuse its result. Failed fetches are not cached.
+        """
+        source = self.get_source_name()
+        if self.serve_snapshot:
+            warm_start = get_warm_start()
+            if warm_start is not None:
+                jobs = warm_start.board_jobs(source, company)
+                if jobs is not None:
+                    return jobs
+
+        async def load() -> list[dict]:
+            return [job.model_dump() for job in await self.fetch_company_jobs(company)]
 
+        records = await cached_json(
+            "board", f"board:{source}:{company}", get_settings().board_cache_ttl, load
+        )
+        return [Job(**record) for record in records]
 
+    async def close(self):
+        """Release per-scraper resources (the pooled client is app-scoped)."""
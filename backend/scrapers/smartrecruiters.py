@@ -0,0 +1,56 @@
+"""SmartRecruiters job board scraper."""
+
+from typing import Optional
+
+from api.schemas import Job
+from scrapers.base_scraper import BaseScraper
+from services.experience_extractor import extract_experience
+
+
+class SmartRecruitersScraper(BaseScraper):
+    """Scraper for SmartRecruiters job boards (public postings API, paginated)."""
+    
+    SOURCE = "smartrecruiters"
+    DISPLAY_NAME = "SmartRecruiters"
+    BASE_URL = "https://api.smartrecruiters.com/v1/companies"
+    PAGE_SIZE = 100  # API maximum
+    
+    def build_url(self, company: str, offset: int = 0) -> str:
+        return f"{self.base_url}/{company}/postings?limit={self.PAGE_SIZE}&offset={offset}"
+    
+    def next_url(self, company: str, payload: dict, url: str) -> Optional[str]:
+        offset = payload.get("offset", 0) + len(payload.get("content", []))
+        if not payload.get("content") or offset >= payload.get("totalFound", 0):
+            return None
+        return self.build_url(company, offset)
+    
+    def parse(self, payload: dict) -> list[dict]:
+        return payload.get("content", [])
+    
+    def map_record(self, company: str, job_data: dict) -> Job:
+        title = job_data.get("name", "")
+        
+        place = job_data.get("location") or {}
+        parts = [place.get(key) for key in ("city", "region", "country")]
+        location = ", ".join(part for part in parts if part)
+        if place.get("remote"):
+            location = f"{location} (Remote)" if location else "Remote"
+        
+        # The postings list carries no description; infer experience from
+        # the title, else from SmartRecruiters' experience level label
+        min_exp, max_exp = extract_experience(title)
+        if min_exp is None and max_exp is None:
+            min_exp, max_exp = extract_experience((job_data.get("experienceLevel") or {}).get("label") or "")
+        
+        return Job(
+            id=f"sr_{company}_{job_data.get('id', '')}",
+            title=title,
+            company=self.company_name(company),
+            location=location,
+            url=f"https://jobs.smartrecruiters.com/{company}/{job_data.get('id', '')}",
+            source=self.SOURCE,
+            posted_date=(job_data.get("releasedDate") or "")[:10] or None,
+            description=None,
+            required_experience_min=min_exp,
+            required_experience_max=max_exp,
+        )
@@ -0,0 +1,51 @@
+"""Workable job board scraper."""
+
+from api.schemas import Job
+from scrapers.base_scraper import BaseScraper
+from services.experience_extractor import extract_experience
+from services.salary_extractor import extract_salary
+from services.text_normalizer import normalize_description, truncate_description
+
+
+class WorkableScraper(BaseScraper):
+    """Scraper for Workable job boards (public widget API)."""
+    
+    SOURCE = "workable"
+    DISPLAY_NAME = "Workable"
+    BASE_URL = "https://apply.workable.com/api/v1/widget/accounts"
+    
+    def build_url(self, company: str) -> str:
+        return f"{self.base_url}/{company}?details=true"  # Include descriptions
+    
+    def parse(self, payload: dict) -> list[dict]:
+        return payload.get("jobs", [])
+    
+    def map_record(self, company: str, job_data: dict) -> Job:
+        title = job_data.get("title", "")
+        description = normalize_description(job_data.get("description", ""))
+        
+        parts = [job_data.get(key) for key in ("city", "state", "country")]
+        location = ", ".join(part for part in parts if part)
+        if job_data.get("telecommuting"):
+            location = f"{location} (Remote)" if location else "Remote"
+        
+        # Extract experience requirements from title and description
+        min_exp, max_exp = extract_experience(title, description)
+        
+        # Pay range stated in the description (annual USD)
+        salary_min, salary_max = extract_salary(description)
+        
+        return Job(
+            id=f"wk_{company}_{job_data.get('shortcode', '')}",
+            title=title,
+            company=self.company_name(company),
+            location=location,
+            url=job_data.get("url") or job_data.get("shortlink", ""),
+            source=self.SOURCE,
+            posted_date=job_data.get("published_on") or None,
+            description=truncate_description(description),
+            salary_min=salary_min,
+            salary_max=salary_max,
+            required_experience_min=min_exp,
+            required_experience_max=max_exp,
+        )
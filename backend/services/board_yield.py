@@ -0,0 +1,101 @@
+"""Historical board yield, for fetching the most useful boards first.
+
+Ranking only ever looks at the first `max_jobs` candidates, so boards
+that rarely produce a candidate should not be what a request waits for.
+Each time the streaming pipeline filters a board it records how many
+preferred-location candidates the board gave for the profile's filters;
+boards that fail or time out are recorded as giving none. `order` then
+puts boards with the best recent yield first. Yields are kept per profile
+location (the filter known before the fetch starts), with the board's
+yield across all locations as a fallback.
+
+Boards without any history keep their configured order and go first, so
+every board is measured at least once. A board that is ordered late keeps
+getting skipped by the early stop and its estimate would never change, so
+an estimate not refreshed for `explore_after` searches counts as unseen
+again and the board is re-probed. At most `max_keys` estimates are kept;
+the least recently updated are dropped first.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+from config import get_settings
+
+
+class BoardYield:
+    """Exponentially weighted candidates-per-fetch, per (location, board)."""
+
+    def __init__(self, alpha: float = 0.3, explore_after: int = 50, max_keys: int = 10000):
+        self.alpha = alpha
+        self.explore_after = explore_after
+        self.max_keys = max_keys
+        self._searches = 0
+        # (location, board) -> (yield, search count when last observed), oldest first
+        self._yields: OrderedDict[tuple[str, str], tuple[float, int]] = OrderedDict()
+
+    @staticmethod
+    def _location_key(location: Optional[str]) -> str:
+        return (location or "").lower().strip()
+
+    def _update(self, key: tuple[str, str], candidates: int) -> None:
+        previous = self._yields.pop(key, None)
+        if previous is None:
+            value = float(candidates)
+        else:
+            value = previous[0] + self.alpha * (candidates - previous[0])
+        self._yields[key] = (value, self._searches)
+        while len(self._yields) > self.max_keys:
+            self._yields.popitem(last=False)
+
+    def observe(self, board: str, location: Optional[str], candidates: int) -> None:
+        """Record the candidates one fetch of `board` gave a profile."""
+        board = board.lower()
+        self._update((self._location_key(location), board), candidates)
+        self._update(("*", board), candidates)
+
+    def observe_failure(self, board: str, location: Optional[str]) -> None:
+        """Record a failed or timed-out fetch of `board` (no candidates)."""
+        self.observe(board, location, 0)
+
+    def _fresh(self, key: tuple[str, str]) -> Optional[float]:
+        entry = self._yields.get(key)
+        if entry is None or self._searches - entry[1] > self.explore_after:
+            return None
+        return entry[0]
+
+    def estimate(self, board: str, location: Optional[str]) -> Optional[float]:
+        """Expected candidates from `board` (None if never seen or due a re-probe)."""
+        board = board.lower()
+        estimate = self._fresh((self._location_key(location), board))
+        if estimate is None:
+            estimate = self._fresh(("*", board))
+        return estimate
+
+    def start_search(self) -> None:
+        """Count a search, for aging estimates towards a re-probe."""
+        self._searches += 1
+
+    def order(self, companies: list[str], location: Optional[str]) -> list[str]:
+        """Boards best-yield first; unseen boards first, in configured order."""
+        def key(company: str) -> float:
+            estimate = self.estimate(company, location)
+            return float("-inf") if estimate is None else -estimate
+
+        return sorted(companies, key=key)  # Stable: ties keep config order
+
+
+_board_yield: Optional[BoardYield] = None
+
+
+def get_board_yield() -> BoardYield:
+    """Process-wide yield history."""
+    global _board_yield
+    if _board_yield is None:
+        settings = get_settings()
+        _board_yield = BoardYield(
+            alpha=settings.board_yield_alpha,
+            explore_after=settings.board_yield_explore_after,
+            max_keys=settings.board_yield_max_keys,
+        )
+    return _board_yield
@@ -0,0 +1,528 @@
+"""Cache backends shared by the board, expansion and ranking caches.
+
+With several uvicorn workers, an in-process cache means every worker
+scrapes the boards and pays for LLM calls separately. The SQLite backend
+(one file per host) and the Redis backend (any Redis-protocol server) are
+shared by all workers, and `cached_json` uses a cross-process lock so that
+only one worker refreshes a given key while the others wait for its result.
+
+Select with CACHE_BACKEND=memory|sqlite|redis.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+from config import get_settings
+from services.metrics import CACHE_REQUESTS
+
+
+class CacheError(Exception):
+    """Raised when a cache backend cannot serve a request."""
+
+
+class CacheBackend(ABC):
+    """Byte-oriented key/value store with TTLs and advisory locks."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Value for `key`, or None if missing or expired."""
+
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Values for `keys` in order (None where missing)."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store `value` for `ttl` seconds."""
+
+    @abstractmethod
+    async def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        """Store several values with the same TTL."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove `key` if present."""
+
+    @abstractmethod
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        """
+        Try to take lock `name` for at most `ttl` seconds.
+
+        Returns:
+            A token to pass to `release_lock`, or None if someone else holds it
+        """
+
+    @abstractmethod
+    async def release_lock(self, name: str, token: str) -> None:
+        """Release lock `name` if it is still held with `token`."""
+
+    async def aclose(self) -> None:
+        """Release connections."""
+
+
+# =============================================================================
+# IN-PROCESS
+# =============================================================================
+
+class MemoryCache(CacheBackend):
+    """Per-process cache (the default; not shared between workers)."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._data: dict[str, tuple[float, bytes]] = {}
+        self._locks: dict[str, tuple[float, str]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._data[key]
+            return None
+        return value
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data.pop(key, None)
+        self._data[key] = (time.time() + ttl, value)
+        # Evict oldest insertions first
+        while len(self._data) > self.max_entries:
+            del self._data[next(iter(self._data))]
+
+    async def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def purge_expired(self) -> None:
+        """Drop expired entries (reads only drop the entry they hit)."""
+        now = time.time()
+        for key in [key for key, (expires_at, _) in self._data.items() if expires_at < now]:
+            del self._data[key]
+
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        now = time.time()
+        held = self._locks.get(name)
+        if held is not None and held[0] > now:
+            return None
+        token = uuid.uuid4().hex
+        self._locks[name] = (now + ttl, token)
+        return token
+
+    async def release_lock(self, name: str, token: str) -> None:
+        held = self._locks.get(name)
+        if held is not None and held[1] == token:
+            del self._locks[name]
+
+
+# =============================================================================
+# SQLITE (shared by all workers on one host)
+# =============================================================================
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache in a local SQLite file.
+
+    Every worker opens the same file; WAL mode lets readers proceed while
+    one writer commits. Locks are rows taken with BEGIN IMMEDIATE so the
+    check-and-insert is atomic across processes. Queries run in a thread
+    to keep the event loop free. Expired rows are never returned, and are
+    deleted in the same transaction as every `purge_every`-th written row.
+    """
+
+    def __init__(self, path: str, purge_every: int = 1000):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.purge_every = purge_every
+        self._writes_since_purge = 0
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn_lock = threading.Lock()
+        with self._conn_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS locks (name TEXT PRIMARY KEY, token TEXT, expires_at REAL)"
+            )
+
+    async def _run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        def call() -> Any:
+            with self._conn_lock:
+                try:
+                    return func(self._conn)
+                except sqlite3.Error as e:
+                    raise CacheError(str(e)) from e
+        return await asyncio.to_thread(call)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        if not keys:
+            return []
+
+        def query(conn: sqlite3.Connection) -> list[Optional[bytes]]:
+            found: dict[str, bytes] = {}
+            now = time.time()
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expires_at >= ?",
+                    (*chunk, now),
+                )
+                found.update(rows)
+            return [found.get(key) for key in keys]
+
+        return await self._run(query)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + ttl
+        self._writes_since_purge += len(items)
+        purge = self._writes_since_purge >= self.purge_every
+        if purge:
+            self._writes_since_purge = 0
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    [(key, value, expires_at) for key, value in items.items()],
+                )
+                if purge:
+                    conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+                    conn.execute("DELETE FROM locks WHERE expires_at < ?", (now,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        await self._run(write)
+
+    async def delete(self, key: str) -> None:
+        await self._run(lambda conn: conn.execute("DELETE FROM cache WHERE key = ?", (key,)))
+
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+
+        def take(conn: sqlite3.Connection) -> Optional[str]:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM locks WHERE name = ? AND expires_at < ?", (name, now))
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO locks (name, token, expires_at) VALUES (?, ?, ?)",
+                    (name, token, now + ttl),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return token if cursor.rowcount == 1 else None
+
+        return await self._run(take)
+
+    async def release_lock(self, name: str, token: str) -> None:
+        await self._run(
+            lambda conn: conn.execute("DELETE FROM locks WHERE name = ? AND token = ?", (name, token))
+        )
+
+    async def aclose(self) -> None:
+        with self._conn_lock:
+            self._conn.close()
+
+
+# =============================================================================
+# REDIS PROTOCOL (shared across hosts)
+# =============================================================================
+
+# Delete the lock only if we still own it
+RELEASE_LOCK_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+
+class _RespConnection:
+    """One connection speaking RESP2."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def command(self, *args: Any) -> Any:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self.writer.write(b"".join(parts))
+        await self.writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> Any:
+        line = await self.reader.readline()
+        if not line:
+            raise CacheError("Connection closed by server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise CacheError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(payload)
+            if count == -1:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise CacheError(f"Unexpected reply: {line!r}")
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RedisCache(CacheBackend):
+    """
+    Minimal Redis-protocol client (GET/MGET/SET/DEL/EVAL).
+
+    Works with Redis, Valkey, KeyDB or the stand-in in loadtest.mock_redis.
+    Keeps a small pool of connections; each command borrows one.
+    """
+
+    def __init__(self, url: str, pool_size: int = 8, key_prefix: str = "jobsearch:"):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.key_prefix = key_prefix
+        self._idle: list[_RespConnection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def _connect(self) -> _RespConnection:
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as e:
+            raise CacheError(f"Cannot connect to {self.host}:{self.port}: {e}") from e
+        conn = _RespConnection(reader, writer)
+        if self.password:
+            await conn.command("AUTH", self.password)
+        if self.db:
+            await conn.command("SELECT", self.db)
+        return conn
+
+    async def _command(self, *args: Any) -> Any:
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                reply = await conn.command(*args)
+            except (OSError, asyncio.IncompleteReadError) as e:
+                conn.close()
+                raise CacheError(str(e)) from e
+            except BaseException:
+                # Reply state unknown (e.g. cancelled mid-read); do not reuse
+                conn.close()
+                raise
+            self._idle.append(conn)
+            return reply
+
+    def _key(self, key: str) -> str:
+        return self.key_prefix + key
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._command("GET", self._key(key))
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self._command("MGET", *[self._key(key) for key in keys])
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._command("SET", self._key(key), value, "PX", max(1, int(ttl * 1000)))
+
+    async def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._command("DEL", self._key(key))
+
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        reply = await self._command("SET", self._key(name), token, "NX", "PX", max(1, int(ttl * 1000)))
+        return token if reply == "OK" else None
+
+    async def release_lock(self, name: str, token: str) -> None:
+        await self._command("EVAL", RELEASE_LOCK_SCRIPT, 1, self._key(name), token)
+
+    async def aclose(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+
+# =============================================================================
+# FACTORY AND HELPERS
+# =============================================================================
+
+_cache: Optional[CacheBackend] = None
+
+
+def create_cache(backend: str) -> CacheBackend:
+    """Build the backend named by CACHE_BACKEND."""
+    settings = get_settings()
+    if backend == "sqlite":
+        return SQLiteCache(settings.cache_sqlite_path)
+    if backend == "redis":
+        return RedisCache(settings.cache_redis_url)
+    if backend == "memory":
+        return MemoryCache()
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def get_cache() -> CacheBackend:
+    """Process-wide cache backend."""
+    global _cache
+    if _cache is None:
+        _cache = create_cache(get_settings().cache_backend)
+    return _cache
+
+
+async def close_cache() -> None:
+    global _cache
+    if _cache is not None:
+        await _cache.aclose()
+        _cache = None
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    """Stable cache key from JSON-serialisable parts (hashed to a fixed length)."""
+    digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+async def cached_json(
+    cache_name: str,
+    key: str,
+    ttl: float,
+    loader: Callable[[], Awaitable[Any]],
+    cache: Optional[CacheBackend] = None,
+) -> Any:
+    """
+    Return the cached JSON value for `key`, loading and storing it on a miss.
+
+    Only one process loads a given key at a time: the first to miss takes
+    a lock and the others poll for its result (up to the lock TTL) instead
+    of hitting the upstream too. Loader errors are not cached; if the lock
+    is released without a value, the next waiter to take it loads instead.
+    Cache failures degrade to calling the loader directly.
+
+    Args:
+        cache_name: Label for metrics (e.g. "board", "expansion")
+        key: Cache key
+        ttl: Seconds to keep the value
+        loader: Coroutine function producing a JSON-serialisable value
+        cache: Backend (defaults to `get_cache()`)
+    """
+    if ttl <= 0:
+        return await loader()
+    cache = cache or get_cache()
+    lock_ttl = get_settings().cache_lock_ttl
+    lock_name = f"lock:{key}"
+
+    try:
+        raw = await cache.get(key)
+        if raw is not None:
+            CACHE_REQUESTS.inc(cache=cache_name, result="hit")
+            return json.loads(raw)
+        token = await cache.acquire_lock(lock_name, lock_ttl)
+        if token is None:
+            # Another worker is refreshing this key; wait for its result
+            raw, token = await _wait_for_value(cache, key, lock_name, lock_ttl)
+            if raw is not None:
+                CACHE_REQUESTS.inc(cache=cache_name, result="shared")
+                return json.loads(raw)
+    except CacheError as e:
+        print(f"Cache {cache_name} unavailable, loading directly: {e}")
+        return await loader()
+
+    CACHE_REQUESTS.inc(cache=cache_name, result="miss")
+    try:
+        value = await loader()
+        try:
+            await cache.set(key, json.dumps(value).encode(), ttl)
+        except CacheError as e:
+            print(f"Cache {cache_name} write failed: {e}")
+        return value
+    finally:
+        if token is not None:
+            try:
+                await cache.release_lock(lock_name, token)
+            except CacheError:
+                pass  # Lock expires on its own
+
+
+async def _wait_for_value(
+    cache: CacheBackend, key: str, lock_name: str, timeout: float
+) -> tuple[Optional[bytes], Optional[str]]:
+    """
+    Poll for `key` with backoff until it appears or `timeout` passes.
+
+    Each empty poll also tries the lock: if the loader released it without
+    storing a value (it failed), waiting longer is pointless.
+
+    Returns:
+        (value, None) once the value appears, (None, lock token) if the
+        lock was taken over, (None, None) on timeout
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        await asyncio.sleep(delay)
+        raw = await cache.get(key)
+        if raw is not None:
+            return raw, None
+        token = await cache.acquire_lock(lock_name, timeout)
+        if token is not None:
+            # Re-check: the value may have been stored just before the release
+            raw = await cache.get(key)
+            if raw is not None:
+                await cache.release_lock(lock_name, token)
+                return raw, None
+            return None, token
+        delay = min(delay * 2, 0.5)
+    return None, None
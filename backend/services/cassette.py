@@ -0,0 +1,237 @@
+"""Record/replay cassettes for job board HTTP responses and LLM calls.
+
+With CASSETTE_MODE=record every board response fetched by the scrapers
+and every `expand_profile` / `_rank_batch` LLM call (inputs, structured
+output and token usage) is captured, with its latency, and written to a
+gzip-compressed JSON-lines file at shutdown. With CASSETTE_MODE=replay
+the same calls are answered from the file without touching the network,
+optionally sleeping for the recorded latency, so the full analyze
+pipeline can be profiled and benchmarked offline and repeatably.
+
+Ranking batches are also recorded per job, so replay still works when
+boards arrive in a different order and jobs end up in different batches
+than during the recording.
+
+Record with the caches off (BOARD_CACHE_TTL=0, EXPANSION_CACHE_TTL=0,
+RANKING_CACHE_TTL=0) so every call reaches the network and is captured.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from config import get_settings
+
+
+MODES = ("off", "record", "replay")
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode for a call that is not on the cassette."""
+
+
+class Cassette:
+    """One cassette file, recording or replaying."""
+
+    def __init__(self, path: str, mode: str, replay_latency: bool = True):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._entries: list[dict] = []               # Recorded, in call order
+        self._http: dict[str, dict] = {}             # url -> entry
+        self._llm: dict[str, dict] = {}              # call key -> entry
+        self._items: dict[str, dict] = {}            # batch item key -> {value, latency, usage}
+        if mode == "replay":
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self._index(json.loads(line))
+        print(f"Loaded cassette {self.path}: {len(self._http)} responses, {len(self._llm)} LLM calls")
+
+    def _index(self, entry: dict) -> None:
+        """Make an entry replayable (repeated keys: the last recording wins)."""
+        if entry["kind"] == "http":
+            self._http[entry["key"]] = entry
+            return
+        self._llm[entry["key"]] = entry
+        items = entry.get("items")
+        if items:
+            values = entry["output"][entry["items_field"]]
+            share = {name: count / len(items) for name, count in entry["usage"].items()}
+            for value in values:
+                key = items.get(str(value.get(entry["item_id"])))
+                if key is not None:
+                    self._items[key] = {
+                        "field": entry["items_field"], "value": value,
+                        "latency": entry["latency"], "usage": share,
+                    }
+
+    def _record(self, entry: dict) -> None:
+        self._entries.append(entry)
+        self._index(entry)
+
+    async def _delay(self, seconds: float) -> None:
+        if self.replay_latency and seconds > 0:
+            await asyncio.sleep(seconds)
+
+    async def get_json(self, url: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Decoded JSON body of a GET, recorded or replayed.
+
+        Args:
+            url: Request URL (the cassette key)
+            fetch: Performs the real request (record mode)
+        """
+        if self.recording:
+            start = time.perf_counter()
+            payload = await fetch()
+            self._record({
+                "kind": "http", "key": url,
+                "latency": time.perf_counter() - start, "response": payload,
+            })
+            return payload
+
+        entry = self._http.get(url)
+        if entry is None:
+            raise CassetteMiss(f"No recorded response for {url}")
+        await self._delay(entry["latency"])
+        return entry["response"]
+
+    async def invoke_llm(
+        self,
+        operation: str,
+        chain: Any,
+        inputs: dict,
+        schema: type,
+        items: Optional[dict[str, str]] = None,
+        item_id: str = "id",
+    ) -> dict:
+        """
+        Structured-output chain call (`include_raw=True`), recorded or replayed.
+
+        Args:
+            operation: Logical call ("expand_profile", "rank_batch")
+            chain: prompt | structured-output chain
+            inputs: Prompt variables (the cassette key)
+            schema: Pydantic model the chain parses into
+            items: For batch calls, maps the id of each element of the
+                output's list field (its `item_id` field) to a stable key;
+                lets replay assemble batches that were split differently
+                when recorded
+            item_id: Name of the id field of the batch output elements
+
+        Returns:
+            {"raw", "parsed", "parsing_error"} as returned by the chain
+        """
+        # Deferred like the rest of the LLM stack (see agent.lazy)
+        from langchain_core.messages import AIMessage
+        from services.cache import make_key
+
+        key = make_key(f"cassette:{operation}", inputs)
+        if self.recording:
+            start = time.perf_counter()
+            output = await chain.ainvoke(inputs)
+            if output["parsing_error"] is None:
+                entry = {
+                    "kind": "llm", "operation": operation, "key": key,
+                    "latency": time.perf_counter() - start, "inputs": inputs,
+                    "output": output["parsed"].model_dump(),
+                    "usage": _usage(output["raw"]),
+                }
+                if items:
+                    entry["items"] = items
+                    entry["item_id"] = item_id
+                    entry["items_field"] = _list_field(entry["output"])
+                self._record(entry)
+            return output
+
+        entry = self._llm.get(key)
+        if entry is not None:
+            latency, parsed, usage = entry["latency"], entry["output"], entry["usage"]
+        elif items and all(item_key in self._items for item_key in items.values()):
+            refs = list(items)
+            recorded = [self._items[items[ref]] for ref in refs]
+            latency = max(item["latency"] for item in recorded)
+            # Recorded under other ids: relabel each element with this call's id
+            parsed = {recorded[0]["field"]: [
+                {**item["value"], item_id: ref} for ref, item in zip(refs, recorded)
+            ]}
+            usage = {
+                name: int(sum(item["usage"].get(name, 0) for item in recorded))
+                for name in recorded[0]["usage"]
+            }
+        else:
+            raise CassetteMiss(f"No recorded {operation} call for these inputs")
+
+        await self._delay(latency)
+        return {
+            "raw": AIMessage(content="", usage_metadata=usage),
+            "parsed": schema.model_validate(parsed),
+            "parsing_error": None,
+        }
+
+    def save(self) -> int:
+        """Write recorded calls to the cassette file; returns the number written."""
+        if not self.recording:
+            return 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp.{os.getpid()}"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for entry in self._entries:
+                f.write(json.dumps(entry, default=str))
+                f.write("\n")
+        os.replace(tmp_path, self.path)
+        print(f"Wrote cassette {self.path}: {len(self._entries)} calls")
+        return len(self._entries)
+
+
+def _usage(message: Any) -> dict[str, int]:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return {
+        name: usage.get(name, 0) or 0
+        for name in ("input_tokens", "output_tokens", "total_tokens")
+    }
+
+
+def _list_field(output: dict) -> str:
+    """Name of the (single) list field of a batch output, e.g. "rankings"."""
+    for name, value in output.items():
+        if isinstance(value, list):
+            return name
+    raise ValueError("Batch LLM output has no list field")
+
+
+_cassette: Optional[Cassette] = None
+
+
+def get_cassette() -> Optional[Cassette]:
+    """The process-wide cassette, or None when CASSETTE_MODE=off."""
+    global _cassette
+    settings = get_settings()
+    if _cassette is None and settings.cassette_mode != "off":
+        if settings.cassette_mode not in MODES:
+            raise ValueError(f"CASSETTE_MODE must be one of {MODES}")
+        _cassette = Cassette(settings.cassette_path, settings.cassette_mode, settings.cassette_replay_latency)
+    return _cassette
+
+
+def close_cassette() -> None:
+    """Write the cassette if recording (app shutdown)."""
+    global _cassette
+    if _cassette is not None:
+        _cassette.save()
+        _cassette = None
@@ -0,0 +1,373 @@
+"""On-disk snapshot of the job corpus for warm starts.
+
+After a restart every board would have to be re-scraped before requests
+run at full speed. The aggregated corpus is periodically written to a
+compact binary snapshot; on startup the snapshot is memory-mapped and
+boards are served from it until the background refresh has fetched them
+live again.
+
+File layout (all integers native-endian, sections 8-byte aligned):
+
+    MAGIC (8 bytes) | version u32 | header length u32 | header JSON | sections
+
+The header records the byte order, job count, section offsets and the row
+range and fetch time of every (source, board). Sections are:
+
+- a string table: u32 offsets[count + 1] followed by the UTF-8 bytes.
+  Every distinct string (company, location, description, ...) is stored
+  once; string columns hold u32 indexes into it.
+- one column per Job field: u32 string indexes or i32 integers, with
+  sentinels for None.
+
+Opening only parses the header; rows are decoded when a board is read.
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+from typing import Optional
+
+from api.schemas import Job
+from config import get_settings
+from services.metrics import CACHE_REQUESTS
+
+
+MAGIC = b"JOBSNAP\x00"
+VERSION = 1
+
+STRING_FIELDS = ("id", "title", "company", "location", "url", "source", "posted_date", "description")
+INT_FIELDS = ("salary_min", "salary_max", "required_experience_min", "required_experience_max")
+
+NO_STRING = 0xFFFFFFFF
+NO_INT = -(2 ** 31)
+
+BoardKey = tuple[str, str]  # (source, board slug)
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or from another version."""
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_snapshot(
+    path: str,
+    boards: dict[BoardKey, list[Job]],
+    fetched_at: Optional[dict[BoardKey, float]] = None,
+) -> int:
+    """
+    Write `boards` to `path` atomically (readers never see a partial file).
+
+    Args:
+        path: Snapshot file
+        boards: Jobs per (source, board)
+        fetched_at: When each board was last fetched live (default: now)
+
+    Returns:
+        Number of jobs written
+    """
+    strings: dict[str, int] = {}
+    string_columns = {name: array("I") for name in STRING_FIELDS}
+    int_columns = {name: array("i") for name in INT_FIELDS}
+    board_ranges = []
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    now = time.time()
+    fetched_at = fetched_at or {}
+    board_times = []
+    row = 0
+    for (source, board), jobs in boards.items():
+        board_times.append(fetched_at.get((source, board), now))
+        start = row
+        for job in jobs:
+            for name in STRING_FIELDS:
+                string_columns[name].append(intern(getattr(job, name)))
+            for name in INT_FIELDS:
+                value = getattr(job, name)
+                int_columns[name].append(NO_INT if value is None else value)
+            row += 1
+        board_ranges.append([source, board, start, row])
+
+    encoded = [value.encode() for value in strings]
+    offsets = array("I", [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    # Sections in file order: (name, bytes)
+    sections = [("string_offsets", offsets.tobytes()), ("string_data", b"".join(encoded))]
+    sections += [(name, column.tobytes()) for name, column in string_columns.items()]
+    sections += [(name, column.tobytes()) for name, column in int_columns.items()]
+
+    # The header holds the section offsets, which depend on the header's own
+    # length; rebuild until the length is stable, then pad to the boundary
+    def build_header(base: int) -> tuple[bytes, dict[str, list[int]]]:
+        layout = {}
+        offset = base
+        for name, data in sections:
+            offset = _align(offset)
+            layout[name] = [offset, len(data)]
+            offset += len(data)
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "created_at": now,
+            "job_count": row,
+            "string_count": len(encoded),
+            "sections": layout,
+            "boards": board_ranges,
+            "board_fetched_at": board_times,
+        }).encode()
+        return header, layout
+
+    header, _ = build_header(0)
+    while True:
+        base = _align(16 + len(header))
+        header, layout = build_header(base)
+        if _align(16 + len(header)) <= base:
+            break
+    header = header.ljust(base - 16)
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(array("I", [VERSION, len(header)]).tobytes())
+        f.write(header)
+        for name, data in sections:
+            f.seek(layout[name][0])
+            f.write(data)
+    os.replace(tmp_path, path)
+    return row
+
+
+class CorpusSnapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path: str):
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot open snapshot {path}: {e}") from e
+        self.path = path
+        view = self._view = memoryview(self._mmap)
+        if bytes(view[:8]) != MAGIC:
+            raise SnapshotError(f"{path} is not a job corpus snapshot")
+        version, header_len = view[8:16].cast("I")
+        if version != VERSION:
+            raise SnapshotError(f"Snapshot version {version} not supported (expected {VERSION})")
+        header = json.loads(bytes(view[16:16 + header_len]))
+        if header["byteorder"] != sys.byteorder:
+            raise SnapshotError("Snapshot was written on a machine with a different byte order")
+
+        self.created_at: float = header["created_at"]
+        self.job_count: int = header["job_count"]
+        self.boards: dict[BoardKey, tuple[int, int]] = {
+            (source, board): (start, end) for source, board, start, end in header["boards"]
+        }
+        fetched_at = header.get("board_fetched_at") or [self.created_at] * len(self.boards)
+        self.fetched_at: dict[BoardKey, float] = dict(zip(self.boards, fetched_at))
+
+        def section(name: str, fmt: Optional[str] = None) -> memoryview:
+            offset, length = header["sections"][name]
+            data = view[offset:offset + length]
+            return data.cast(fmt) if fmt else data
+
+        self._string_offsets = section("string_offsets", "I")
+        self._string_data = section("string_data")
+        self._string_columns = {name: section(name, "I") for name in STRING_FIELDS}
+        self._int_columns = {name: section(name, "i") for name in INT_FIELDS}
+        self._decoded: dict[int, str] = {}
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was written."""
+        return time.time() - self.created_at
+
+    def _string(self, index: int) -> Optional[str]:
+        if index == NO_STRING:
+            return None
+        value = self._decoded.get(index)
+        if value is None:
+            start, end = self._string_offsets[index], self._string_offsets[index + 1]
+            value = self._decoded[index] = str(self._string_data[start:end], "utf-8")
+        return value
+
+    def _rows(self, start: int, end: int) -> list[Job]:
+        jobs = []
+        for row in range(start, end):
+            fields = {name: self._string(column[row]) for name, column in self._string_columns.items()}
+            for name, column in self._int_columns.items():
+                value = column[row]
+                fields[name] = None if value == NO_INT else value
+            # Rows were validated before they were written
+            jobs.append(Job.model_construct(**fields))
+        return jobs
+
+    def board_jobs(self, source: str, board: str) -> Optional[list[Job]]:
+        """Jobs of one board, or None if the board is not in the snapshot."""
+        bounds = self.boards.get((source, board))
+        if bounds is None:
+            return None
+        return self._rows(*bounds)
+
+    def all_jobs(self) -> list[Job]:
+        return self._rows(0, self.job_count)
+
+    def close(self) -> None:
+        # Views must be released before the map can be closed
+        for column in (*self._string_columns.values(), *self._int_columns.values()):
+            column.release()
+        self._string_offsets.release()
+        self._string_data.release()
+        self._view.release()
+        self._mmap.close()
+
+
+# =============================================================================
+# WARM START
+# =============================================================================
+
+class WarmStart:
+    """
+    Serves boards from the snapshot until they have been refreshed live.
+
+    Scrapers ask `board_jobs` before fetching; once the background refresh
+    has fetched a board successfully it is marked refreshed and requests go
+    back to the normal (cached) fetch path.
+    """
+
+    def __init__(self, snapshot: CorpusSnapshot):
+        self.snapshot = snapshot
+        self.refreshed: set[BoardKey] = set()
+
+    def board_jobs(self, source: str, board: str) -> Optional[list[Job]]:
+        if (source, board) in self.refreshed:
+            return None
+        jobs = self.snapshot.board_jobs(source, board)
+        if jobs is not None:
+            CACHE_REQUESTS.inc(cache="snapshot", result="hit")
+        return jobs
+
+    def mark_refreshed(self, source: str, board: str) -> None:
+        self.refreshed.add((source, board))
+
+
+_warm_start: Optional[WarmStart] = None
+
+
+def get_warm_start() -> Optional[WarmStart]:
+    """Active warm start, or None when no snapshot was loaded (or all boards are live)."""
+    return _warm_start
+
+
+def load_warm_start(path: str) -> Optional[WarmStart]:
+    """Memory-map the snapshot at `path` (if present) and serve boards from it."""
+    global _warm_start
+    if not os.path.exists(path):
+        return None
+    try:
+        snapshot = CorpusSnapshot(path)
+    except SnapshotError as e:
+        print(f"Ignoring corpus snapshot: {e}")
+        return None
+    _warm_start = WarmStart(snapshot)
+    print(f"Loaded corpus snapshot: {snapshot.job_count} jobs, {len(snapshot.boards)} boards, "
+          f"{snapshot.age / 60:.0f} min old")
+    return _warm_start
+
+
+async def refresh_corpus(path: str) -> int:
+    """
+    Fetch every board live, mark them refreshed and write a new snapshot.
+
+    Returns:
+        Number of jobs written
+    """
+    # Deferred: the aggregator imports the scrapers, which import this module
+    from services.job_aggregator import JobAggregator
+    from services.cache import CacheError, get_cache
+
+    def on_board(source: str, board: str) -> None:
+        if _warm_start is not None:
+            _warm_start.mark_refreshed(source, board)
+
+    aggregator = JobAggregator(serve_snapshot=False)
+    try:
+        boards = await aggregator.fetch_boards(on_board=on_board)
+    finally:
+        await aggregator.close()
+
+    max_age = get_settings().corpus_snapshot_max_board_age
+    if _warm_start is not None:
+        # Boards never fetched live since startup stay served from the loaded
+        # snapshot until their last live fetch is too old
+        snapshot = _warm_start.snapshot
+        for key in snapshot.boards:
+            if key not in _warm_start.refreshed and time.time() - snapshot.fetched_at[key] > max_age:
+                _warm_start.mark_refreshed(*key)
+
+    # With a shared cache only one worker writes each round
+    try:
+        token = await get_cache().acquire_lock("snapshot:write", get_settings().corpus_snapshot_interval)
+    except CacheError:
+        token = "local"
+    if token is None:
+        return 0
+    written = await asyncio.to_thread(_write_with_carry_over, path, boards, max_age)
+    print(f"Wrote corpus snapshot: {written} jobs, {len(boards)} boards")
+    return written
+
+
+def _write_with_carry_over(path: str, boards: dict[BoardKey, list[Job]], max_age: float) -> int:
+    """
+    Write `boards` (fetched live just now) as the new snapshot at `path`.
+
+    Boards that failed this round are carried over from the previous
+    snapshot at `path`, with their original fetch time, until that fetch
+    is more than `max_age` seconds old.
+    """
+    fetched_at: dict[BoardKey, float] = {}
+    try:
+        previous = CorpusSnapshot(path)
+    except SnapshotError:
+        previous = None
+    if previous is not None:
+        try:
+            now = time.time()
+            for key, at in previous.fetched_at.items():
+                if key not in boards and now - at <= max_age:
+                    boards[key] = previous.board_jobs(*key)
+                    fetched_at[key] = at
+        finally:
+            previous.close()
+    return write_snapshot(path, boards, fetched_at)
+
+
+async def run_snapshot_refresh(path: str, interval: float) -> None:
+    """Refresh boards and rewrite the snapshot every `interval` seconds (background task)."""
+    global _warm_start
+    while True:
+        try:
+            await refresh_corpus(path)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Corpus snapshot refresh failed: {e}")
+        # Boards fetched live from here on; drop the mapping once nothing reads it
+        if _warm_start is not None and _warm_start.refreshed.issuperset(_warm_start.snapshot.boards):
+            _warm_start.snapshot.close()
+            _warm_start = None
+        await asyncio.sleep(interval)
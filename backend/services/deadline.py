@@ -0,0 +1,57 @@
+"""Request deadline - a shared time budget for one analyze request."""
+
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    Absolute deadline for a request, split into per-stage budgets.
+
+    Created once per request and passed down the pipeline so every stage
+    (profile expansion, board fetching, ranking) works against the same
+    clock instead of its own independent timeout.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + timeout
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        """Seconds since the deadline was created."""
+        return time.monotonic() - self.started_at
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def stage_budget(self, share: float) -> float:
+        """
+        Budget for a stage that may use `share` of the total timeout.
+
+        Capped by the time actually remaining, so a slow earlier stage
+        shrinks the budget of the later ones rather than overrunning.
+        """
+        return min(self.timeout * share, self.remaining())
+
+
+def resolve_timeout(requested: Optional[float], default: float, maximum: float) -> float:
+    """
+    Resolve the effective request timeout.
+
+    Args:
+        requested: Timeout asked for by the client (optional)
+        default: Server default when the client does not ask
+        maximum: Server-side cap applied to any client value
+
+    Returns:
+        Timeout in seconds
+    """
+    if requested is None or requested <= 0:
+        return min(default, maximum)
+    return min(requested, maximum)
@@ -0,0 +1,232 @@
+"""Profile filters compiled into one fused pass over the corpus.
+
+`JobAggregator.filter_jobs` used to copy the corpus through one list per
+filter (keywords, location, experience, salary), then deduplicate, then
+sort by location bucket, lower-casing titles and locations and resolving
+location aliases again in each pass. A FilterPlan does the per-profile
+work once at compile time (alias resolution, keyword words, experience
+keyword sets, term lists turned into single regexes)
+and then evaluates every job in a single loop:
+
+- checks run cheapest first (salary, location, experience, keywords), so
+  most rejected jobs never reach the expensive title scans
+- each job's title and location are lower-cased at most once
+- survivors are deduplicated and appended to their location bucket in
+  the same loop; concatenating the buckets gives the location sort
+
+The result is identical to running the filters one after another.
+"""
+
+import re
+from collections import Counter
+from typing import Callable, Optional, Pattern
+
+from api.schemas import Job
+from services.experience_extractor import is_experience_match
+from services.salary_extractor import is_salary_match
+from services.metrics import STAGE_LATENCY, JOBS_FILTERED, JOBS_DEDUPED
+
+
+# Location buckets for the preference sort (lower = better)
+INDIA_TERMS = {'india', 'bengaluru', 'bangalore', 'hyderabad', 'mumbai', 'pune', 'chennai', 'delhi', 'gurgaon', 'noida', 'kolkata'}
+EUROPE_TERMS = {'uk', 'london', 'berlin', 'germany', 'amsterdam', 'netherlands', 'paris', 'france', 'dublin', 'ireland', 'stockholm', 'sweden', 'zurich', 'switzerland', 'europe', 'barcelona', 'spain', 'lisbon', 'portugal'}
+US_TERMS = {'usa', 'united states', 'san francisco', 'new york', 'seattle', 'austin', 'boston', 'los angeles', 'denver', 'chicago', 'california', 'ca', 'ny', 'wa', 'tx'}
+REMOTE_TERMS = {'remote', 'anywhere', 'distributed', 'work from home', 'wfh'}
+REMOTE_ONLY_LOCATIONS = ['remote', 'anywhere', 'wfh', 'work from home']
+INDIA_CITIES = ['bengaluru', 'hyderabad', 'mumbai', 'delhi', 'pune', 'chennai']
+LOCATION_BUCKETS = 7
+
+
+def any_of(terms) -> Optional[Pattern[str]]:
+    """One regex matching if any term occurs as a substring (None for no terms)."""
+    terms = sorted(set(terms))
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(term) for term in terms))
+
+
+def resolve_location_terms(location: str, aliases: dict[str, list[str]]) -> set[str]:
+    """Terms a job location must contain to match the preferred location."""
+    location_lower = location.lower().strip()
+    match_terms = set()
+    for canonical, names in aliases.items():
+        if any(alias in location_lower for alias in names):
+            match_terms.update(names)
+            # If searching for a city in India, also add "india"
+            if canonical in INDIA_CITIES:
+                match_terms.add('india')
+    return match_terms or {location_lower}
+
+
+class FilterPlan:
+    """
+    One profile's filters, compiled for a single pass.
+
+    Build with `JobAggregator.compile_plan`; `run` filters, deduplicates
+    and location-sorts jobs in one loop.
+    """
+
+    def __init__(
+        self,
+        keyword_words: Optional[set[str]] = None,
+        exclude_terms: Optional[set[str]] = None,
+        software_terms: Optional[set[str]] = None,
+        generic_role_terms: Optional[list[str]] = None,
+        title_split: Optional[Pattern[str]] = None,
+        location: Optional[str] = None,
+        location_aliases: Optional[dict[str, list[str]]] = None,
+        experience: Optional[tuple[int, set[str], set[str], set[str]]] = None,
+        salary: Optional[tuple[int, float]] = None,
+    ):
+        # Keywords: None = no keyword filter
+        self.keyword_words = keyword_words
+        if keyword_words is not None:
+            self._exclude = any_of(exclude_terms)
+            self._software = any_of(software_terms)
+            self._generic = any_of(generic_role_terms)
+            self._title_split = title_split
+
+        # Location: preferred terms resolved once, shared by filter and sort
+        self.location = location
+        if location:
+            location_lower = location.lower().strip()
+            self._remote_only = location_lower in REMOTE_ONLY_LOCATIONS
+            self._preferred = any_of(resolve_location_terms(location, location_aliases))
+            self._india = any_of(INDIA_TERMS)
+            self._europe = any_of(EUROPE_TERMS)
+            self._us = any_of(US_TERMS)
+            self._remote = any_of(REMOTE_TERMS)
+
+        # Experience: (user years, valid title keywords, too-senior keywords, all level keywords)
+        self.experience = experience
+        if experience is not None:
+            self._user_exp, valid, too_senior, indicators = experience
+            self._valid_levels = any_of(valid)
+            self._too_senior = any_of(too_senior)
+            self._level_indicator = any_of(indicators)
+
+        # Salary: (expected annual USD, tolerance), checked by is_salary_match
+        self.salary = salary
+
+    def location_priority(self, job_location: str) -> int:
+        """Location bucket of a lower-cased job location (see `JobAggregator.location_priority_key`)."""
+        if self._preferred.search(job_location):
+            return 0
+        if self._india.search(job_location):
+            return 1
+        if self._europe.search(job_location):
+            return 2
+        if self._us.search(job_location):
+            return 3
+        if self._remote.search(job_location):
+            return 4
+        if not job_location.strip():
+            return 5
+        return 6
+
+    def priority_key(self) -> Callable[[Job], int]:
+        """Job -> location bucket, for callers that order candidates themselves."""
+        return lambda job: self.location_priority((job.location or '').lower())
+
+    def run(
+        self,
+        jobs: list[Job],
+        seen: Optional[set[tuple[str, str]]] = None,
+        sort: bool = True,
+    ) -> list[Job]:
+        """
+        Filter, deduplicate and (with a location and `sort`) bucket-sort jobs.
+
+        `seen` carries dedupe keys across calls and is updated in place.
+        """
+        if seen is None:
+            seen = set()
+        keyword_words = self.keyword_words
+        location = self.location
+        experience = self.experience
+        salary = self.salary
+        bucketed = bool(location) and sort
+        buckets: list[list[Job]] = [[] for _ in range(LOCATION_BUCKETS if bucketed else 1)]
+        removed: Counter = Counter()
+
+        with STAGE_LATENCY.time(stage="filter_plan"):
+            for job in jobs:
+                # Cheapest first: most jobs state no salary
+                if (
+                    salary is not None and job.salary_max is not None
+                    and not is_salary_match(salary[0], job.salary_max, salary[1])
+                ):
+                    removed["filter_salary", job.source] += 1
+                    continue
+
+                job_location = None
+                if location:
+                    job_location = (job.location or '').lower()
+                    is_remote = self._remote.search(job_location) is not None
+                    no_location = not job_location.strip()
+                    if self._remote_only:
+                        keep = is_remote or no_location
+                    else:
+                        keep = is_remote or no_location or self._preferred.search(job_location) is not None
+                    if not keep:
+                        removed["filter_location", job.source] += 1
+                        continue
+
+                title_lower = None
+                if experience is not None:
+                    if job.required_experience_min is not None:
+                        keep = is_experience_match(
+                            user_experience=self._user_exp,
+                            required_min=job.required_experience_min,
+                            required_max=job.required_experience_max,
+                            buffer_years=1,
+                        )
+                    else:
+                        title_lower = job.title.lower()
+                        if self._too_senior is not None and self._too_senior.search(title_lower):
+                            keep = False
+                        elif not self._level_indicator.search(title_lower):
+                            keep = True
+                        else:
+                            keep = self._valid_levels is not None and self._valid_levels.search(title_lower) is not None
+                    if not keep:
+                        removed["filter_experience", job.source] += 1
+                        continue
+
+                if keyword_words is not None:
+                    if title_lower is None:
+                        title_lower = job.title.lower()
+                    keep = (
+                        not self._exclude.search(title_lower)
+                        and self._software.search(title_lower) is not None
+                        and (
+                            not keyword_words.isdisjoint(self._title_split.split(title_lower))
+                            or self._generic.search(title_lower) is not None
+                        )
+                    )
+                    if not keep:
+                        removed["filter_keywords", job.source] += 1
+                        continue
+
+                if title_lower is None:
+                    title_lower = job.title.lower()
+                key = (title_lower.strip(), job.company.lower().strip())
+                if key in seen:
+                    removed["deduplicate", job.source] += 1
+                    continue
+                seen.add(key)
+
+                if bucketed:
+                    buckets[self.location_priority(job_location)].append(job)
+                else:
+                    buckets[0].append(job)
+
+        for (stage, source), count in removed.items():
+            if stage == "deduplicate":
+                JOBS_DEDUPED.inc(count, source=source)
+            else:
+                JOBS_FILTERED.inc(count, source=source, stage=stage)
+
+        if len(buckets) == 1:
+            return buckets[0]
+        return [job for bucket in buckets for job in bucket]
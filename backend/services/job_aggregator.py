@@ -1,12 +1,20 @@
 """Job aggregator service - combines jobs from multiple sources."""
 
 import re
-from typing import Optional
+import asyncio
+from typing import Callable, NamedTuple, Optional
 from api.schemas import Job
+from scrapers.base_scraper import BaseScraper
 from scrapers.greenhouse import GreenhouseScraper
 from scrapers.lever import LeverScraper
-from services.experience_extractor import is_experience_match
-from config import GREENHOUSE_COMPANIES, LEVER_COMPANIES
+from scrapers.ashby import AshbyScraper
+from scrapers.workable import WorkableScraper
+from scrapers.smartrecruiters import SmartRecruitersScraper
+from services.filter_plan import FilterPlan
+from config import (
+    GREENHOUSE_COMPANIES, LEVER_COMPANIES, ASHBY_COMPANIES, WORKABLE_COMPANIES,
+    SMARTRECRUITERS_COMPANIES, get_settings,
+)
 
 
 # Experience level keywords mapping
@@ -62,180 +70,198 @@ EXCLUDE_TERMS = {
     'customer success', 'customer support', 'receptionist', 'administrative',
 }
 
+# Keyword matching: titles and keywords are split into words on these
+TITLE_SPLIT = re.compile(r'[\s,/\-]+')
+KEYWORD_STOP_WORDS = {'a', 'an', 'the', 'and', 'or', 'at', 'in', 'on', 'for', 'to', 'of', 'i', 'ii', 'iii', 'iv', 'v'}
+
+# Software roles kept even without a keyword match
+GENERIC_ROLE_TERMS = ['engineer', 'developer', 'sde', 'swe', 'programmer']
+
+
+def extract_keyword_words(keywords: list[str]) -> set[str]:
+    """Individual match words from target titles/keywords (stop words and short words dropped)."""
+    keyword_words = set()
+    for kw in keywords:
+        words = TITLE_SPLIT.split(kw.lower())
+        keyword_words.update(w for w in words if len(w) > 2 and w not in KEYWORD_STOP_WORDS)
+    return keyword_words
+
+
+# Job sources and their configured boards, in fetch order
+SOURCES: list[tuple[type[BaseScraper], list[str]]] = [
+    (GreenhouseScraper, GREENHOUSE_COMPANIES),
+    (LeverScraper, LEVER_COMPANIES),
+    (AshbyScraper, ASHBY_COMPANIES),
+    (WorkableScraper, WORKABLE_COMPANIES),
+    (SmartRecruitersScraper, SMARTRECRUITERS_COMPANIES),
+]
+
+
+class FetchResult(NamedTuple):
+    """Jobs plus per-board outcome of a fetch."""
+    jobs: list[Job]
+    companies_searched: list[str]
+    companies_failed: list[str]
+    companies_timed_out: list[str]
+    companies_skipped: list[str]
+
 
 class JobAggregator:
     """Aggregates jobs from multiple sources and handles deduplication."""
     
-    def __init__(self):
-        self.greenhouse_scraper = GreenhouseScraper()
-        self.lever_scraper = LeverScraper()
-        self._preferred_location = None
+    def __init__(self, serve_snapshot: bool = True):
+        self.sources: list[tuple[BaseScraper, list[str]]] = [
+            (scraper_class(), companies) for scraper_class, companies in SOURCES
+        ]
+        # The corpus refresher must fetch live instead of reading the snapshot
+        for scraper, _ in self.sources:
+            scraper.serve_snapshot = serve_snapshot
     
-    async def fetch_all_jobs(
+    async def fetch_raw_jobs(
         self,
         target_companies: Optional[list[str]] = None,
-        keywords: Optional[list[str]] = None,
-        location: Optional[str] = None,
-        years_of_experience: Optional[int] = None,
-        seniority_level: Optional[str] = None,
-    ) -> tuple[list[Job], list[str]]:
+        timeout: Optional[float] = None,
+        on_board: Optional[Callable[[str, list[Job]], None]] = None,
+        board_order: Optional[Callable[[list[str]], list[str]]] = None,
+        stop: Optional[asyncio.Event] = None,
+    ) -> FetchResult:
         """
-        Fetch jobs from all sources with filtering.
+        Fetch unfiltered jobs from all sources.
+        
+        Needs nothing from the expanded profile, so it can run while the
+        profile is still being expanded; apply `filter_jobs` afterwards.
+        `on_board(company, jobs)` is called as each board completes, for
+        callers that process boards as a stream. `board_order` reorders
+        each source's boards (highest priority first), and setting `stop`
+        cancels the boards still loading (reported as skipped).
         """
-        self._preferred_location = location
         all_jobs: list[Job] = []
         companies_searched: list[str] = []
+        companies_failed: list[str] = []
+        companies_timed_out: list[str] = []
+        companies_skipped: list[str] = []
         
-        # Determine which companies to search
+        # Determine which companies to search on each source
         if target_companies:
-            target_lower = [c.lower() for c in target_companies]
-            gh_companies = [c for c in GREENHOUSE_COMPANIES if c.lower() in target_lower]
-            lv_companies = [c for c in LEVER_COMPANIES if c.lower() in target_lower]
+            target_lower = {c.lower() for c in target_companies}
+            selected = [
+                [c for c in companies if c.lower() in target_lower] for _, companies in self.sources
+            ]
         else:
-            gh_companies = GREENHOUSE_COMPANIES
-            lv_companies = LEVER_COMPANIES
-        
-        # Fetch from Greenhouse
-        if gh_companies:
-            gh_jobs = await self.greenhouse_scraper.fetch_jobs(gh_companies, keywords=None)
-            all_jobs.extend(gh_jobs)
-            companies_searched.extend(gh_companies)
-        
-        # Fetch from Lever
-        if lv_companies:
-            lv_jobs = await self.lever_scraper.fetch_jobs(lv_companies, keywords=None)
-            all_jobs.extend(lv_jobs)
-            companies_searched.extend(lv_companies)
-        
-        # Apply filters
-        filtered_jobs = all_jobs
-        
-        # Filter by keywords (software-focused matching)
-        if keywords:
-            filtered_jobs = self._filter_by_keywords(filtered_jobs, keywords)
-        
-        # Filter by location
-        if location:
-            filtered_jobs = self._filter_by_location(filtered_jobs, location)
-        
-        # Filter by experience/seniority
-        if years_of_experience is not None or seniority_level:
-            filtered_jobs = self._filter_by_experience(
-                filtered_jobs, years_of_experience, seniority_level
-            )
-        
-        # Deduplicate jobs
-        deduplicated_jobs = self._deduplicate_jobs(filtered_jobs)
-        
-        # Sort by location preference (preferred location first, then remote)
-        if location:
-            deduplicated_jobs = self._sort_by_location_preference(deduplicated_jobs, location)
-        
-        return deduplicated_jobs, companies_searched
+            selected = [companies for _, companies in self.sources]
+        if board_order is not None:
+            selected = [board_order(companies) for companies in selected]
+        
+        # Fetch from every source under the same time budget
+        results = await asyncio.gather(*(
+            scraper.fetch_companies(companies, timeout=timeout, on_result=on_board, stop=stop)
+            for (scraper, _), companies in zip(self.sources, selected)
+        ))
+        for companies, (jobs, failed, timed_out, skipped) in zip(selected, results):
+            all_jobs.extend(jobs)
+            companies_searched.extend(companies)
+            companies_failed.extend(failed)
+            companies_timed_out.extend(timed_out)
+            companies_skipped.extend(skipped)
+        
+        return FetchResult(
+            jobs=all_jobs,
+            companies_searched=companies_searched,
+            companies_failed=companies_failed,
+            companies_timed_out=companies_timed_out,
+            companies_skipped=companies_skipped,
+        )
     
-    def _filter_by_keywords(self, jobs: list[Job], keywords: list[str]) -> list[Job]:
+    async def fetch_boards(
+        self,
+        timeout: Optional[float] = None,
+        on_board: Optional[Callable[[str, str], None]] = None,
+    ) -> dict[tuple[str, str], list[Job]]:
         """
-        Filter jobs by keywords with software-focused matching.
+        Fetch every configured board, keyed by (source, board slug).
         
-        A job matches if:
-        1. It contains software-related terms AND
-        2. It matches any keyword word AND
-        3. It does NOT contain excluded terms (non-software engineering)
+        Used to build corpus snapshots; failed and timed-out boards are
+        left out. `on_board(source, board)` is called as each succeeds.
         """
-        if not keywords:
-            return jobs
+        boards: dict[tuple[str, str], list[Job]] = {}
         
-        # Extract individual words from all keywords
-        keyword_words = set()
-        for kw in keywords:
-            words = re.split(r'[\s,/\-]+', kw.lower())
-            stop_words = {'a', 'an', 'the', 'and', 'or', 'at', 'in', 'on', 'for', 'to', 'of', 'i', 'ii', 'iii', 'iv', 'v'}
-            keyword_words.update(w for w in words if len(w) > 2 and w not in stop_words)
-        
-        filtered = []
-        for job in jobs:
-            title_lower = job.title.lower()
-            title_words = set(re.split(r'[\s,/\-]+', title_lower))
-            
-            # Check if job contains EXCLUDED terms (non-software)
-            has_excluded = any(term in title_lower for term in EXCLUDE_TERMS)
-            if has_excluded:
-                continue
+        async def fetch_source(scraper, companies: list[str]) -> None:
+            source = scraper.get_source_name()
             
-            # Check if job is software-related
-            is_software_related = any(term in title_lower for term in SOFTWARE_TERMS)
+            def collect(company: str, jobs: list[Job]) -> None:
+                boards[(source, company)] = jobs
+                if on_board is not None:
+                    on_board(source, company)
             
-            # Check if any keyword word matches
-            has_keyword_match = bool(keyword_words & title_words)
-            
-            # Include if:
-            # 1. Has keyword match AND is software-related, OR
-            # 2. Is clearly a software role (sde, developer, etc.)
-            if has_keyword_match and is_software_related:
-                filtered.append(job)
-            elif is_software_related and any(term in title_lower for term in ['engineer', 'developer', 'sde', 'swe', 'programmer']):
-                # Include generic software roles
-                filtered.append(job)
+            await scraper.fetch_companies(companies, timeout=timeout, on_result=collect)
         
-        return filtered
+        await asyncio.gather(*(
+            fetch_source(scraper, companies) for scraper, companies in self.sources
+        ))
+        return boards
     
-    def _filter_by_location(self, jobs: list[Job], preferred_location: str) -> list[Job]:
-        """
-        Filter jobs by location with fuzzy matching.
+    def filter_jobs(
+        self,
+        jobs: list[Job],
+        keywords: Optional[list[str]] = None,
+        location: Optional[str] = None,
+        years_of_experience: Optional[int] = None,
+        seniority_level: Optional[str] = None,
+        expected_salary: Optional[int] = None,
+        seen: Optional[set[tuple[str, str]]] = None,
+        sort: bool = True,
+    ) -> list[Job]:
         """
-        if not preferred_location:
-            return jobs
-        
-        location_lower = preferred_location.lower().strip()
-        
-        # Check if user wants remote only
-        is_remote_only = location_lower in ['remote', 'anywhere', 'wfh', 'work from home']
-        
-        # Find matching location aliases
-        match_terms = set()
-        for canonical, aliases in LOCATION_ALIASES.items():
-            if any(alias in location_lower for alias in aliases):
-                match_terms.update(aliases)
-                # If searching for a city in India, also add "india"
-                if canonical in ['bengaluru', 'hyderabad', 'mumbai', 'delhi', 'pune', 'chennai']:
-                    match_terms.add('india')
+        Filter, deduplicate and location-sort fetched jobs.
         
-        # If no specific location found, use the input directly
-        if not match_terms:
-            match_terms = {location_lower}
-        
-        # Remote terms - always include remote jobs
-        remote_terms = {'remote', 'anywhere', 'distributed', 'work from home', 'wfh'}
-        
-        filtered = []
-        for job in jobs:
-            job_location = (job.location or '').lower()
-            
-            # Check if job is remote
-            is_remote = any(term in job_location for term in remote_terms)
-            
-            # Check if job matches preferred location
-            matches_preferred = any(term in job_location for term in match_terms)
-            
-            # Check if job has no location (might be remote)
-            no_location = not job_location or job_location.strip() == ''
-            
-            if is_remote_only:
-                # Only include remote jobs
-                if is_remote or no_location:
-                    filtered.append(job)
-            else:
-                # Include preferred location + remote
-                if matches_preferred or is_remote or no_location:
-                    filtered.append(job)
+        Pass the same `seen` set across calls to deduplicate a stream of
+        boards incrementally; `sort=False` skips the location sort when the
+        caller merges results itself.
+        """
+        plan = self.compile_plan(keywords, location, years_of_experience, seniority_level, expected_salary)
+        return plan.run(jobs, seen=seen, sort=sort)
+    
+    def compile_plan(
+        self,
+        keywords: Optional[list[str]] = None,
+        location: Optional[str] = None,
+        years_of_experience: Optional[int] = None,
+        seniority_level: Optional[str] = None,
+        expected_salary: Optional[int] = None,
+    ) -> FilterPlan:
+        """
+        Compile a profile's filters into a single-pass FilterPlan.
         
-        return filtered
+        Build it once per profile and run it over each board or the whole
+        corpus; every filter left as None is skipped.
+        """
+        experience = None
+        if years_of_experience is not None or seniority_level:
+            valid, too_senior = self._experience_keywords(years_of_experience, seniority_level)
+            indicators = {kw for level_keywords in EXPERIENCE_KEYWORDS.values() for kw in level_keywords}
+            experience = (years_of_experience or 0, valid, too_senior, indicators)
+        
+        salary = None
+        if expected_salary:
+            salary = (expected_salary, get_settings().salary_filter_tolerance)
+        
+        return FilterPlan(
+            keyword_words=extract_keyword_words(keywords) if keywords else None,
+            exclude_terms=EXCLUDE_TERMS,
+            software_terms=SOFTWARE_TERMS,
+            generic_role_terms=GENERIC_ROLE_TERMS,
+            title_split=TITLE_SPLIT,
+            location=location,
+            location_aliases=LOCATION_ALIASES,
+            experience=experience,
+            salary=salary,
+        )
     
-    def _sort_by_location_preference(self, jobs: list[Job], preferred_location: str) -> list[Job]:
+    def location_priority_key(self, preferred_location: str) -> Callable[[Job], int]:
         """
-        Sort jobs by location priority (PRIMARY).
+        Build the location priority function used for the location sort.
         
-        Priority order:
+        Priority order (lower = better):
         0. Preferred location (exact match)
         1. India
         2. Europe
@@ -244,69 +270,18 @@ class JobAggregator:
         5. No location
         6. Others
         """
-        location_lower = preferred_location.lower().strip()
-        
-        # Find matching location aliases for preferred location
-        match_terms = set()
-        for canonical, aliases in LOCATION_ALIASES.items():
-            if any(alias in location_lower for alias in aliases):
-                match_terms.update(aliases)
-                if canonical in ['bengaluru', 'hyderabad', 'mumbai', 'delhi', 'pune', 'chennai']:
-                    match_terms.add('india')
-        
-        if not match_terms:
-            match_terms = {location_lower}
-        
-        # Location categories
-        india_terms = {'india', 'bengaluru', 'bangalore', 'hyderabad', 'mumbai', 'pune', 'chennai', 'delhi', 'gurgaon', 'noida', 'kolkata'}
-        europe_terms = {'uk', 'london', 'berlin', 'germany', 'amsterdam', 'netherlands', 'paris', 'france', 'dublin', 'ireland', 'stockholm', 'sweden', 'zurich', 'switzerland', 'europe', 'barcelona', 'spain', 'lisbon', 'portugal'}
-        us_terms = {'usa', 'united states', 'san francisco', 'new york', 'seattle', 'austin', 'boston', 'los angeles', 'denver', 'chicago', 'california', 'ca', 'ny', 'wa', 'tx'}
-        remote_terms = {'remote', 'anywhere', 'distributed', 'work from home', 'wfh'}
-        
-        def get_location_priority(job: Job) -> int:
-            job_location = (job.location or '').lower()
-            
-            # Priority 0: Exact preferred location match
-            if any(term in job_location for term in match_terms):
-                return 0
-            # Priority 1: India jobs
-            if any(term in job_location for term in india_terms):
-                return 1
-            # Priority 2: Europe jobs
-            if any(term in job_location for term in europe_terms):
-                return 2
-            # Priority 3: US jobs
-            if any(term in job_location for term in us_terms):
-                return 3
-            # Priority 4: Remote jobs
-            if any(term in job_location for term in remote_terms):
-                return 4
-            # Priority 5: No location specified
-            if not job_location.strip():
-                return 5
-            # Priority 6: Other locations
-            return 6
-        
-        return sorted(jobs, key=get_location_priority)
+        return FilterPlan(location=preferred_location, location_aliases=LOCATION_ALIASES).priority_key()
     
-    def _filter_by_experience(
-        self, 
-        jobs: list[Job], 
-        years_of_experience: Optional[int],
-        seniority_level: Optional[str]
-    ) -> list[Job]:
+    @staticmethod
+    def _experience_keywords(
+        years_of_experience: Optional[int], seniority_level: Optional[str]
+    ) -> tuple[set[str], set[str]]:
         """
-        Filter jobs by experience level.
+        Title keywords for the experience fallback heuristics.
         
-        Uses two approaches:
-        1. Extracted experience requirements from job descriptions (primary)
-        2. Title-based heuristics (fallback)
+        Returns:
+            Tuple of (keywords of appropriate levels, keywords of levels too senior)
         """
-        if years_of_experience is None and not seniority_level:
-            return jobs
-        
-        user_exp = years_of_experience or 0
-        
         # Title-based heuristics for fallback
         appropriate_levels = set()
         if years_of_experience is not None:
@@ -338,66 +313,14 @@ class JobAggregator:
         if years_of_experience is not None and years_of_experience < 4:
             too_senior_keywords.update(EXPERIENCE_KEYWORDS.get('senior', []))
         
-        filtered = []
-        for job in jobs:
-            # PRIMARY CHECK: Use extracted experience requirements from description
-            if job.required_experience_min is not None:
-                # Check if user qualifies based on extracted requirements
-                if is_experience_match(
-                    user_experience=user_exp,
-                    required_min=job.required_experience_min,
-                    required_max=job.required_experience_max,
-                    buffer_years=1  # Allow 1 year flexibility only
-                ):
-                    filtered.append(job)
-                # Skip jobs that require too much experience
-                continue
-            
-            # FALLBACK: Use title-based heuristics if no extracted requirements
-            title_lower = job.title.lower()
-            
-            is_too_senior = any(kw in title_lower for kw in too_senior_keywords)
-            
-            has_level_indicator = any(
-                any(kw in title_lower for kw in keywords)
-                for keywords in EXPERIENCE_KEYWORDS.values()
-            )
-            
-            if is_too_senior:
-                continue
-            elif not has_level_indicator:
-                filtered.append(job)
-            elif any(kw in title_lower for kw in valid_keywords):
-                filtered.append(job)
-        
-        return filtered
-    
-    def _deduplicate_jobs(self, jobs: list[Job]) -> list[Job]:
-        """Remove duplicate jobs based on title + company combination."""
-        seen = set()
-        unique_jobs = []
-        
-        for job in jobs:
-            key = (
-                job.title.lower().strip(),
-                job.company.lower().strip()
-            )
-            
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
-        
-        return unique_jobs
+        return valid_keywords, too_senior_keywords
     
     async def close(self):
         """Close all scraper connections."""
-        await self.greenhouse_scraper.close()
-        await self.lever_scraper.close()
+        for scraper, _ in self.sources:
+            await scraper.close()
     
     @staticmethod
     def get_available_companies() -> dict[str, list[str]]:
         """Get list of available companies by source."""
-        return {
-            "greenhouse": GREENHOUSE_COMPANIES,
-            "lever": LEVER_COMPANIES
-        }
+        return {scraper_class.SOURCE: companies for scraper_class, companies in SOURCES}
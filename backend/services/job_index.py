@@ -0,0 +1,92 @@
+"""Shared job corpus indexed for filtering many profiles."""
+
+from typing import Optional
+
+from api.schemas import Job
+from services.job_aggregator import (
+    JobAggregator, EXCLUDE_TERMS, SOFTWARE_TERMS, GENERIC_ROLE_TERMS, TITLE_SPLIT,
+    extract_keyword_words,
+)
+from services.metrics import STAGE_LATENCY
+
+
+class JobIndex:
+    """
+    One fetched corpus prepared for repeated per-profile filtering.
+
+    Work that does not depend on the profile (lower-casing titles, the
+    software/exclude term scans, a title-word -> jobs index) is done once
+    when the index is built, so the keyword filter is a posting-list
+    lookup. The jobs it selects then go through the profile's compiled
+    FilterPlan for the location, experience and salary filters, dedupe and
+    the location sort, in one pass over only those jobs.
+
+    `filter` returns the same jobs, in the same order, as
+    `JobAggregator.filter_jobs` would for that profile.
+    """
+
+    def __init__(self, aggregator: JobAggregator, jobs: list[Job]):
+        self.aggregator = aggregator
+        self.jobs = jobs
+        self._companies = [job.company.lower() for job in jobs]
+
+        # Keyword filter inputs: software titles without excluded terms
+        self._generic: set[int] = set()
+        self._postings: dict[str, list[int]] = {}
+        for i, job in enumerate(jobs):
+            title_lower = job.title.lower()
+            if any(term in title_lower for term in EXCLUDE_TERMS):
+                continue
+            if not any(term in title_lower for term in SOFTWARE_TERMS):
+                continue
+            if any(term in title_lower for term in GENERIC_ROLE_TERMS):
+                self._generic.add(i)
+            for word in set(TITLE_SPLIT.split(title_lower)):
+                self._postings.setdefault(word, []).append(i)
+
+    def filter(
+        self,
+        keywords: Optional[list[str]] = None,
+        location: Optional[str] = None,
+        years_of_experience: Optional[int] = None,
+        seniority_level: Optional[str] = None,
+        companies: Optional[list[str]] = None,
+        expected_salary: Optional[int] = None,
+    ) -> list[Job]:
+        """
+        Filter, deduplicate and location-sort the corpus for one profile.
+
+        Args:
+            keywords: Target titles
+            location: Preferred location
+            years_of_experience: Candidate experience
+            seniority_level: Expanded seniority level
+            companies: Restrict to these board slugs (a profile's target companies)
+            expected_salary: Candidate's expected salary (USD)
+        """
+        with STAGE_LATENCY.time(stage="index_filter"):
+            ids: Optional[set[int]] = None
+            if keywords:
+                ids = self._keyword_ids(keywords)
+            if companies:
+                wanted = {company.lower().replace("-", " ") for company in companies}
+                ids = _intersect(ids, {i for i, name in enumerate(self._companies) if name in wanted})
+
+            jobs = [self.jobs[i] for i in sorted(ids)] if ids is not None else self.jobs
+            plan = self.aggregator.compile_plan(
+                location=location,
+                years_of_experience=years_of_experience,
+                seniority_level=seniority_level,
+                expected_salary=expected_salary,
+            )
+            return plan.run(jobs)
+
+    def _keyword_ids(self, keywords: list[str]) -> set[int]:
+        ids = set(self._generic)
+        for word in extract_keyword_words(keywords):
+            ids.update(self._postings.get(word, ()))
+        return ids
+
+
+def _intersect(ids: Optional[set[int]], other: set[int]) -> set[int]:
+    return set(other) if ids is None else ids & other
@@ -0,0 +1,224 @@
+"""Event-loop lag monitor and stall detector.
+
+CPU work inside coroutines (JSON decoding, regex extraction, sorting,
+pydantic construction) blocks the event loop, delaying every other
+request on the worker. Two probes make that visible:
+
+- a lag sampler task sleeps for `interval` and records how late it woke
+  up (the time the loop spent on other callbacks)
+- a watchdog thread posts a no-op to the loop and, if it is not run within
+  `stall_threshold`, samples the loop thread's stack until it is; the
+  stall is attributed to the innermost application frame seen most often
+  (e.g. `scrapers/greenhouse.py:fetch_company_jobs`)
+
+Lag and stalls are recorded in the metrics registry, and the recent
+history is available from `/api/debug/loop`.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from types import FrameType
+from typing import Optional
+
+from config import get_settings
+from services.metrics import LOOP_LAG, LOOP_STALLS, LOOP_STALL_DURATION
+
+
+# Frames under this directory (outside installed packages) are application code
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STACK_DEPTH = 20
+
+
+def _site(frame: FrameType) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(APP_ROOT):
+        path = os.path.relpath(path, APP_ROOT)
+    return f"{path}:{code.co_name}"
+
+
+def _is_app(frame: FrameType) -> bool:
+    """Named application function (comprehensions and lambdas count as their caller)."""
+    code = frame.f_code
+    path = code.co_filename
+    return (
+        path.startswith(APP_ROOT) and "site-packages" not in path and path != __file__
+        and not code.co_name.startswith("<")
+    )
+
+
+def _describe(frame: FrameType) -> tuple[str, tuple[str, ...]]:
+    """(innermost application frame, innermost-last stack) of a sampled frame."""
+    stack = []
+    culprit = None
+    while frame is not None:
+        if culprit is None and _is_app(frame):
+            culprit = _site(frame)
+        stack.append(f"{_site(frame)}:{frame.f_lineno}")
+        frame = frame.f_back
+    return culprit or stack[0].rsplit(":", 1)[0], tuple(reversed(stack[:STACK_DEPTH]))
+
+
+class LoopMonitor:
+    """Lag sampler plus stall watchdog for one event loop (see module docstring)."""
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        stall_threshold: float = 0.1,
+        sample_interval: float = 0.005,
+        history: int = 50,
+    ):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.sample_interval = sample_interval
+        self._lags: deque[float] = deque(maxlen=max(1, int(60 / interval)))  # About a minute
+        self._stalls: deque[dict] = deque(maxlen=history)
+        self._by_function: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None and not self._sampler.done()
+
+    def start(self) -> None:
+        """Start both probes; call from the event loop thread."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = asyncio.create_task(self._sample_lag())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.cancel()
+            await asyncio.gather(self._sampler, return_exceptions=True)
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+
+    async def _sample_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            LOOP_LAG.observe(lag)
+            with self._lock:
+                self._lags.append(lag)
+
+    def _watch(self) -> None:
+        while not self._stop.is_set():
+            served = threading.Event()
+            posted = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(served.set)
+            except RuntimeError:
+                return  # Loop closed
+            if served.wait(self.stall_threshold):
+                self._stop.wait(self.interval)
+                continue
+
+            # Blocked: sample the loop thread until it gets back to the queue
+            samples: Counter[tuple[str, tuple[str, ...]]] = Counter()
+            while True:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    samples[_describe(frame)] += 1
+                del frame
+                if served.wait(self.sample_interval) or self._stop.is_set():
+                    break
+            self._record(time.perf_counter() - posted, samples)
+
+    def _record(self, duration: float, samples: Counter) -> None:
+        culprits = Counter()
+        for (culprit, _), count in samples.items():
+            culprits[culprit] += count
+        function = culprits.most_common(1)[0][0] if culprits else "unknown"
+        stack = max(
+            (stack for (culprit, stack) in samples if culprit == function),
+            key=lambda stack: samples[(function, stack)],
+            default=(),
+        )
+
+        LOOP_STALLS.inc(function=function)
+        LOOP_STALL_DURATION.observe(duration)
+        with self._lock:
+            totals = self._by_function.setdefault(function, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            totals["count"] += 1
+            totals["total_seconds"] += duration
+            totals["max_seconds"] = max(totals["max_seconds"], duration)
+            self._stalls.append({
+                "at": time.time(),
+                "duration_seconds": round(duration, 4),
+                "function": function,
+                "samples": sum(samples.values()),
+                "stack": list(stack),
+            })
+
+    def snapshot(self) -> dict:
+        """Recent lag summary and stalls, for the debug route."""
+        with self._lock:
+            last = self._lags[-1] if self._lags else None
+            lags = sorted(self._lags)
+            stalls = list(self._stalls)
+            by_function = {name: dict(totals) for name, totals in self._by_function.items()}
+
+        lag = {"samples": len(lags)}
+        if lags:
+            lag.update({
+                "last_seconds": last,
+                "mean_seconds": sum(lags) / len(lags),
+                "p99_seconds": lags[min(len(lags) - 1, int(len(lags) * 0.99))],
+                "max_seconds": lags[-1],
+            })
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "stall_threshold_seconds": self.stall_threshold,
+            "lag": lag,
+            "stalls_by_function": dict(sorted(
+                by_function.items(), key=lambda item: item[1]["total_seconds"], reverse=True
+            )),
+            "recent_stalls": stalls[::-1],
+        }
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> Optional[LoopMonitor]:
+    """The running monitor, or None when LOOP_MONITOR_INTERVAL is 0."""
+    return _monitor
+
+
+def start_loop_monitor() -> Optional[LoopMonitor]:
+    """Start the process-wide monitor on the running loop (app startup)."""
+    global _monitor
+    settings = get_settings()
+    if _monitor is None and settings.loop_monitor_interval > 0:
+        _monitor = LoopMonitor(
+            interval=settings.loop_monitor_interval,
+            stall_threshold=settings.loop_stall_threshold,
+            sample_interval=settings.loop_stall_sample_interval,
+        )
+        _monitor.start()
+    return _monitor
+
+
+async def stop_loop_monitor() -> None:
+    """Stop the monitor (app shutdown)."""
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
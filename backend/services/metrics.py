@@ -0,0 +1,411 @@
+"""In-process metrics with Prometheus text exposition.
+
+Counters and histograms live in a process-wide registry and are rendered
+by the /api/metrics route. No external services or client libraries are
+needed; each uvicorn worker exposes its own numbers.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Shared label handling for counters and histograms."""
+
+    type_name = ""
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._render_samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count], sum
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the wall-clock duration of the wrapped block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, description: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, description, labelnames))
+
+
+def gauge(name: str, description: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, description, labelnames))
+
+
+def histogram(
+    name: str,
+    description: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, description, labelnames, buckets))
+
+
+# =============================================================================
+# APPLICATION METRICS
+# =============================================================================
+
+STAGE_LATENCY = histogram(
+    "jobsearch_stage_duration_seconds",
+    "Duration of pipeline stages (analyze, expand_profile, filters, rank_batch)",
+    ("stage",),
+)
+
+BOARD_FETCH_LATENCY = histogram(
+    "jobsearch_board_fetch_duration_seconds",
+    "Duration of a single job board fetch",
+    ("source", "board", "outcome"),
+)
+
+JOBS_INGESTED = counter(
+    "jobsearch_jobs_ingested_total",
+    "Jobs parsed from job boards",
+    ("source", "board"),
+)
+
+JOBS_FILTERED = counter(
+    "jobsearch_jobs_filtered_total",
+    "Jobs removed by a filter stage",
+    ("source", "stage"),
+)
+
+JOBS_DEDUPED = counter(
+    "jobsearch_jobs_deduped_total",
+    "Jobs removed as duplicates",
+    ("source",),
+)
+
+JOBS_RANKED = counter(
+    "jobsearch_jobs_ranked_total",
+    "Jobs that received an LLM match score",
+    ("source",),
+)
+
+SCRAPER_REQUESTS_IN_FLIGHT = gauge(
+    "jobsearch_scraper_requests_in_flight",
+    "Job board HTTP requests currently running",
+    ("source",),
+)
+
+SCRAPER_SLOT_WAIT = histogram(
+    "jobsearch_scraper_slot_wait_seconds",
+    "Time a board request waited for a per-source concurrency slot",
+    ("source",),
+)
+
+BOARD_ERRORS = counter(
+    "jobsearch_board_errors_total",
+    "Job board fetches that failed",
+    ("source", "board"),
+)
+
+RECORDS_SKIPPED = counter(
+    "jobsearch_board_records_skipped_total",
+    "Board records dropped because they could not be mapped to a job",
+    ("source", "board"),
+)
+
+BOARDS_SKIPPED = counter(
+    "jobsearch_boards_skipped_total",
+    "Board fetches cancelled because the request already had enough candidates",
+    ("source",),
+)
+
+FETCH_EARLY_STOPS = counter(
+    "jobsearch_fetch_early_stops_total",
+    "Requests that stopped fetching boards early (budget = ranking budget full, grace = grace window over)",
+    ("reason",),
+)
+
+RANK_BATCH_FAILURES = counter(
+    "jobsearch_rank_batch_failures_total",
+    "Ranking batches that raised or were cancelled",
+    ("reason",),
+)
+
+RANK_RETRIES = counter(
+    "jobsearch_rank_retries_total",
+    "Follow-up ranking calls by reason (missing = some jobs unranked, error = call failed)",
+    ("reason",),
+)
+
+JOBS_UNRANKED = counter(
+    "jobsearch_jobs_unranked_total",
+    "Jobs dropped from a ranking batch after all retries",
+    ("reason",),
+)
+
+TOKENS_PER_RANKED_JOB = histogram(
+    "jobsearch_tokens_per_ranked_job",
+    "LLM tokens spent per successfully ranked job (per batch, retries included)",
+    buckets=(25, 50, 100, 150, 200, 300, 500, 1000, 2000),
+)
+
+CACHE_REQUESTS = counter(
+    "jobsearch_cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss/shared = waited on another worker)",
+    ("cache", "result"),
+)
+
+TASK_QUEUE_DEPTH = gauge(
+    "jobsearch_task_queue_depth",
+    "Analyze tasks waiting for a queue worker",
+)
+
+TASK_QUEUE_WAIT = histogram(
+    "jobsearch_task_queue_wait_seconds",
+    "Time analyze tasks spent queued before a worker picked them up",
+)
+
+TASKS = counter(
+    "jobsearch_tasks_total",
+    "Queued analyze tasks by event (submitted, rejected, succeeded, failed)",
+    ("event",),
+)
+
+LLM_CALLS_IN_FLIGHT = gauge(
+    "jobsearch_llm_calls_in_flight",
+    "LLM calls holding a scheduler slot",
+)
+
+LLM_QUEUE_WAIT = histogram(
+    "jobsearch_llm_queue_wait_seconds",
+    "Time LLM calls waited for a scheduler slot, by operation",
+    ("operation",),
+)
+
+LLM_HEDGES = counter(
+    "jobsearch_llm_hedges_total",
+    "Hedged LLM calls by outcome (sent, won = hedge finished first, over_budget/no_slot = not sent)",
+    ("operation", "outcome"),
+)
+
+LOOP_LAG = histogram(
+    "jobsearch_event_loop_lag_seconds",
+    "How late the event loop ran a timer (time spent on other callbacks)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+LOOP_STALLS = counter(
+    "jobsearch_event_loop_stalls_total",
+    "Event loop blocked longer than the stall threshold, by innermost application function",
+    ("function",),
+)
+
+LOOP_STALL_DURATION = histogram(
+    "jobsearch_event_loop_stall_duration_seconds",
+    "How long the event loop stayed blocked during a stall",
+)
+
+LLM_TOKENS = counter(
+    "jobsearch_llm_tokens_total",
+    "LLM tokens used by operation and direction (input/output)",
+    ("operation", "direction"),
+)
+
+
+def record_llm_usage(operation: str, message: Any) -> int:
+    """
+    Record token usage reported on an LLM response message.
+
+    Args:
+        operation: Logical LLM call (e.g. "expand_profile", "rank_batch")
+        message: AIMessage (or anything with `usage_metadata`)
+
+    Returns:
+        Total tokens used by the call (0 if the provider did not report usage)
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", 0) or 0
+    output_tokens = usage.get("output_tokens", 0) or 0
+    if input_tokens:
+        LLM_TOKENS.inc(input_tokens, operation=operation, direction="input")
+    if output_tokens:
+        LLM_TOKENS.inc(output_tokens, operation=operation, direction="output")
+    return input_tokens + output_tokens
@@ -0,0 +1,105 @@
+"""Server-side analyze results with cursor pagination."""
+
+import base64
+import binascii
+import json
+import uuid
+from typing import Optional
+
+from api.schemas import AnalyzeResponse, RankedJob
+from config import get_settings
+from services.cache import CacheBackend, CacheError, get_cache
+
+
+class ResultStore:
+    """
+    Keeps finished AnalyzeResponses for `result_ttl` seconds.
+
+    Lets clients page through a result set (GET /api/results/{id}) without
+    re-running the pipeline. Results live in the shared cache backend, so
+    with CACHE_BACKEND=sqlite/redis any worker can serve any page.
+    """
+
+    def __init__(self, cache: Optional[CacheBackend] = None, ttl: Optional[float] = None):
+        self._cache = cache
+        self.ttl = ttl if ttl is not None else get_settings().result_ttl
+
+    @property
+    def cache(self) -> CacheBackend:
+        return self._cache or get_cache()
+
+    async def save(self, response: AnalyzeResponse) -> str:
+        """Store a full result set and return its id."""
+        result_id = uuid.uuid4().hex
+        await self.cache.set(f"result:{result_id}", response.model_dump_json().encode(), self.ttl)
+        return result_id
+
+    async def load(self, result_id: str) -> Optional[AnalyzeResponse]:
+        """Stored result set, or None if unknown or expired."""
+        raw = await self.cache.get(f"result:{result_id}")
+        if raw is None:
+            return None
+        return AnalyzeResponse.model_validate_json(raw)
+
+
+def encode_cursor(offset: int) -> str:
+    """Opaque cursor for the page starting at `offset`."""
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    Offset encoded in `cursor` (0 for the first page).
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded))["o"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return offset
+
+
+def paginate(jobs: list[RankedJob], cursor: Optional[str], limit: int) -> tuple[list[RankedJob], Optional[str]]:
+    """
+    Slice one page out of a ranked result list.
+
+    Returns:
+        Tuple of (jobs on this page, cursor for the next page or None)
+    """
+    offset = decode_cursor(cursor)
+    end = offset + limit
+    next_cursor = encode_cursor(end) if end < len(jobs) else None
+    return jobs[offset:end], next_cursor
+
+
+async def store_first_page(result: AnalyzeResponse, page_size: int) -> AnalyzeResponse:
+    """
+    Store the full result set and cut the response down to its first page.
+
+    If the store is unavailable the full response is returned unpaged.
+    """
+    try:
+        result_id = await get_result_store().save(result)
+    except CacheError as e:
+        print(f"Could not store result set, returning it unpaged: {e}")
+        return result
+    jobs, next_cursor = paginate(result.jobs, None, page_size)
+    return result.model_copy(update={"jobs": jobs, "result_id": result_id, "next_cursor": next_cursor})
+
+
+_store: Optional[ResultStore] = None
+
+
+def get_result_store() -> ResultStore:
+    """Process-wide result store."""
+    global _store
+    if _store is None:
+        _store = ResultStore()
+    return _store
@@ -0,0 +1,283 @@
+"""Salary range extractor from job descriptions and structured board fields."""
+
+import re
+from typing import Optional, Tuple
+
+
+# Approximate conversion rates to USD. Only used for the coarse "is this
+# clearly below the candidate's target" filter, so they need not be current.
+USD_RATES = {
+    "USD": 1.0,
+    "EUR": 1.08,
+    "GBP": 1.27,
+    "INR": 0.012,
+    "CAD": 0.73,
+    "AUD": 0.66,
+    "SGD": 0.74,
+    "JPY": 0.0067,
+}
+
+CURRENCY_SYMBOLS = {
+    "$": "USD",
+    "us$": "USD",
+    "€": "EUR",
+    "£": "GBP",
+    "₹": "INR",
+    "rs": "INR",
+    "rs.": "INR",
+    "c$": "CAD",
+    "ca$": "CAD",
+    "a$": "AUD",
+    "au$": "AUD",
+    "s$": "SGD",
+    "sg$": "SGD",
+    "¥": "JPY",
+}
+
+# Multipliers for unit suffixes after an amount
+UNIT_MULTIPLIERS = {
+    "k": 1_000,
+    "lpa": 100_000,
+    "lakh": 100_000,
+    "lakhs": 100_000,
+    "lac": 100_000,
+    "l": 100_000,
+    "cr": 10_000_000,
+    "crore": 10_000_000,
+}
+
+# Pay periods -> multiplier to an annual amount
+PERIOD_MULTIPLIERS = {
+    "hour": 2080,
+    "month": 12,
+    "week": 52,
+    "year": 1,
+}
+
+# Any letter prefix before "$" is captured, so an unlisted one ("NZ$", "MX$")
+# reads as an unknown currency instead of as plain "$" (USD)
+_CURRENCY = r"(?:\b[a-z]{1,3}\$|rs\.?|[$€£₹¥])"
+_CODE = r"(?:usd|eur|gbp|inr|cad|aud|sgd|jpy)"
+_AMOUNT = r"\d[\d,]*(?:\.\d+)?"
+_UNIT = r"(?:k|lpa|lakhs?|lac|crore|cr|l)\b"
+
+# "$120,000 - $150,000 USD", "€60k-€80k", "₹15 - ₹40 LPA", "USD 90,000 to 110,000 per year"
+SALARY_RANGE_PATTERN = re.compile(
+    rf"(?P<code1>{_CODE})?\s*(?P<cur1>{_CURRENCY})?\s*(?P<lo>{_AMOUNT})\s*(?P<unit1>{_UNIT})?"
+    rf"\s*(?:-|–|—|to)\s*"
+    rf"(?P<cur2>{_CURRENCY})?\s*(?P<hi>{_AMOUNT})\s*(?P<unit2>{_UNIT})?\s*(?P<code2>{_CODE})?"
+    r"(?:\s*(?:/|per|an|a)\s*(?P<period>hour|hr|month|mo|week|year|yr|annum))?",
+    re.IGNORECASE,
+)
+
+# Sane annual USD bounds; anything outside is a mis-parse (years, headcounts, ...)
+MIN_ANNUAL_USD = 5_000
+MAX_ANNUAL_USD = 2_000_000
+
+
+def _period(value: Optional[str]) -> str:
+    if not value:
+        return "year"
+    value = value.lower()
+    if value in ("hour", "hr"):
+        return "hour"
+    if value in ("month", "mo"):
+        return "month"
+    if value == "week":
+        return "week"
+    return "year"
+
+
+def to_annual_usd(amount: float, currency: str, period: str = "year") -> Optional[int]:
+    """
+    Convert an amount to annual USD.
+
+    Args:
+        amount: Amount in `currency`
+        currency: ISO code (USD, EUR, ...)
+        period: "year", "month", "week" or "hour"
+
+    Returns:
+        Annual USD amount, or None for unknown currencies/implausible values
+    """
+    rate = USD_RATES.get(currency.upper())
+    if rate is None:
+        return None
+    annual = amount * rate * PERIOD_MULTIPLIERS.get(period, 1)
+    if not MIN_ANNUAL_USD <= annual <= MAX_ANNUAL_USD:
+        return None
+    return int(annual)
+
+
+def _amount(value: str, unit: Optional[str]) -> float:
+    amount = float(value.replace(",", ""))
+    if unit:
+        amount *= UNIT_MULTIPLIERS.get(unit.lower(), 1)
+    return amount
+
+
+def extract_salary_from_text(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Extract a pay range from job description text.
+
+    Only ranges with a currency (symbol, code or an Indian LPA/lakh unit)
+    are accepted, so "5-7 years" is never read as pay.
+
+    Args:
+        text: Job description (normalized plain text)
+
+    Returns:
+        Tuple of (min, max) in annual USD. Either or both can be None.
+    """
+    if not text:
+        return None, None
+
+    for match in SALARY_RANGE_PATTERN.finditer(text):
+        symbol = (match.group("cur1") or match.group("cur2") or "").lower()
+        code = (match.group("code1") or match.group("code2") or "").upper()
+        unit1, unit2 = match.group("unit1"), match.group("unit2")
+
+        currency = code or CURRENCY_SYMBOLS.get(symbol)
+        if currency is None and (unit1 or unit2 or "").lower() in ("lpa", "lakh", "lakhs", "lac", "crore", "cr"):
+            currency = "INR"
+        if currency is None:
+            continue
+
+        # "60-80k": the unit on the upper bound applies to both
+        unit1 = unit1 or unit2
+        unit2 = unit2 or unit1
+        period = _period(match.group("period"))
+        low = to_annual_usd(_amount(match.group("lo"), unit1), currency, period)
+        high = to_annual_usd(_amount(match.group("hi"), unit2), currency, period)
+        if low is not None and high is not None and low <= high:
+            return low, high
+
+    return None, None
+
+
+# Lever `salaryRange.interval` values
+LEVER_INTERVALS = {
+    "per-year-salary": "year",
+    "per-month-salary": "month",
+    "per-week-salary": "week",
+    "per-hour-wage": "hour",
+}
+
+
+def _range_to_usd(minimum, maximum, currency: Optional[str], period: str) -> Tuple[Optional[int], Optional[int]]:
+    """Structured (min, max) in `currency` per `period` -> annual USD."""
+    currency = currency or "USD"
+
+    def convert(value) -> Optional[int]:
+        if value is None:
+            return None
+        try:
+            return to_annual_usd(float(value), currency, period)
+        except (TypeError, ValueError):
+            return None
+
+    return convert(minimum), convert(maximum)
+
+
+def salary_from_lever_range(salary_range: Optional[dict]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Convert Lever's structured `salaryRange` to annual USD.
+
+    Args:
+        salary_range: {"min", "max", "currency", "interval"} from a Lever posting
+
+    Returns:
+        Tuple of (min, max) in annual USD. Either or both can be None.
+    """
+    if not salary_range:
+        return None, None
+    period = LEVER_INTERVALS.get(salary_range.get("interval", "per-year-salary"))
+    if period is None:
+        return None, None  # One-time payments etc. are not salaries
+    return _range_to_usd(salary_range.get("min"), salary_range.get("max"), salary_range.get("currency"), period)
+
+
+# Ashby `compensation.summaryComponents[].interval` values
+ASHBY_INTERVALS = {
+    "1 YEAR": "year",
+    "1 MONTH": "month",
+    "1 WEEK": "week",
+    "1 HOUR": "hour",
+}
+
+
+def salary_from_ashby_compensation(compensation: Optional[dict]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Convert Ashby's structured `compensation` to annual USD.
+
+    Only the base salary component is used (equity and bonus are ignored).
+
+    Args:
+        compensation: `compensation` from an Ashby job posting
+
+    Returns:
+        Tuple of (min, max) in annual USD. Either or both can be None.
+    """
+    for component in (compensation or {}).get("summaryComponents") or []:
+        if component.get("compensationType") != "Salary":
+            continue
+        period = ASHBY_INTERVALS.get(component.get("interval", "1 YEAR"))
+        if period is None:
+            continue
+        return _range_to_usd(
+            component.get("minValue"), component.get("maxValue"), component.get("currencyCode"), period
+        )
+    return None, None
+
+
+def extract_salary(
+    description: Optional[str] = None,
+    salary_range: Optional[dict] = None,
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Extract a salary range from structured board fields and/or description.
+
+    Priority:
+    1. Structured fields (Lever `salaryRange`)
+    2. Pay range stated in the description
+
+    Args:
+        description: Job description (normalized plain text, optional)
+        salary_range: Lever `salaryRange` (optional)
+
+    Returns:
+        Tuple of (min, max) in annual USD. Either or both can be None.
+    """
+    min_salary, max_salary = salary_from_lever_range(salary_range)
+    if min_salary is not None or max_salary is not None:
+        return min_salary, max_salary
+
+    if description:
+        return extract_salary_from_text(description)
+
+    return None, None
+
+
+def is_salary_match(
+    expected_salary: int,
+    salary_max: Optional[int],
+    tolerance: float = 0.1,
+) -> bool:
+    """
+    Check whether a job can pay the candidate's expected salary.
+
+    Jobs without a known salary always match. Conversions are approximate,
+    so a job is only rejected when its maximum is more than `tolerance`
+    below the expectation.
+
+    Args:
+        expected_salary: Candidate's expected annual salary in USD
+        salary_max: Job's maximum annual salary in USD (None if unknown)
+        tolerance: Allowed shortfall as a fraction of the expectation
+
+    Returns:
+        True if the job should be kept
+    """
+    if salary_max is None:
+        return True
+    return salary_max >= expected_salary * (1 - tolerance)
@@ -0,0 +1,194 @@
+"""Saved searches, re-evaluated incrementally against new postings.
+
+A saved search keeps the profile, the last response (which carries the
+expanded profile and the merged ranking) and a fingerprint of every
+candidate that passed the profile's filters on the last run. A re-run
+skips profile expansion, fetches and filters the boards as usual, and
+sends to the LLM only candidates that are new or whose posting changed.
+Their scores are merged into the kept ranking; previously ranked jobs
+that are no longer listed (or no longer match) are dropped. LLM cost,
+the expensive part of a search, therefore scales with churn rather than
+with the corpus. As in a full search, at most 50 candidates are ranked
+per run (best location first). Only ranked jobs are fingerprinted, so new
+candidates beyond that, or in a batch that failed, are retried next run.
+
+Searches live in the shared cache backend (sqlite/redis) for
+SAVED_SEARCH_TTL seconds after their last run. With CACHE_BACKEND=memory
+they get a separate in-process store, since the shared memory cache evicts
+its oldest entries to make room for board and ranking data; they are then
+per worker and lost on restart. That store never evicts a live search:
+expired ones are purged on each save, and new searches are refused once
+SAVED_SEARCH_MAX_MEMORY are stored.
+"""
+
+import hashlib
+import json
+import sys
+import uuid
+from typing import NamedTuple, Optional
+
+from api.schemas import Job, RankedJob, SavedSearch
+from config import get_settings
+from scrapers.base_scraper import BaseScraper
+from services.cache import CacheBackend, MemoryCache, get_cache
+
+
+# Posting fields the ranking depends on; a change to any of them re-ranks the job
+FINGERPRINT_FIELDS = (
+    "title", "company", "location", "description", "salary_min", "salary_max",
+    "required_experience_min", "required_experience_max",
+)
+
+
+def job_key(job: Job) -> str:
+    """Stable identity of a posting across runs."""
+    return f"{job.source}:{job.id}"
+
+
+def fingerprint(job: Job) -> str:
+    """Short hash of the posting fields ranking looks at."""
+    payload = json.dumps([getattr(job, name) for name in FINGERPRINT_FIELDS], default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+def unreachable_companies(failed: list[str], timed_out: list[str], skipped: list[str]) -> set[str]:
+    """Lower-cased company names of boards that did not answer this run."""
+    return {BaseScraper.company_name(slug).lower() for slug in (*failed, *timed_out, *skipped)}
+
+
+class CandidateDiff(NamedTuple):
+    """This run's candidates compared with the previous run of a search."""
+    fresh: list[Job]              # New or changed: need ranking (filter order kept)
+    kept: list[RankedJob]         # Previously ranked, unchanged: scores reused
+    removed: int                  # Previously ranked, gone or no longer matching
+    fingerprints: dict[str, str]  # To store for the next run
+
+
+def diff_candidates(
+    candidates: list[Job],
+    previous: Optional[SavedSearch],
+    unreachable: Optional[set[str]] = None,
+) -> CandidateDiff:
+    """
+    Split this run's candidates into those to rank and those to reuse.
+
+    Args:
+        candidates: Filtered jobs of this run, in filter order
+        previous: The search as stored after its last run (None on the first run)
+        unreachable: Companies whose boards failed this run; their
+            previously ranked jobs are kept until the board answers again
+
+    Returns:
+        CandidateDiff
+    """
+    fingerprints = {job_key(job): fingerprint(job) for job in candidates}
+    if previous is None:
+        return CandidateDiff(list(candidates), [], 0, fingerprints)
+
+    seen = previous.fingerprints
+    fresh = [job for job in candidates if seen.get(job_key(job)) != fingerprints[job_key(job)]]
+
+    kept: list[RankedJob] = []
+    removed = 0
+    for job in previous.result.jobs:
+        key = job_key(job)
+        if key in fingerprints:
+            if fingerprints[key] == seen.get(key):
+                kept.append(job)
+            # Changed postings are in `fresh` and get a new score
+        elif unreachable and job.company.lower() in unreachable:
+            kept.append(job)
+            if key in seen:
+                fingerprints[key] = seen[key]
+        else:
+            removed += 1
+
+    return CandidateDiff(fresh, kept, removed, fingerprints)
+
+
+def ranked_fingerprints(diff: CandidateDiff, ranked: list[RankedJob]) -> dict[str, str]:
+    """Fingerprints to store: ranked jobs only, so unranked candidates are retried."""
+    keys = {job_key(job) for job in ranked}
+    return {key: value for key, value in diff.fingerprints.items() if key in keys}
+
+
+class SavedSearchLimit(Exception):
+    """Raised when the in-process store (CACHE_BACKEND=memory) is full."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Saved search limit reached ({limit}); try again later")
+        self.limit = limit
+
+
+def new_search_id() -> str:
+    return uuid.uuid4().hex
+
+
+class SavedSearchStore:
+    """Saved searches in the shared cache backend (see module docstring)."""
+
+    def __init__(
+        self,
+        cache: Optional[CacheBackend] = None,
+        ttl: Optional[float] = None,
+        max_memory: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self._memory: Optional[MemoryCache] = None
+        if cache is None and settings.cache_backend == "memory":
+            # No eviction: searches are user data; the limit is enforced on save
+            cache = self._memory = MemoryCache(max_entries=sys.maxsize)
+        self._cache = cache
+        self.ttl = ttl if ttl is not None else settings.saved_search_ttl
+        self.max_memory = max_memory if max_memory is not None else settings.saved_search_max_memory
+
+    @property
+    def cache(self) -> CacheBackend:
+        return self._cache or get_cache()
+
+    async def ensure_capacity(self, search_id: Optional[str] = None) -> None:
+        """
+        Check there is room for a new search (or for replacing `search_id`).
+
+        Raises:
+            SavedSearchLimit: If the in-process store is full
+        """
+        if self._memory is None:
+            return
+        self._memory.purge_expired()
+        if len(self._memory) < self.max_memory:
+            return
+        if search_id is not None and await self._memory.get(f"saved_search:{search_id}") is not None:
+            return
+        raise SavedSearchLimit(self.max_memory)
+
+    async def save(self, search: SavedSearch) -> None:
+        """
+        Store (or replace) a search; its TTL restarts.
+
+        Raises:
+            SavedSearchLimit: If the in-process store is full
+        """
+        await self.ensure_capacity(search.search_id)
+        await self.cache.set(f"saved_search:{search.search_id}", search.model_dump_json().encode(), self.ttl)
+
+    async def load(self, search_id: str) -> Optional[SavedSearch]:
+        """Stored search, or None if unknown or expired."""
+        raw = await self.cache.get(f"saved_search:{search_id}")
+        if raw is None:
+            return None
+        return SavedSearch.model_validate_json(raw)
+
+    async def delete(self, search_id: str) -> None:
+        await self.cache.delete(f"saved_search:{search_id}")
+
+
+_store: Optional[SavedSearchStore] = None
+
+
+def get_saved_search_store() -> SavedSearchStore:
+    """Process-wide saved search store."""
+    global _store
+    if _store is None:
+        _store = SavedSearchStore()
+    return _store
@@ -0,0 +1,212 @@
+"""Queued analyze requests (submit now, poll for the result).
+
+POST /api/analyze/jobs puts a profile on a bounded in-process queue and
+returns at once; a fixed pool of worker coroutines runs the analyze
+workflow. Excess load waits in the queue (or is rejected with 429 once it
+is full) instead of holding open HTTP connections.
+
+Task state is written to the shared cache backend, so with
+CACHE_BACKEND=sqlite/redis any worker can answer a poll; the queue itself
+and the running work belong to the worker that accepted the task.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Optional
+
+from api.schemas import AnalyzeResponse, AnalyzeTask, ProfileRequest
+from config import get_settings
+from services.cache import CacheBackend, CacheError, get_cache
+from services.metrics import TASK_QUEUE_DEPTH, TASK_QUEUE_WAIT, TASKS
+from services.result_store import store_first_page
+
+
+class TaskQueueFull(Exception):
+    """Raised when the queue is at its maximum depth."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Analyze queue is full")
+        self.retry_after = retry_after
+
+
+class _Task:
+    """A task owned by this worker: its state plus the profile to run."""
+
+    def __init__(self, profile: ProfileRequest):
+        self.profile = profile
+        self.state = AnalyzeTask(task_id=uuid.uuid4().hex, status="queued", created_at=time.time())
+        self.save_lock = asyncio.Lock()
+        self.pending_saves: set[asyncio.Task] = set()  # Progress updates in flight
+
+
+class TaskQueue:
+    """Bounded queue of analyze tasks served by `workers` coroutines."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        ttl: Optional[float] = None,
+        cache: Optional[CacheBackend] = None,
+    ):
+        settings = get_settings()
+        self.workers = workers or settings.task_workers
+        self.max_depth = max_depth or settings.task_queue_max_depth
+        self.ttl = ttl if ttl is not None else settings.task_ttl
+        self._cache = cache
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._tasks: dict[str, _Task] = {}    # Accepted here and not yet expired
+        self._waiting: list[str] = []         # Queued task ids, oldest first
+        self._mean_duration = 30.0            # Seconds per task (moving average)
+
+    @property
+    def cache(self) -> CacheBackend:
+        return self._cache or get_cache()
+
+    def _start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_depth)
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def submit(self, profile: ProfileRequest) -> AnalyzeTask:
+        """
+        Queue a profile for analysis.
+
+        Raises:
+            TaskQueueFull: If `max_depth` tasks are already waiting
+        """
+        self._start()
+        self._expire()
+        if self._queue.full():
+            TASKS.inc(event="rejected")
+            raise TaskQueueFull(self._retry_after())
+
+        task = _Task(profile)
+        self._tasks[task.state.task_id] = task
+        self._waiting.append(task.state.task_id)
+        self._queue.put_nowait(task)
+        TASK_QUEUE_DEPTH.set(self._queue.qsize())
+        TASKS.inc(event="submitted")
+        await self._save(task)
+        return self._with_position(task.state)
+
+    async def get(self, task_id: str) -> Optional[AnalyzeTask]:
+        """Current state of a task, or None if unknown or expired."""
+        task = self._tasks.get(task_id)
+        if task is not None:
+            return self._with_position(task.state)
+        # Accepted by another worker (shared cache backends only)
+        try:
+            raw = await self.cache.get(f"task:{task_id}")
+        except CacheError:
+            return None
+        return AnalyzeTask.model_validate_json(raw) if raw is not None else None
+
+    def _with_position(self, state: AnalyzeTask) -> AnalyzeTask:
+        if state.status != "queued" or state.task_id not in self._waiting:
+            return state
+        return state.model_copy(update={"queue_position": self._waiting.index(state.task_id)})
+
+    def _retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up."""
+        return max(1, round(self._mean_duration / self.workers))
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.ttl
+        for task_id in [
+            task_id for task_id, task in self._tasks.items()
+            if task.state.finished_at is not None and task.state.finished_at < cutoff
+        ]:
+            del self._tasks[task_id]
+
+    async def _save(self, task: _Task) -> None:
+        """Write the task's current state to the shared cache (best effort)."""
+        async with task.save_lock:
+            try:
+                await self.cache.set(
+                    f"task:{task.state.task_id}", task.state.model_dump_json().encode(), self.ttl
+                )
+            except CacheError as e:
+                print(f"Could not store task state: {e}")
+
+    async def _work(self) -> None:
+        while True:
+            task: _Task = await self._queue.get()
+            try:
+                await self._run(task)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, task: _Task) -> None:
+        # Deferred: importing the agent pulls in the LLM stack (see agent.lazy)
+        from agent.lazy import get_agent_class
+
+        state = task.state
+        self._waiting.remove(state.task_id)
+        TASK_QUEUE_DEPTH.set(self._queue.qsize())
+        state.status, state.started_at = "running", time.time()
+        TASK_QUEUE_WAIT.observe(state.started_at - state.created_at)
+        await self._save(task)
+
+        def on_progress(stage: str, fraction: float) -> None:
+            state.stage, state.progress = stage, fraction
+            save = asyncio.create_task(self._save(task))
+            task.pending_saves.add(save)
+            save.add_done_callback(task.pending_saves.discard)
+
+        agent = None
+        try:
+            agent = get_agent_class()()
+            result = await agent.analyze(task.profile, on_progress=on_progress)
+            if task.profile.page_size:
+                result = await store_first_page(result, task.profile.page_size)
+            if not task.profile.include_descriptions:
+                result = _without_descriptions(result)
+            state.status, state.result, state.progress = "succeeded", result, 1.0
+            TASKS.inc(event="succeeded")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.status, state.error = "failed", f"Error analyzing profile: {e}"
+            TASKS.inc(event="failed")
+        finally:
+            if agent is not None:
+                await agent.close()
+            state.stage, state.finished_at = None, time.time()
+            self._mean_duration = 0.8 * self._mean_duration + 0.2 * (state.finished_at - state.started_at)
+        # Kept in memory for local polls until it expires
+        await self._save(task)
+
+    async def close(self) -> None:
+        """Stop the workers (queued and running tasks are abandoned)."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers, self._queue = [], None
+
+
+def _without_descriptions(result: AnalyzeResponse) -> AnalyzeResponse:
+    """Result with job descriptions dropped (list view, as in /api/analyze)."""
+    jobs = [job.model_copy(update={"description": None}) for job in result.jobs]
+    return result.model_copy(update={"jobs": jobs})
+
+
+_queue: Optional[TaskQueue] = None
+
+
+def get_task_queue() -> TaskQueue:
+    """Process-wide task queue (workers start with the first submission)."""
+    global _queue
+    if _queue is None:
+        _queue = TaskQueue()
+    return _queue
+
+
+async def close_task_queue() -> None:
+    """Stop the task queue workers, if they were ever started."""
+    global _queue
+    if _queue is not None:
+        await _queue.close()
+        _queue = None
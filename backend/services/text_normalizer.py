@@ -0,0 +1,88 @@
+"""Job description normalization (runs once per posting at ingest)."""
+
+import hashlib
+import html
+import re
+from collections import OrderedDict
+from typing import Optional
+
+from services.metrics import CACHE_REQUESTS
+
+
+# Descriptions are stored (and returned) up to this many characters
+DESCRIPTION_MAX_CHARS = 1000
+
+# Normalized descriptions kept in the memo; boards are re-fetched often and
+# most postings do not change between fetches. The memo holds the full text
+# (experience and salary extraction read all of it), so it is bounded by
+# total size as well as by count; least recently used entries go first.
+MEMO_MAX_ENTRIES = 50_000
+MEMO_MAX_CHARS = 32 * 1024 * 1024
+
+_SCRIPT_STYLE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]*>")
+_WHITESPACE = re.compile(r"\s+")
+
+_memo: "OrderedDict[bytes, str]" = OrderedDict()
+_memo_chars = 0
+
+
+def _normalize(raw: str) -> str:
+    text = raw
+    if "&" in text:
+        # Greenhouse escapes its markup: "&lt;p&gt;5+ years&lt;/p&gt;"
+        text = html.unescape(text)
+    if "<" in text:
+        text = _SCRIPT_STYLE.sub(" ", text)
+        text = _TAG.sub(" ", text)
+        if "&" in text:
+            # Entities that were inside the escaped markup (e.g. &amp;nbsp;)
+            text = html.unescape(text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def normalize_description(raw: Optional[str]) -> str:
+    """
+    Plain text of a job description: HTML unescaped, tags stripped and
+    whitespace collapsed.
+
+    Results are memoized by content hash, so a posting seen on every board
+    refresh (or on several boards) is only normalized once.
+    """
+    if not raw:
+        return ""
+    key = hashlib.blake2b(raw.encode(), digest_size=16).digest()
+    text = _memo.get(key)
+    if text is not None:
+        _memo.move_to_end(key)
+        CACHE_REQUESTS.inc(cache="description", result="hit")
+        return text
+
+    CACHE_REQUESTS.inc(cache="description", result="miss")
+    text = _normalize(raw)
+    if len(text) > MEMO_MAX_CHARS:
+        return text
+    global _memo_chars
+    _memo[key] = text
+    _memo_chars += len(text)
+    while len(_memo) > MEMO_MAX_ENTRIES or _memo_chars > MEMO_MAX_CHARS:
+        _, evicted = _memo.popitem(last=False)
+        _memo_chars -= len(evicted)
+    return text
+
+
+def clear_memo() -> None:
+    """Drop all memoized descriptions."""
+    global _memo_chars
+    _memo.clear()
+    _memo_chars = 0
+
+
+def truncate_description(text: str, max_chars: int = DESCRIPTION_MAX_CHARS) -> Optional[str]:
+    """Shorten normalized text to `max_chars`, cutting at a word boundary (None if empty)."""
+    if not text:
+        return None
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars].rstrip() + "…"
@@ -1,12 +1,37 @@
 import { useState } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
-import { ArrowLeft, Building2, ChevronDown, ChevronUp, Sparkles, X } from 'lucide-react';
+import { ArrowLeft, Building2, ChevronDown, ChevronUp, Loader2, Sparkles, X } from 'lucide-react';
 import JobCard from './JobCard';
+import { getResultsPage, PAGE_SIZE } from '../services/api';
 
 const JobResults = ({ data, onBack }) => {
-  const { profile, jobs, total_jobs, companies_searched } = data;
+  const { profile, total_jobs, companies_searched, result_id } = data;
   const [showProfileDetails, setShowProfileDetails] = useState(false);
   const [showCompaniesModal, setShowCompaniesModal] = useState(false);
+  const [jobs, setJobs] = useState(data.jobs);
+  const [nextCursor, setNextCursor] = useState(data.next_cursor);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [loadError, setLoadError] = useState(null);
+
+  // Fetch the next page of the stored result set (no re-run of the search)
+  const loadMore = async () => {
+    setLoadingMore(true);
+    setLoadError(null);
+    try {
+      const page = await getResultsPage(result_id, nextCursor);
+      setJobs((current) => [...current, ...page.jobs]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error('Error loading more jobs:', err);
+      setLoadError(
+        err.response?.status === 404
+          ? 'These results have expired. Run a new search to see more.'
+          : 'Failed to load more jobs. Please try again.'
+      );
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   // Get top companies to display (first 5)
   const topCompanies = companies_searched.slice(0, 5);
@@ -213,9 +238,25 @@ const JobResults = ({ data, onBack }) => {
       {/* Job List */}
       {jobs.length > 0 ? (
         <div className="space-y-4">
+          {/* Entrance animation is staggered within each page */}
           {jobs.map((job, index) => (
-            <JobCard key={job.id} job={job} index={index} />
+            <JobCard key={job.id} job={job} index={index % PAGE_SIZE} />
           ))}
+
+          {/* Pagination */}
+          {nextCursor && (
+            <div className="flex flex-col items-center gap-2 pt-2">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="flex items-center gap-2 px-4 py-2 rounded-lg bg-dark-800 hover:bg-dark-700 text-sm text-dark-200 border border-dark-700 transition-colors disabled:opacity-60"
+              >
+                {loadingMore && <Loader2 size={14} className="animate-spin" />}
+                {loadingMore ? 'Loading...' : `Show more (${jobs.length} of ${total_jobs})`}
+              </button>
+              {loadError && <p className="text-xs text-red-400">{loadError}</p>}
+            </div>
+          )}
         </div>
       ) : (
         <motion.div
@@ -6,6 +6,15 @@ import ChipInput from './ChipInput';
 import Autocomplete from './Autocomplete';
 import { SKILL_SUGGESTIONS, LOCATION_SUGGESTIONS, COMPANY_SUGGESTIONS } from '../data/suggestions';
 
+// Display name and dot colour per job board source
+const SOURCE_STYLES = {
+  greenhouse: { label: 'Greenhouse', dot: 'bg-emerald-500' },
+  lever: { label: 'Lever', dot: 'bg-blue-500' },
+  ashby: { label: 'Ashby', dot: 'bg-violet-500' },
+  workable: { label: 'Workable', dot: 'bg-amber-500' },
+  smartrecruiters: { label: 'SmartRecruiters', dot: 'bg-rose-500' },
+};
+
 const ProfileForm = ({ onSubmit, isLoading }) => {
   const [formData, setFormData] = useState({
     role: '',
@@ -17,7 +26,7 @@ const ProfileForm = ({ onSubmit, isLoading }) => {
     target_companies: [],
   });
   
-  const [availableCompanies, setAvailableCompanies] = useState({ greenhouse: [], lever: [] });
+  const [availableCompanies, setAvailableCompanies] = useState({});
   const [showCompanySelector, setShowCompanySelector] = useState(false);
   const [errors, setErrors] = useState({});
 
@@ -33,7 +42,7 @@ const ProfileForm = ({ onSubmit, isLoading }) => {
     fetchCompanies();
   }, []);
 
-  const allCompanies = [...availableCompanies.greenhouse, ...availableCompanies.lever].sort();
+  const allCompanies = Object.values(availableCompanies).flat().sort();
 
   const handleChange = (e) => {
     const { name, value } = e.target;
@@ -255,57 +264,32 @@ const ProfileForm = ({ onSubmit, isLoading }) => {
                 
                 {/* Company sources */}
                 <div className="space-y-4">
-                  {/* Greenhouse companies */}
-                  <div>
-                    <p className="text-xs text-dark-500 mb-2 flex items-center gap-2">
-                      <span className="w-2 h-2 rounded-full bg-emerald-500"></span>
-                      Greenhouse ({availableCompanies.greenhouse.length} companies)
-                    </p>
-                    <div className="grid grid-cols-2 md:grid-cols-3 gap-2 p-3 bg-dark-900 rounded-xl">
-                      {availableCompanies.greenhouse.map(company => (
-                        <label
-                          key={company}
-                          className="flex items-center gap-2 cursor-pointer hover:bg-dark-800 p-2 rounded-lg transition-colors"
-                        >
-                          <input
-                            type="checkbox"
-                            checked={formData.target_companies.includes(company)}
-                            onChange={() => handleCompanyToggle(company)}
-                            className="rounded"
-                          />
-                          <span className="text-sm text-dark-200 capitalize">
-                            {company.replace(/-/g, ' ')}
-                          </span>
-                        </label>
-                      ))}
-                    </div>
-                  </div>
-
-                  {/* Lever companies */}
-                  <div>
-                    <p className="text-xs text-dark-500 mb-2 flex items-center gap-2">
-                      <span className="w-2 h-2 rounded-full bg-blue-500"></span>
-                      Lever ({availableCompanies.lever.length} companies)
-                    </p>
-                    <div className="grid grid-cols-2 md:grid-cols-3 gap-2 p-3 bg-dark-900 rounded-xl">
-                      {availableCompanies.lever.map(company => (
-                        <label
-                          key={company}
-                          className="flex items-center gap-2 cursor-pointer hover:bg-dark-800 p-2 rounded-lg transition-colors"
-                        >
-                          <input
-                            type="checkbox"
-                            checked={formData.target_companies.includes(company)}
-                            onChange={() => handleCompanyToggle(company)}
-                            className="rounded"
-                          />
-                          <span className="text-sm text-dark-200 capitalize">
-                            {company.replace(/-/g, ' ')}
-                          </span>
-                        </label>
-                      ))}
+                  {Object.entries(availableCompanies).map(([source, companies]) => (
+                    <div key={source}>
+                      <p className="text-xs text-dark-500 mb-2 flex items-center gap-2">
+                        <span className={`w-2 h-2 rounded-full ${SOURCE_STYLES[source]?.dot ?? 'bg-dark-400'}`}></span>
+                        {SOURCE_STYLES[source]?.label ?? source} ({companies.length} companies)
+                      </p>
+                      <div className="grid grid-cols-2 md:grid-cols-3 gap-2 p-3 bg-dark-900 rounded-xl">
+                        {companies.map(company => (
+                          <label
+                            key={company}
+                            className="flex items-center gap-2 cursor-pointer hover:bg-dark-800 p-2 rounded-lg transition-colors"
+                          >
+                            <input
+                              type="checkbox"
+                              checked={formData.target_companies.includes(company)}
+                              onChange={() => handleCompanyToggle(company)}
+                              className="rounded"
+                            />
+                            <span className="text-sm text-dark-200 capitalize">
+                              {company.replace(/-/g, ' ')}
+                            </span>
+                          </label>
+                        ))}
+                      </div>
                     </div>
-                  </div>
+                  ))}
                 </div>
               </motion.div>
             )}
@@ -9,13 +9,33 @@ const api = axios.create({
   },
 });
 
+// Jobs per page in the results list
+export const PAGE_SIZE = 20;
+
 /**
  * Analyze user profile and get matched jobs
  * @param {Object} profile - User profile data
- * @returns {Promise<Object>} Analysis response with profile and jobs
+ * @returns {Promise<Object>} Analysis response with profile and the first page of jobs
  */
 export const analyzeProfile = async (profile) => {
-  const response = await api.post('/analyze', profile);
+  const response = await api.post('/analyze', {
+    ...profile,
+    include_descriptions: false,
+    page_size: PAGE_SIZE,
+  });
+  return response.data;
+};
+
+/**
+ * Get the next page of a stored result set
+ * @param {string} resultId - result_id from the analyze response
+ * @param {string} cursor - next_cursor from the previous page
+ * @returns {Promise<Object>} Page with jobs and next_cursor
+ */
+export const getResultsPage = async (resultId, cursor) => {
+  const response = await api.get(`/results/${resultId}`, {
+    params: { cursor, limit: PAGE_SIZE },
+  });
   return response.data;
 };
 